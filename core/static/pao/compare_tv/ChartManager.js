@@ -420,6 +420,7 @@ export class ChartManager {
         // 필터 상태 초기화
         this.state.prevColorFilter = "";
         this.state.prevLineFactor = "";
+        this.state.prevLtParams = "";
     }
 
     /**
@@ -17,6 +17,8 @@ export class DataLoader {
             color: document.getElementById('tvColorFilter').value || "",
             line: document.getElementById('tvLineFactor').value || "",
             agingTime: document.getElementById('ltAgingTime').value || 30,
+            ltThresholds: document.getElementById('ltThresholds')?.value || "",
+            ltModels: Array.from(document.getElementById('ltModels')?.selectedOptions || []).map(o => o.value).join(","),
         };
     }
 
@@ -24,7 +26,9 @@ export class DataLoader {
      * 모든 추가 테이블 비동기 로드
      */
     async loadAllAdditionalTablesAsync() {
-        const { ids, color, line } = this._getFormValues();
+        const { ids, color, line, agingTime, ltThresholds, ltModels } = this._getFormValues();
+        // LT 테이블 파라미터 (aging time / 수명 기준 / 외삽 모델)
+        const ltParams = [agingTime, ltThresholds, ltModels].join("|");
 
         if (!color || !line) {
             console.warn("Color Filter 또는 Line Factor가 선택되지 않았습니다.");
@@ -33,42 +37,38 @@ export class DataLoader {
 
         // 이전 값과 동일하면 스킵
         if (color === this.state.prevColorFilter &&
-            line === this.state.prevLineFactor) {
+            line === this.state.prevLineFactor &&
+            ltParams === this.state.prevLtParams) {
             return;
         }
 
         this.state.prevColorFilter = color;
         this.state.prevLineFactor = line;
+        this.state.prevLtParams = ltParams;
 
         try {
-            const ids = new URLSearchParams(window.location.search).get("ids") || "";
-
-            // IVL Color 테이블
-            const ivlColorResponse = await fetch(
-                `${URLS.ivlColorTable}?ids=${ids}&color_filter=${color}&line_factor=${line}`
-            );
-            const ivlColorData = await ivlColorResponse.json();
-            if (ivlColorData.success && this.state.ivlColorTableInstance) {
-                this.state.ivlColorTableInstance.setData(ivlColorData.table_data);
-            }
-
-            // Angle 테이블
-            const angleResponse = await fetch(
-                `${URLS.angleTable}?ids=${ids}&color_filter=${color}&line_factor=${line}`
-            );
-            const angleData = await angleResponse.json();
-            if (angleData.success && this.state.angleTableInstance) {
-                this.state.angleTableInstance.setData(angleData.table_data);
-            }
-
-            // LT 테이블
-            const ltResponse = await fetch(
-                `${URLS.ltTable}?ids=${ids}&color_filter=${color}&line_factor=${line}&aging_time=${agingTime}`
-            );
-            const ltData = await ltResponse.json();
-            if (ltData.success && this.state.ltTableInstance) {
-                this.state.ltTableInstance.setData(ltData.table_data);
-            }
+            const params = new URLSearchParams({
+                ids: ids,
+                color_filter: color,
+                line_factor: line,
+                aging_time: agingTime,
+                lt_thresholds: ltThresholds,
+                lt_models: ltModels,
+                sections: "ivl_color,angle,lt",
+            });
+
+            // IVL Color / Angle / LT 테이블을 한 번의 요청으로 받고, 섹션이 도착하는 대로 반영
+            const tableInstances = {
+                ivl_color: this.state.ivlColorTableInstance,
+                angle: this.state.angleTableInstance,
+                lt: this.state.ltTableInstance,
+            };
+            await this.streamBundle(params, (section) => {
+                const table = tableInstances[section.section];
+                if (section.success && table) {
+                    table.setData(section.table_data);
+                }
+            });
 
             console.log("✅ 모든 추가 테이블 로드 완료");
 
@@ -77,4 +77,39 @@ export class DataLoader {
             Utils.showToast("테이블 로드 중 오류가 발생했습니다.", "error");
         }
     }
+
+    /**
+     * 번들 endpoint(NDJSON) 스트리밍 - 섹션 한 줄이 도착할 때마다 onSection 호출
+     */
+    async streamBundle(params, onSection) {
+        return streamBundle(params, onSection);
+    }
+}
+
+/**
+ * 번들 endpoint(NDJSON) 스트리밍 (TableManager / 차트 생성 버튼 공용)
+ */
+export async function streamBundle(params, onSection) {
+    const response = await fetch(`${URLS.compareBundle}?${params}`);
+    if (!response.ok) {
+        throw new Error(`HTTP 오류: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    while (true) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+
+        const lines = buffer.split("\n");
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => onSection(JSON.parse(line)));
+
+        if (done) break;
+    }
+    if (buffer.trim()) {
+        onSection(JSON.parse(buffer));
+    }
 }
@@ -27,6 +27,7 @@ export class GlobalState {
         // 그래프 관련
         this.prevColorFilter = "";
         this.prevLineFactor = "";
+        this.prevLtParams = "";
         this.gamutGraphData = null;
         this.gamutAnalysisWindow = null;
         this.currentFilters = { colorFilter: "", lineFactor: ""};        
@@ -2,6 +2,7 @@
 
 import { GlobalState } from './GlobalState.js';
 import { Utils } from './Utils.js';
+import { streamBundle } from './DataLoader.js';
 
 export class TableManager {
     constructor() {
@@ -14,12 +15,12 @@ export class TableManager {
     async loadInitialTableData() {
         try {
             const ids = new URLSearchParams(window.location.search).get("ids") || "";
-            const response = await fetch(`${URLS.ivlTable}?ids=${ids}`);
-            const data = await response.json();
-
-            if (data.success && this.state.ivlTableInstance) {
-                this.state.ivlTableInstance.setData(data.table_data);
-            }
+            const params = new URLSearchParams({ ids: ids, sections: "ivl" });
+            await streamBundle(params, (section) => {
+                if (section.success && this.state.ivlTableInstance) {
+                    this.state.ivlTableInstance.setData(section.table_data);
+                }
+            });
         } catch (error) {
             console.error("테이블 데이터 로드 실패:", error);
         }
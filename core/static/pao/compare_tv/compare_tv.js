@@ -180,6 +180,8 @@ document.getElementById('generateChartsBtn')?.addEventListener('click', async fu
     const colorFilter = document.getElementById('tvColorFilter').value;
     const lineFactor = document.getElementById('tvLineFactor').value;
     const agingTime = document.getElementById('ltAgingTime').value || 30;
+    const ltThresholds = document.getElementById('ltThresholds')?.value || "";
+    const ltModels = Array.from(document.getElementById('ltModels')?.selectedOptions || []).map(o => o.value).join(",");
     const selectedCols = tableManager.getSelectedColumns();
 
     if (!colorFilter || !lineFactor) {
@@ -198,22 +200,27 @@ document.getElementById('generateChartsBtn')?.addEventListener('click', async fu
             ids: ids,
             color_filter: colorFilter,
             line_factor: lineFactor,
-            aging_time: agingTime
+            aging_time: agingTime,
+            lt_thresholds: ltThresholds,
+            lt_models: ltModels,
+            sections: "chart",
         });
 
         if (selectedCols.length > 0) {
             params.append('selected_columns', selectedCols.join(','));
         }
 
-        const url = `${URLS.getChart}?${params}`;
-
-        const response = await fetch(url);
-        if (!response.ok) {
-            throw new Error(`HTTP 오류: ${response.status}`);
+        // 차트 데이터도 번들 endpoint의 chart 섹션으로 받음
+        let data = null;
+        await dataLoader.streamBundle(params, (section) => {
+            if (section.section === "chart") {
+                data = section;
+            }
+        });
+        if (!data) {
+            throw new Error("chart 섹션 응답 없음");
         }
 
-        const data = await response.json();
-
         if (data.success) {
             // 차트 데이터 업데이트
             state.chartConfigs.forEach(config => {
@@ -249,8 +256,8 @@ document.getElementById('generateChartsBtn')?.addEventListener('click', async fu
 
             Utils.showToast(data.message, "success");
         } else {
-            console.error("❌ 서버 응답 실패:", data.error);
-            Utils.showToast(data.error || "차트 데이터 로드 실패", "error");
+            console.error("❌ 서버 응답 실패:", data.message);
+            Utils.showToast(data.message || "차트 데이터 로드 실패", "error");
         }
     } catch (error) {
         console.error("TV 차트 생성 오류:", error);
@@ -419,9 +426,11 @@ document.addEventListener('DOMContentLoaded', async () => {
         }
     });
 
-    // 10. LT Aging Time 변경 이벤트
-    document.getElementById("ltAgingTime")?.addEventListener("change", async () => {
-        await dataLoader.loadAllAdditionalTablesAsync();
+    // 10. LT Aging Time / 수명 기준 / 외삽 모델 변경 이벤트
+    ["ltAgingTime", "ltThresholds", "ltModels"].forEach(id => {
+        document.getElementById(id)?.addEventListener("change", async () => {
+            await dataLoader.loadAllAdditionalTablesAsync();
+        });
     });
 
     // 11. Excel Export 버튼
@@ -135,6 +135,8 @@ async function handleSaveButtonClick() {
         const colorFilter = document.getElementById("tvColorFilter").value;
         const lineFactor = document.getElementById("tvLineFactor").value;
         const agingTime = parseInt(document.getElementById("ltAgingTime").value) || 30;
+        const ltThresholds = (document.getElementById("ltThresholds")?.value || "")
+            .split(",").map(v => parseFloat(v)).filter(v => !isNaN(v));
         
         const saveAdditionsUrl = `/pao/device/tv/save-additions/${profileId}/`;
         
@@ -148,6 +150,7 @@ async function handleSaveButtonClick() {
                 color_filter: colorFilter,
                 line_factor: lineFactor,
                 aging_time: agingTime,
+                lt_thresholds: ltThresholds,
             }),
         });
         
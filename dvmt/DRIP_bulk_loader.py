@@ -0,0 +1,418 @@
+import json
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+from django.contrib.postgres.fields import ArrayField
+from django.db import models, transaction
+from django.db.models.signals import post_save
+from dvmt.models import (
+    AC3Meas, PLMeas, UVVISMeas, EllipsometerMeas, LTPLMeas, TRPLMeas, CVMeas, FittingResult, Material, Sample
+    )
+from dvmt.utils.file_manifest import SOURCE_FILES_KEY, delete_previous_measurements, record_parsed_files_bulk
+from dvmt.utils.json_loader_utils import (
+    calculate_ac3_baseline, calculate_ac3_intersection, calculate_ac3_slope_parameters,
+    calculate_peak_wavelength, calculate_uvvis_fitting, calculate_first_peak_wavelength, calculate_tau
+    )
+
+BULK_BATCH_SIZE = 500
+
+CV_DEVICE_AREA = 0.0009  # cm^2
+CV_VACUUM_PERMITTIVITY = 8.854187818E-12  # F/m
+
+# 측정 모델 → 파싱 결과 dict key 접두사
+MEASUREMENT_PREFIXES = {
+    "AC3Meas": "ac3",
+    "EllipsometerMeas": "ellipso",
+    "PLMeas": "pl",
+    "PLQYMeas": "plqy",
+    "UVVISMeas": "uvvis",
+    "LTPLMeas": "ltpl",
+    "TRPLMeas": "trpl",
+    "CVMeas": "cv",
+    "IVMeas": "iv",
+}
+# 모델 필드 이름과 파싱 결과 key가 다른 경우 (from_dict와 동일)
+FIELD_ALIASES = {
+    "UVVISMeas": {"uvvis_rawdata": "uvvis_refdata"},
+    "CVMeas": {"cv_device_structure_detail": "device_structure_detail"},
+    "IVMeas": {"iv_device_structure_detail": "device_structure_detail", "iv_total_thickness": "total_thickness"},
+}
+# from_dict의 get_or_create 조건 (같은 key의 측정 데이터가 있으면 새로 만들지 않음)
+MEASUREMENT_KEYS = {
+    "CVMeas": ("sample_id", "cv_device_structure"),
+}
+SKIP_FIELDS = {"sample", "created_at", "created_by", "ip"}
+
+
+# ---------------------------------------------------------------------------
+# 파생 값 계산 (batch): 측정 데이터 리스트 → (측정 데이터 update 필드, FittingResult 값 리스트)
+# FittingResult 값이 None인 측정 데이터는 계산하지 않은 것 (데이터 부족)
+# ---------------------------------------------------------------------------
+
+def _group_by_length(*series):
+    """
+    같은 길이 배열끼리 묶어 2차원 float64 행렬로 변환 (None은 NaN).
+    series 간 길이가 다르거나 비어 있는 항목은 제외.
+
+    Yields:
+        (ndarray, list[ndarray]): 원래 index, series별 (묶음 크기 × 길이) 행렬.
+    """
+    groups = defaultdict(list)
+    for i, values in enumerate(zip(*series)):
+        lengths = {len(v) if v else 0 for v in values}
+        if len(lengths) == 1 and 0 not in lengths:
+            groups[lengths.pop()].append(i)
+    for indices in groups.values():
+        yield np.array(indices), [
+            np.array([series_values[i] for i in indices], dtype=np.float64) for series_values in series
+        ]
+
+
+def _optional(value):
+    """NaN / inf → None (DB 저장용)"""
+    return float(value) if value is not None and np.isfinite(value) else None
+
+
+def batch_cv_capacitance(vbias_list, capdata_list, thicknesses):
+    """
+    CV 0V capacitance / 최대 capacitance / 유전율 (vbias에 0이 없으면 zerocap / 유전율 NaN)
+
+    Returns:
+        (ndarray, ndarray, ndarray): zerocap, maxcap, permittivity.
+    """
+    zerocap = np.full(len(capdata_list), np.nan)
+    maxcap = np.full(len(capdata_list), np.nan)
+    for indices, (vbias, capdata) in _group_by_length(vbias_list, capdata_list):
+        is_zero = vbias == 0
+        zero_values = capdata[np.arange(len(indices)), is_zero.argmax(axis=1)]
+        zerocap[indices] = np.where(is_zero.any(axis=1), zero_values, np.nan)
+        with np.errstate(invalid="ignore"):
+            maxcap[indices] = np.nanmax(np.where(np.isnan(capdata), -np.inf, capdata), axis=1)
+    maxcap[np.isinf(maxcap)] = np.nan
+    thickness = np.array([np.nan if t is None else t for t in thicknesses], dtype=np.float64) * 1.0e-8  # nm → m
+    permittivity = (zerocap * thickness) / (CV_DEVICE_AREA * CV_VACUUM_PERMITTIVITY)
+    return zerocap, maxcap, permittivity
+
+
+def derive_ac3_values(instances):
+    """AC3: baseline / slope / intercept (측정 데이터), intersection eV (FittingResult)"""
+    fittings = []
+    for instance in instances:
+        ac3_ev, ac3_yield020 = instance.ac3_ev, instance.ac3_yield020
+        if not (ac3_ev and ac3_yield020):
+            fittings.append(None)
+            continue
+        baseline = calculate_ac3_baseline(ac3_yield020)
+        instance.ac3_baseline = baseline
+        instance.ac3_slope, instance.ac3_intercept = calculate_ac3_slope_parameters(ac3_ev, ac3_yield020, baseline)
+        fittings.append({"ac3_intersection_ev": calculate_ac3_intersection(ac3_ev, ac3_yield020, baseline)})
+    return ["ac3_baseline", "ac3_slope", "ac3_intercept"], fittings
+
+
+def derive_pl_values(instances):
+    """PL: peak 파장 (FittingResult)"""
+    fittings = []
+    for instance in instances:
+        if not (instance.pl_normdata and instance.pl_wavelength):
+            fittings.append(None)
+            continue
+        fittings.append({"pl_peak_wavelength": calculate_peak_wavelength(instance.pl_normdata, instance.pl_wavelength)})
+    return [], fittings
+
+
+def derive_uvvis_values(instances):
+    """UV-Vis: 보정 데이터 / 직선 fitting (측정 데이터), bandgap (FittingResult)"""
+    fittings = []
+    for instance in instances:
+        if not (instance.uvvis_wavelength and instance.uvvis_rawdata):
+            fittings.append(None)
+            continue
+        (instance.uvvis_corrected_data, instance.uvvis_slope, instance.uvvis_intercept,
+         instance.uvvis_x_intercept, bandgap) = calculate_uvvis_fitting(instance.uvvis_wavelength, instance.uvvis_rawdata)
+        fittings.append({"uvvis_bandgap": bandgap})
+    return ["uvvis_corrected_data", "uvvis_slope", "uvvis_intercept", "uvvis_x_intercept"], fittings
+
+
+def derive_ltpl_values(instances):
+    """LTPL: 77K 첫 peak 기준 triplet energy (FittingResult)"""
+    fittings = []
+    for instance in instances:
+        if not (instance.ltpl_rawdata_77k and instance.ltpl_wavelength_77k):
+            fittings.append(None)
+            continue
+        peak_wavelength = calculate_first_peak_wavelength(instance.ltpl_rawdata_77k, instance.ltpl_wavelength_77k)
+        fittings.append({"ltpl_triplet_energy": None if peak_wavelength == 1 else 1240 / peak_wavelength})
+    return [], fittings
+
+
+def derive_trpl_values(instances):
+    """TRPL: prompt (ns) / delayed tau (FittingResult)"""
+    fittings = []
+    for instance in instances:
+        if not (instance.trpl_time and instance.trpl_area):
+            fittings.append(None)
+            continue
+        prompt_tau, delayed_tau = calculate_tau(instance.trpl_time, instance.trpl_area)
+        fittings.append({"trpl_prompt_tau": prompt_tau * 1000, "trpl_delayed_tau": delayed_tau})
+    return [], fittings
+
+
+def derive_cv_values(instances):
+    """CV: 구조(HOD / EOD)별 zerocap / maxcap / 유전율 (FittingResult)"""
+    zerocap, maxcap, permittivity = batch_cv_capacitance(
+        [instance.cv_vbias for instance in instances],
+        [instance.cv_capdata for instance in instances],
+        [instance.cv_total_thickness for instance in instances],
+    )
+    fields = {
+        "HOD": ("cv_h_zerocap", "cv_h_maxcap", "cv_h_permittivity"),
+        "EOD": ("cv_e_zerocap", "cv_e_mapcap", "cv_e_permittivity"),
+    }
+    fittings = []
+    for i, instance in enumerate(instances):
+        names = fields.get((instance.cv_device_structure or "").strip())
+        if names is None or np.isnan(zerocap[i]):
+            fittings.append(None)
+            continue
+        fittings.append(dict(zip(names, (_optional(zerocap[i]), _optional(maxcap[i]), _optional(permittivity[i])))))
+    return [], fittings
+
+
+def derive_ellipsometer_values(instances):
+    """Ellipsometer: 측정 여부 (FittingResult)"""
+    return [], [{"ellipso_is": True} for _ in instances]
+
+
+# 측정 모델 → 파생 값 계산 함수 (없는 모델은 bulk 저장 후 post_save receiver 실행)
+DERIVED_VALUES = {
+    AC3Meas: derive_ac3_values,
+    PLMeas: derive_pl_values,
+    UVVISMeas: derive_uvvis_values,
+    LTPLMeas: derive_ltpl_values,
+    TRPLMeas: derive_trpl_values,
+    CVMeas: derive_cv_values,
+    EllipsometerMeas: derive_ellipsometer_values,
+}
+
+
+def upsert_fitting_results(rows, batch_size=BULK_BATCH_SIZE):
+    """
+    FittingResult를 sample 기준으로 upsert (기존 행은 bulk_update, 없는 sample은 bulk_create).
+
+    sample에 unique 제약이 없으므로 ON CONFLICT 대신 기존 행을 한 번에 조회해 나눈다
+    (sample당 행이 여럿이면 get_or_create와 같이 첫 행만 갱신).
+
+    Args:
+        rows (list): (sample_id, created_by_id, {필드: 값}) 튜플 리스트.
+    """
+    latest = {}
+    for sample_id, created_by_id, values in rows:
+        if values:
+            # 같은 sample이 여러 번 나오면 필드별로 나중 값 우선
+            _, merged = latest.get(sample_id, (None, {}))
+            latest[sample_id] = (created_by_id, {**merged, **values})
+    if not latest:
+        return
+
+    existing = {}
+    for fitting in FittingResult.objects.filter(sample_id__in=list(latest)).order_by("pk"):
+        existing.setdefault(fitting.sample_id, fitting)
+
+    to_update = defaultdict(list)
+    to_create = []
+    for sample_id, (created_by_id, values) in latest.items():
+        fitting = existing.get(sample_id)
+        if fitting is None:
+            to_create.append(FittingResult(sample_id=sample_id, created_by_id=created_by_id, **values))
+            continue
+        for field, value in values.items():
+            setattr(fitting, field, value)
+        to_update[tuple(sorted(values))].append(fitting)
+
+    with transaction.atomic():
+        for fields, fittings in to_update.items():
+            FittingResult.objects.bulk_update(fittings, list(fields), batch_size=batch_size)
+        if to_create:
+            FittingResult.objects.bulk_create(to_create, batch_size=batch_size)
+
+
+def save_derived_values(model_class, instances, batch_size=BULK_BATCH_SIZE):
+    """측정 데이터 파생 값 계산 후 측정 데이터 bulk_update + FittingResult upsert (post_save receiver와 bulk 저장 공용)"""
+    derive = DERIVED_VALUES.get(model_class)
+    if derive is None or not instances:
+        return
+    update_fields, fittings = derive(instances)
+    changed = [instance for instance, fitting in zip(instances, fittings) if fitting is not None]
+    if update_fields and changed:
+        model_class.objects.bulk_update(changed, update_fields, batch_size=batch_size)
+    upsert_fitting_results(
+        [(instance.sample_id, instance.created_by_id, fitting) for instance, fitting in zip(instances, fittings)],
+        batch_size,
+    )
+
+
+# ---------------------------------------------------------------------------
+# JSON bulk 저장
+# ---------------------------------------------------------------------------
+
+def _measurement_values(model_class, data):
+    """파싱 결과 dict → 측정 모델 필드 값 (from_dict와 같은 형 변환)"""
+    aliases = FIELD_ALIASES.get(model_class.__name__, {})
+    values = {}
+    for field in model_class._meta.concrete_fields:
+        if field.primary_key or field.name in SKIP_FIELDS:
+            continue
+        key = aliases.get(field.name, field.name)
+        if key not in data:
+            continue
+        value = data[key]
+        if isinstance(field, ArrayField):
+            value = [float(w) if w is not None else None for w in value or []]
+        elif isinstance(field, models.FloatField):
+            value = float(value) if value is not None else None
+        values[field.name] = value
+    return values
+
+
+def _get_or_create_materials(mat_names, user, ip_address):
+    """mat_name 목록 → {mat_name: Material} (없는 Material은 한 번에 생성)"""
+    Material.objects.bulk_create(
+        [Material(mat_name=name, created_by=user, ip=ip_address) for name in mat_names], ignore_conflicts=True
+    )
+    return Material.objects.in_bulk(list(mat_names), field_name="mat_name")
+
+
+def _sample_key(data, prefix, material):
+    key = (material.pk, data.get(f"{prefix}_pd_equip"), data.get(f"{prefix}_ms_equip"))
+    if prefix == "iv":
+        key += (data.get("iv_device_classification"), data.get("iv_device_structure"))
+    return key
+
+
+def _get_or_create_samples(data_list, prefix, materials, user, ip_address):
+    """
+    파싱 결과별 Sample (from_dict의 get_or_create와 같은 조건, 조회 1회 + 생성 1회).
+    CV는 새 Sample을 빈 device_structure로 만든 뒤 기존 / 새 Sample 모두 구조를 합치고 classification 갱신
+    (같은 batch 안의 여러 구조도 합쳐짐).
+
+    Returns:
+        list: data_list 순서의 Sample (Material이 없으면 None).
+    """
+    keys = [
+        _sample_key(data, prefix, materials[data.get("mat_name")]) if data.get("mat_name") in materials else None
+        for data in data_list
+    ]
+    existing = {}
+    for sample in Sample.objects.filter(material_id__in={key[0] for key in keys if key}).order_by("pk"):
+        key = (sample.material_id, sample.pd_equip, sample.ms_equip)
+        if prefix == "iv":
+            key += (sample.device_classification, sample.device_structure)
+        existing.setdefault(key, sample)
+
+    new_samples, updated = {}, {}
+    for data, key in zip(data_list, keys):
+        if key is None:
+            continue
+        sample = existing.get(key) or new_samples.get(key)
+        if sample is None:
+            sample = new_samples[key] = Sample(
+                material=materials[data["mat_name"]],
+                pd_equip=key[1],
+                ms_equip=key[2],
+                pd_date=datetime.strptime(data.get(f"{prefix}_pd_date"), "%Y-%m-%d").date(),
+                ms_date=datetime.strptime(data.get(f"{prefix}_ms_date"), "%Y-%m-%d").date(),
+                device_classification=data.get(f"{prefix}_device_classification") or "",
+                device_structure="" if prefix == "cv" else data.get(f"{prefix}_device_structure") or "",
+                created_by=user,
+                ip=ip_address,
+            )
+        if prefix == "cv":
+            # 기존 구조에 새 구조 추가, classification 갱신
+            structures = set(filter(None, sample.device_structure.split(",")))
+            structures |= set(filter(None, (data.get("cv_device_structure") or "").split(",")))
+            device_structure = ",".join(sorted(structures))
+            device_classification = data.get("cv_device_classification") or ""
+            if (device_structure, device_classification) != (sample.device_structure, sample.device_classification):
+                sample.device_structure, sample.device_classification = device_structure, device_classification
+                if sample.pk is not None:
+                    updated[sample.pk] = sample
+
+    Sample.objects.bulk_create(list(new_samples.values()))
+    if updated:
+        Sample.objects.bulk_update(list(updated.values()), ["device_structure", "device_classification"])
+    return [existing.get(key) or new_samples.get(key) if key else None for key in keys]
+
+
+@transaction.atomic
+def _load_batch(data_list, user, ip_address, model_class, batch_size):
+    """파싱 결과 batch 1개 저장 → 새로 저장한 측정 데이터 수"""
+    name = model_class.__name__
+    prefix = MEASUREMENT_PREFIXES[name]
+
+    # incremental 파싱 결과: 바뀐 파일로 저장됐던 이전 측정 데이터는 지우고 다시 생성 (batch당 1회)
+    source_files = [source for data in data_list for source in data.get(SOURCE_FILES_KEY) or []]
+    if source_files:
+        delete_previous_measurements(source_files, model_class)
+
+    materials = _get_or_create_materials({data["mat_name"] for data in data_list if data.get("mat_name")}, user, ip_address)
+    samples = _get_or_create_samples(data_list, prefix, materials, user, ip_address)
+
+    key_fields = MEASUREMENT_KEYS.get(name, ("sample_id",))
+    existing = {
+        row[:-1]: model_class(pk=row[-1])
+        for row in model_class.objects.filter(sample__in=[s for s in samples if s]).values_list(*key_fields, "pk")
+    }
+
+    created, manifest_entries, plqy_rows = [], [], []
+    for data, sample in zip(data_list, samples):
+        if sample is None:
+            continue
+        instance = model_class(sample=sample, created_by=user, ip=ip_address, **_measurement_values(model_class, data))
+        key = tuple(getattr(instance, field) for field in key_fields)
+        if key in existing:
+            instance = existing[key]
+        else:
+            existing[key] = instance
+            created.append(instance)
+        manifest_entries.append((data.get(SOURCE_FILES_KEY), instance))
+        if name == "PLQYMeas" and "plqy_value" in data:
+            plqy_rows.append((sample.pk, user.pk if user else None, {"plqy_value": float(data["plqy_value"])}))
+
+    model_class.objects.bulk_create(created, batch_size=batch_size)
+
+    if model_class in DERIVED_VALUES:
+        save_derived_values(model_class, created, batch_size)
+    else:
+        # batch 계산 함수가 없는 모델은 기존 post_save receiver 그대로 실행
+        for instance in created:
+            post_save.send(sender=model_class, instance=instance, created=True, raw=False,
+                           using=instance._state.db, update_fields=None)
+    upsert_fitting_results(plqy_rows, batch_size)
+    record_parsed_files_bulk([(sources, instance) for sources, instance in manifest_entries if sources], batch_size)
+    return len(created)
+
+
+def load_json_file_bulk(json_file_path, user, ip_address, model_class, batch_size=BULK_BATCH_SIZE):
+    """
+    load_json_file의 bulk 버전: Material / Sample / 측정 데이터를 bulk_create로 저장하고
+    파생 값(AC3 baseline, UV-Vis bandgap, PL peak, TRPL tau, CV 유전율 등)은 batch로 계산해
+    FittingResult를 batch당 1 statement로 upsert (batch_size건당 query 수가 일정).
+
+    Returns:
+        int: 새로 저장한 측정 데이터 수.
+    """
+    try:
+        with open(json_file_path, 'r') as file:
+            data_list = json.load(file)
+    except (OSError, ValueError) as e:
+        print(f'Error loading JSON file {json_file_path}: {e}')
+        return 0
+
+    created = 0
+    for start in range(0, len(data_list), batch_size):
+        try:
+            created += _load_batch(data_list[start:start + batch_size], user, ip_address, model_class, batch_size)
+        except Exception as e:
+            print(f'Error loading JSON file {json_file_path} (rows {start}-{start + batch_size - 1}): {e}')
+    return created
@@ -1,33 +1,172 @@
+import multiprocessing
 import os
-import pandas as pd
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from utils import ParsingUtils  # 유틸리티 함수 사용
+from dvmt.utils.instrument_readers import read_cv, read_ltpl, read_plqy
+
+PARSE_CHUNK_SIZE = 32  # process pool에 한 번에 넘길 파일 수
+
+_worker_parser = None  # (worker 프로세스) 파일 파싱 전용 DataParsing (디렉토리 수집 없음)
+
+
+def _init_parse_worker():
+    global _worker_parser
+    _worker_parser = DataParsing(None)
+
+
+def _parse_file_worker(task):
+    """worker 프로세스에서 실행: (parse 메서드 이름, root, file, kwargs) → 파싱 결과"""
+    method_name, root, file, kwargs = task
+    try:
+        return getattr(_worker_parser, method_name)(root, file, **kwargs)
+    except Exception as e:
+        print(f"Error processing {file}: {e}")
+        return {}
+
 
 class DataParsing:
-    def __init__(self, folder_path: str):
+    def __init__(self, folder_path: str, workers: int = 1, extensions=None, equipment=None, incremental=False):
         """
         데이터 파싱 클래스. 주어진 폴더에서 데이터를 추출하여 JSON 형태로 반환.
 
         Args:
             folder_path (str): 데이터가 저장된 루트 폴더 경로.
+            workers (int): 디렉토리 탐색 thread / 파일 파싱 process 수 (1이면 직렬).
+            extensions (list): 수집할 파일 확장자 (예: [".txt", ".csv"], None이면 전체).
+            equipment (list): 수집할 장비 폴더 이름 (folder_path 바로 아래 폴더, None이면 전체).
+            incremental (bool): manifest(ParsedFile) 기준 새 파일 / 바뀐 파일만 파싱.
         """
         self.folder_path = folder_path
         self.utils = ParsingUtils()
-        self.root_files = self._collect_files()  # 디렉토리 내 파일 정보 수집
+        self.workers = max(1, int(workers or 1))
+        self.extensions = tuple(ext.lower() for ext in extensions) if extensions else None
+        self.equipment = {name.lower() for name in equipment} if equipment else None
+        self.incremental = incremental
+        self.source_signatures = None  # incremental 파싱 대상 파일 시그니처 {절대 경로: {...}}
+        self._root_files = None
+
+    @property
+    def root_files(self):
+        """디렉토리 내 파일 정보 (처음 사용할 때 수집)"""
+        if self._root_files is None:
+            self._root_files = self._collect_files()
+        return self._root_files
+
+    @root_files.setter
+    def root_files(self, value):
+        self._root_files = value
+
+    @property
+    def scanned_files(self):
+        """지금까지 수집된 파일 정보 (수집 전이면 빈 리스트, 디렉토리를 다시 탐색하지 않음)"""
+        return self._root_files or []
 
     def _collect_files(self):
         """
-        폴더 내에서 유효한 파일들을 수집.
+        폴더 내에서 유효한 파일들을 수집 (os.walk와 같은 순서).
+        파일을 열기 전에 확장자 / 장비 폴더로 거르고, workers > 1이면 최상위 하위 폴더별로
+        thread를 나눠 탐색 (NAS 디렉토리 조회 지연을 겹침).
 
         Returns:
             list: (폴더 경로, 파일 이름) 튜플 리스트.
         """
-        collected_files = []
-        for root, _, files in os.walk(self.folder_path):
-            for file in files:
-                collected_files.append((root, file))
+        if not self.folder_path or not os.path.isdir(self.folder_path):
+            return []
+
+        collected_files, top_dirs = [], []
+        with os.scandir(self.folder_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if self.equipment is None or entry.name.lower() in self.equipment:
+                        top_dirs.append(entry.path)
+                elif self.equipment is None and self._is_target_file(entry.name):
+                    collected_files.append((self.folder_path, entry.name))
+
+        if self.workers > 1 and len(top_dirs) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                nested = list(pool.map(self._walk_files, top_dirs))
+        else:
+            nested = [self._walk_files(path) for path in top_dirs]
+
+        for files in nested:
+            collected_files.extend(files)
         return collected_files
 
+    def _walk_files(self, folder_path):
+        return [
+            (root, file)
+            for root, _, files in os.walk(folder_path)
+            for file in files
+            if self._is_target_file(file)
+        ]
+
+    def _is_target_file(self, file):
+        return self.extensions is None or file.lower().endswith(self.extensions)
+
+    def _select_files(self, target_files, group_by_root=False):
+        """incremental이면 manifest 기준 새 파일 / 바뀐 파일만 남김 (시그니처는 self.source_signatures)"""
+        if not self.incremental:
+            self.source_signatures = None
+            return target_files
+        # worker 프로세스(Django 미설정)에서는 import하지 않도록 여기서 import
+        from dvmt.utils.file_manifest import filter_changed_files
+
+        selected, self.source_signatures = filter_changed_files(target_files, group_by_root)
+        print(f"Incremental parsing: {len(selected)}/{len(target_files)} files changed")
+        return selected
+
+    def _attach_sources(self, file_data, root, files):
+        """파싱 결과에 원본 파일 시그니처 추가 (incremental일 때만, load_json_file이 manifest에 기록)"""
+        if self.source_signatures is not None:
+            from dvmt.utils.file_manifest import attach_source_files
+
+            attach_source_files(file_data, self.source_signatures, root, files)
+        return file_data
+
+    def _record_empty_files(self, files, parsed_files):
+        """
+        파싱 결과가 없는 파일도 manifest에 측정 데이터 없이 기록 (incremental일 때만).
+        기록하지 않으면 매 실행마다 바뀐 파일로 보고 다시 hash / 파싱함.
+        """
+        if self.source_signatures is None:
+            return
+        from dvmt.utils.file_manifest import record_empty_files
+
+        empty_sources = [
+            self.source_signatures[path]
+            for path in (
+                os.path.abspath(os.path.join(root, file))
+                for (root, file), file_data in zip(files, parsed_files) if not file_data
+            )
+            if path in self.source_signatures
+        ]
+        record_empty_files(empty_sources)
+
+    def _parse_files(self, method_name, files, **kwargs):
+        """
+        (root, file) 목록을 parse 메서드(ltpl_parse_file 등)로 파싱, 결과는 files 순서 그대로.
+        workers > 1이면 process pool에서 파일별로 동시에 파싱.
+        """
+        if self.workers <= 1 or len(files) < 2:
+            results = []
+            for root, file in files:
+                try:
+                    results.append(getattr(self, method_name)(root, file, **kwargs))
+                except Exception as e:
+                    print(f"Error processing {file}: {e}")
+                    results.append({})
+            return results
+
+        tasks = [(method_name, root, file, kwargs) for root, file in files]
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_parse_worker,
+        ) as pool:
+            return list(pool.map(_parse_file_worker, tasks, chunksize=PARSE_CHUNK_SIZE))
+
     def ltpl_parsing(self, file_type=".txt", check_item="TITLE", prefix="ltpl"):
         """
         LTPL 데이터 파일을 파싱하여, 동일한 sample (mat_name)에 대해 데이터를 병합.
@@ -48,13 +187,21 @@ class DataParsing:
             print("No valid files found in the directory.")
             return [], prefix
 
-        for root, file in self.root_files:
-            file_lower = file.lower()
-            if not any(keyword in file_lower for keyword in valid_keywords):
-                continue  # 필요한 파일만 처리
+        # 필요한 파일만 처리 (파일을 열기 전에 이름 / 확장자로 거름)
+        target_files = [
+            (root, file) for root, file in self.root_files
+            if any(keyword in file.lower() for keyword in valid_keywords)
+            and self.utils.is_valid_extension(file, file_type)
+        ]
+        # 77K / 289K 파일을 합쳐 저장하므로 폴더 안 파일 하나만 바뀌어도 폴더 전체 다시 파싱
+        target_files = self._select_files(target_files, group_by_root=True)
+        parsed_files = self._parse_files(
+            "ltpl_parse_file", target_files, file_type=file_type, check_item=check_item, prefix=prefix
+        )
+        self._record_empty_files(target_files, parsed_files)
 
+        for (root, file), file_data in zip(target_files, parsed_files):
             try:
-                file_data = self.ltpl_parse_file(root, file, file_type, check_item, prefix)
                 if not file_data:
                     continue  # 유효한 데이터가 없으면 스킵
                 
@@ -79,88 +226,70 @@ class DataParsing:
                     parsed_dict[mat_name][f"{prefix}_wavelength_289k"] = file_data[f"{prefix}_wavelength"]
                     parsed_dict[mat_name][f"{prefix}_rawdata_289k"] = file_data[f"{prefix}_rawdata"]
 
+                if self.source_signatures is not None:
+                    sources = self._attach_sources({}, root, [file]).get("source_files", [])
+                    parsed_dict[mat_name].setdefault("source_files", []).extend(sources)
+
             except Exception as e:
                 print(f"Error processing {file}: {e}")
 
         return list(parsed_dict.values()), prefix
 
-   def ltpl_parse_file(self, root, file, file_type=".txt", check_item="TITLE", prefix="ltpl"):
-	    """
-	    LTPL 개별 파일을 파싱하여 데이터를 추출.
-	
-	    Args:
-	        root (str): 파일이 위치한 폴더 경로.
-	        file (str): 처리할 파일 이름.
-	        file_type (str): 파일 확장자 (기본값: ".txt").
-	        check_item (str): 데이터 유효성을 검사할 키워드 (기본값: "TITLE").
-	        prefix (str): 데이터 키에 붙일 접두사 (기본값: "ltpl").
-	
-	    Returns:
-	        dict: 추출된 데이터 딕셔너리 (77K/289K 구분하여 저장).
-	    """
-	    file_path = os.path.join(root, file)
-	    cond_list = root.split('/')
-	
-	    solvent_dict = {
-	        "tol": "Toluene",
-	        "thf": "THF",
-	        "methf": "MeTHF",
-	    }
-	
-	    try:
-	        if not self.utils.is_valid_extension(file, file_type):
-	            return {}
-	
-	        max_columns = self.utils.find_max_row(file_path)
-	        column_names = [f"column_{i+1}" for i in range(max_columns)]
-	        df = pd.read_csv(file_path, delimiter=r"\s+", header=None, names=column_names, dtype=str, encoding="cp949", engine="python")
-	
-	        if not self.utils.is_valid_content(df, check_item):
-	            return {}
-	
-	        data_point_count = self.utils.find_valid_by_keyword(df, "NPOINTS")
-	        data_extract_start = self.utils.find_data_extract(df)
-	        data_extract_end = int(data_extract_start + data_point_count)
-	
-	        ltpl_wavelength = df.iloc[data_extract_start:data_extract_end, 0].astype(float).tolist()
-	        ltpl_rawdata = df.iloc[data_extract_start:data_extract_end, 1].astype(float).tolist()
-	
-	        file_name_lower = file.lower()
-	        solvent = next((value for key, value in solvent_dict.items() if key in file_name_lower), None)
-	
-	        # ✅ Identifier에 따라 77K/289K 구분하여 저장
-	        if "77k_20ms" in file_name_lower:
-	            return {
-	                "mat_name": cond_list[-1],  # ✅ sample_id 대신 mat_name 유지
-	                f"{prefix}_ms_equip": cond_list[-5],
-	                f"{prefix}_pd_equip": cond_list[-4],
-	                f"{prefix}_pd_date": self.utils.extract_date_from_string(cond_list[-3]),
-	                f"{prefix}_ms_date": self.utils.extract_date_from_string(cond_list[-2]),
-	                f"{prefix}_wavelength_77k": ltpl_wavelength,
-	                f"{prefix}_rawdata_77k": ltpl_rawdata,
-	                f"{prefix}_solvent": solvent,
-	                f"{prefix}_root": root,  # ✅ 파일 위치 추가
-	            }
-	
-	        elif "289k" in file_name_lower:
-	            return {
-	                "mat_name": cond_list[-1],
-	                f"{prefix}_ms_equip": cond_list[-5],
-	                f"{prefix}_pd_equip": cond_list[-4],
-	                f"{prefix}_pd_date": self.utils.extract_date_from_string(cond_list[-3]),
-	                f"{prefix}_ms_date": self.utils.extract_date_from_string(cond_list[-2]),
-	                f"{prefix}_wavelength_289k": ltpl_wavelength,
-	                f"{prefix}_rawdata_289k": ltpl_rawdata,
-	                f"{prefix}_solvent": solvent,
-	                f"{prefix}_root": root,
-	            }
-	
-	        else:
-	            return {}
-	
-	    except Exception as e:
-	        print(f"Failed to parse {file}: {e}")
-	        return {}
+    def ltpl_parse_file(self, root, file, file_type=".txt", check_item="TITLE", prefix="ltpl"):
+        """
+        LTPL 개별 파일을 파싱하여 데이터를 추출.
+
+        Args:
+            root (str): 파일이 위치한 폴더 경로.
+            file (str): 처리할 파일 이름.
+            file_type (str): 파일 확장자 (기본값: ".txt").
+            check_item (str): 데이터 유효성을 검사할 키워드 (기본값: "TITLE").
+            prefix (str): 데이터 키에 붙일 접두사 (기본값: "ltpl").
+
+        Returns:
+            dict: 추출된 데이터 딕셔너리 (identifier로 77K/289K 구분, ltpl_parsing에서 병합).
+        """
+        file_path = os.path.join(root, file)
+        cond_list = root.split('/')
+
+        solvent_dict = {
+            "tol": "Toluene",
+            "thf": "THF",
+            "methf": "MeTHF",
+        }
+
+        try:
+            if not self.utils.is_valid_extension(file, file_type):
+                return {}
+
+            file_name_lower = file.lower()
+            identifier = next((key for key in ("77k_20ms", "289k") if key in file_name_lower), None)
+            if identifier is None:
+                return {}
+
+            # ✅ 파일 1회 읽기: TITLE / NPOINTS 확인 후 숫자 block만 float64로 변환
+            spectrum = read_ltpl(file_path, check_item)
+            if spectrum is None:
+                return {}
+
+            solvent = next((value for key, value in solvent_dict.items() if key in file_name_lower), None)
+
+            return {
+                "mat_name": cond_list[-1],  # ✅ sample_id 대신 mat_name 유지
+                f"{prefix}_ms_equip": cond_list[-5],
+                f"{prefix}_pd_equip": cond_list[-4],
+                f"{prefix}_pd_date": self.utils.extract_date_from_string(cond_list[-3]),
+                f"{prefix}_ms_date": self.utils.extract_date_from_string(cond_list[-2]),
+                f"{prefix}_identifier": identifier,
+                f"{prefix}_wavelength": spectrum["wavelength"].tolist(),
+                f"{prefix}_rawdata": spectrum["rawdata"].tolist(),
+                f"{prefix}_solvent": solvent,
+                f"{prefix}_root": root,  # ✅ 파일 위치 추가
+            }
+
+        except Exception as e:
+            print(f"Failed to parse {file}: {e}")
+            return {}
         
         
     
@@ -173,13 +302,14 @@ class DataParsing:
         
         if not self.root_files:
             return []
-        for root, file in self.root_files:
-            try:
-                file_data = self.cv_parse_file(root, file, file_type, prefix)
-                if file_data:
-                    parsed_list.append(file_data)
-            except Exception as e:
-                print(f"error processing {file} : {e}")
+        target_files = self._select_files([
+            (root, file) for root, file in self.root_files if self.utils.is_valid_extension(file, file_type)
+        ])
+        parsed_files = self._parse_files("cv_parse_file", target_files, file_type=file_type, prefix=prefix)
+        self._record_empty_files(target_files, parsed_files)
+        for (root, file), file_data in zip(target_files, parsed_files):
+            if file_data:
+                parsed_list.append(self._attach_sources(file_data, root, [file]))
         for file_data in parsed_list:
             material_name = file_data.get('mat_name')
             if self.cv_device_dict and material_name in self.cv_device_dict:
@@ -195,22 +325,14 @@ class DataParsing:
             if not self.utils.is_valid_extension(file, file_type):
                 return []
             
-            max_columns = 6
-            column_names = [f"column_{i+1}" for i in range(max_columns)]
-            df = pd.read_csv(file_path, header=None, names=column_names, dtype=str, encoding="utf-8")
-            cv_aclevel, cv_frequency = None, None
-            cv_vbias, cv_capdata = [], []
-            
-            data_start_idx = df[df["column_1"] == "DataName"].index
-            if not data_start_idx.empty:
-                data_start_idx = data_start_idx[0] + 1
-                cv_vbias = df.iloc[data_start_idx:, 1].replace(' ', '0').sdtype(float).tolist()
-                cv_capdata = df.iloc[data_start_idx:, 4].replace(' ', '0').sdtype(float).tolist()
-            cv_aclevel = self.utils.find_value_by_keyword(df, "Measurement.Secondary.ACLevel", columns=1)
-            cv_frequency = self.utils.find_value_by_keyword(df, "Measurement.Secondary.Frequency", columns=1)
+            # 파일 1회 읽기: DataName 이후 숫자 block → vbias / capdata, header에서 ACLevel / Frequency
+            measurement = read_cv(file_path)
+            cv_aclevel, cv_frequency = measurement["aclevel"], measurement["frequency"]
+            cv_vbias = measurement["vbias"].tolist()
+            cv_capdata = measurement["capdata"].tolist()
                 
-            ms_date_value_str = self.utils.extract_date_from_string(condlist[-4])    
-            pd_date_value_str = self.utils.extract_date_from_string(condlist[-5])    
+            ms_date_value_str = self.utils.extract_date_from_string(cond_list[-4])    
+            pd_date_value_str = self.utils.extract_date_from_string(cond_list[-5])    
             file_data = {
                 f"{prefix}_root" : root,
                 "mat_name" : cond_list[-1],
@@ -218,7 +340,7 @@ class DataParsing:
                 f"{prefix}_pd_equip": cond_list[-6],
                 f"{prefix}_pd_date": pd_date_value_str,
                 f"{prefix}_ms_date": ms_date_value_str,
-                f"{prefix}_device_classification": condlist[-3],
+                f"{prefix}_device_classification": cond_list[-3],
                 f"{prefix}_device_structure": cond_list[-2],
                 f"{prefix}_aclevel": cv_aclevel,
                 f"{prefix}_frequency": cv_frequency,
@@ -231,15 +353,16 @@ class DataParsing:
         return file_data
         
     def plqy_parsing(self, file_type=".all", check_item="ALL", prefix="plqy"):
-		parsed_list = []
-		for root, file in self.root_files:
-			try:
-				file_data = self.plqy_parse_file(
-					root, file, file_type, check_item, prefix
-				)
-				parsed_list.append(file_data)
-			except Excepttion as e:
-				print(f"error processing {file} : {e}")
+		target_files = self._select_files([
+			(root, file) for root, file in self.root_files if self.utils.is_valid_extension(file, file_type)
+		])
+		parsed_list = self._parse_files(
+			"plqy_parse_file", target_files, file_type=file_type, check_item=check_item, prefix=prefix
+		)
+		self._record_empty_files(target_files, parsed_list)
+		for (root, file), file_data in zip(target_files, parsed_list):
+			if file_data:
+				self._attach_sources(file_data, root, [file])
 		return parsed_list, prefix
 		
 	def plqy_parse_file(self, root, file, file_type=".all", check_item="ALL", prefix="plqy"):
@@ -251,14 +374,13 @@ class DataParsing:
 			if not self.utils.is_valid_extension(file, file_type):
 				return {}
 			
-			df = pd.read_csv(file_path, header=None, delimiter="\t", dtype=str)
-			
-			if not self.utils.is_valid_content(df, check_item):
+			# 파일 1회 읽기: header(메타데이터)는 문자열 DataFrame, 숫자 block은 float64 배열
+			measurement = read_plqy(file_path, check_item)
+			if measurement is None:
 				return {}
 			
-			data_extract_start = self.utils.find_data_extract_start(df)
-			if data_extract_start is None:
-				return {}
+			df, data = measurement["header"], measurement["data"]
+			data_extract_start = measurement["data_start"]
 			
 			# 메타데이터 추출
 			file_data.update({
@@ -306,11 +428,17 @@ class DataParsing:
 			ref_col = 1 + (sample_num - 1) * 2
 			sample_col = ref_col + 1
 			
+			value_row = 12 + (sample_num - 1) * 2
+			if value_row < data_extract_start:
+				plqy_value = float(df.iloc[value_row, 4])
+			else:
+				plqy_value = float(data[value_row - data_extract_start, 4])
+			
 			file_data.update({
-				f"{prefix}_value": float(df.iloc[12 + (sample_num - 1) * 2, 4]),
-				f"{prefix}_wavelength": df.iloc[data_extract_start:, 0].tolist(),
-				f"{prefix}_refdata": df.iloc[data_extract_start:, ref_col].tolist(),
-				f"{prefix}_sampledata": df.iloc[data_extract_start:, sample_col].tolist()
+				f"{prefix}_value": plqy_value,
+				f"{prefix}_wavelength": data[:, 0].tolist(),
+				f"{prefix}_refdata": data[:, ref_col].tolist(),
+				f"{prefix}_sampledata": data[:, sample_col].tolist()
 			})
 			
 		except Exception as e:
@@ -319,8 +447,15 @@ class DataParsing:
 		return file_data
 				
         
-def parse_run(equipment_name=None):
-    parser = DataParsing(os.getcwd())
+def parse_run(equipment_name=None, workers=1, incremental=False):
+    """
+    장비별 rawdata 파싱.
+
+    Returns:
+        list: 파싱하면서 수집한 (폴더 경로, 파일 이름) 리스트 (flag_missing_files에 그대로 전달).
+    """
+    parser = DataParsing(os.getcwd(), workers=workers, incremental=incremental)
+    scanned_files = []
     utils = ParsingUtils()
     equipment_folders = {
         "ac3" : "AC3",
@@ -337,15 +472,18 @@ def parse_run(equipment_name=None):
                 utils.prepare_directories(cv_folder_path, cv_excel_path)
                 parser.load_cv_device_dict(cv_excel_path)
                 parser.parsing(cv_folder_path, True)
+                scanned_files.extend(parser.scanned_files)
             elif equipment_name.lower() == "iv":
                 iv_folder_path = os.path.join(os.getcwd(), "mediafiles", "dvmt", "rawdata", folder_name)
                 iv_excel_path = os.path.join(iv_folder_path, "IV_datalist.xlsx")
                 utils.prepare_directories(iv_folder_path, iv_excel_path)
                 parser.load_iv_device_dict(iv_excel_path)
                 parser.parsing(iv_folder_path, True)
+                scanned_files.extend(parser.scanned_files)
             else:
                 folder_path = os.path.join(os.getcwd(), "mediafiles", "dvmt", "rawdata", folder_name)
                 parser.parsing(folder_path, True)
+                scanned_files.extend(parser.scanned_files)
         else:
             # unknown equipment_name, ignore or log
             pass
@@ -362,4 +500,6 @@ def parse_run(equipment_name=None):
                 utils.prepare_directories(folder_path, iv_excel_path)
                 parser.load_iv_device_dict(iv_excel_path)
             # AC3 같은 다른 장비는 Excel 불필요
-            parser.parsing(folder_path, True)
\ No newline at end of file
+            parser.parsing(folder_path, True)
+            scanned_files.extend(parser.scanned_files)
+    return scanned_files
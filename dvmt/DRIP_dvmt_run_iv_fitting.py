@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from dvmt.models import IVFitJob, IVMeas
+from dvmt.utils.iv_fitting import enqueue_iv_fits, run_pending_iv_fit_jobs
+
+
+class Command(BaseCommand):
+    help = "대기 중인 IV Poole-Frenkel fitting 작업 실행 (서버 재시작 등으로 남은 작업 처리)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retry-failed", action="store_true",
+                            help="실패한 작업도 다시 실행")
+        parser.add_argument("--missing", action="store_true",
+                            help="fitting 작업도 fitting 결과도 없는 IV 측정 데이터를 등록 후 실행")
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            IVFitJob.objects.filter(status=IVFitJob.StatusChoices.FAILURE).update(
+                status=IVFitJob.StatusChoices.PENDING, message=""
+            )
+        if options["missing"]:
+            # 이전 fitting 결과가 있는 행은 iv_vbias / iv_idata가 fitting 구간으로 잘려 저장되어 있어 다시 fitting 불가
+            enqueue_iv_fits(
+                IVMeas.objects.filter(fit_job__isnull=True).filter(Q(iv_jv_fit__isnull=True) | Q(iv_jv_fit=[])),
+                submit=False,
+            )
+
+        count = run_pending_iv_fit_jobs()
+        self.stdout.write(self.style.SUCCESS(f"{count} IV fitting jobs processed"))
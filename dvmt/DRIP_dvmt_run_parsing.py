@@ -1,20 +1,38 @@
 from django.core.management.base import BaseCommand
 from dvmt.utils.data_parsing import DataParsing, parse_run
+from dvmt.utils.file_manifest import flag_missing_files
 import os
 
 class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("equipment", nargs="?", default=None)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="디렉토리 탐색 / 파일 파싱 병렬 수 (1이면 직렬)")
+        parser.add_argument("--full", action="store_true",
+                            help="manifest를 무시하고 모든 파일 다시 파싱 (기본: 새 파일 / 바뀐 파일만)")
+        parser.add_argument("--prune-missing", action="store_true",
+                            help="원본 파일이 사라진 측정 데이터 삭제 (기본: manifest에 missing 표시만)")
         
     def handle(self, *args, **options):
         equipment = options["equipment"]
         folder_path = os.path.join(os.getcwd(), "mediafiles", "dvmt", "rawdata")
-        parser = DataParsing(folder_path)
-        
+        workers = options["workers"]
+        incremental = not options["full"]
+        parser = DataParsing(folder_path, workers=workers, incremental=incremental)
+        scanned_files = []
+
         if equipment and equipment.lower() == "material":
             parser.parse_material_file()
         elif equipment and equipment.lower() == "all":
             parser.parse_material_file()
-            parse_run()
+            scanned_files = parse_run(workers=workers, incremental=incremental)
         else:
-            parse_run(equipment)
+            scanned_files = parse_run(equipment, workers=workers, incremental=incremental)
+        scanned_files = [*parser.scanned_files, *scanned_files]
+
+        # 사라진 원본 파일 처리 (이번 파싱에서 스캔한 파일 기준, 다시 탐색하지 않음)
+        # 스캔 목록에 없는 manifest 행은 flag_missing_files가 실제 존재 여부로 다시 확인
+        missing = flag_missing_files(folder_path, scanned_files, delete=options["prune_missing"])
+        if missing:
+            action = "deleted" if options["prune_missing"] else "flagged"
+            self.stdout.write(self.style.WARNING(f"{len(missing)} missing source files {action}"))
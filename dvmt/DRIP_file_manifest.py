@@ -0,0 +1,212 @@
+import hashlib
+import os
+from collections import defaultdict
+
+from django.apps import apps
+from django.db import transaction
+from dvmt.models import ParsedFile
+
+HASH_CHUNK_SIZE = 1024 * 1024
+SOURCE_FILES_KEY = "source_files"  # 파싱 결과 dict에 붙는 원본 파일 시그니처 목록
+
+
+def file_hash(path):
+    """파일 내용 blake2b hash (chunk 단위로 읽음)"""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def filter_changed_files(files, group_by_root=False):
+    """
+    manifest(ParsedFile)와 비교해 새 파일 / 바뀐 파일만 반환.
+    - size, mtime이 같으면 파일을 읽지 않고 제외
+    - size / mtime이 다르면 hash를 비교해 내용이 같으면 manifest의 size / mtime만 갱신
+    - group_by_root: 같은 폴더 파일을 합쳐 저장하는 측정(LTPL 77K + 289K)은 폴더 안 하나만 바뀌어도 폴더 전체 반환
+    - 파싱 결과가 없던 파일도 manifest에 있으므로 (record_empty_files) 바뀌지 않으면 제외
+
+    Args:
+        files (list): (폴더 경로, 파일 이름) 튜플 리스트.
+
+    Returns:
+        list: 파싱할 (폴더 경로, 파일 이름) 리스트.
+        dict: {절대 경로: {"path", "size", "mtime", "hash"}} 파싱할 파일의 시그니처.
+    """
+    paths = {os.path.abspath(os.path.join(root, file)): (root, file) for root, file in files}
+    manifest = {
+        row.path: row for row in ParsedFile.objects.filter(path__in=list(paths)).only(
+            "path", "size", "mtime", "content_hash", "missing"
+        )
+    }
+
+    changed, signatures, touched = set(), {}, []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            print(f"Failed to stat {path}: {e}")
+            continue
+        row = manifest.get(path)
+        if row and not row.missing and row.size == stat.st_size and row.mtime == stat.st_mtime:
+            continue
+
+        content_hash = file_hash(path)
+        if row and not row.missing and row.content_hash == content_hash:
+            row.size, row.mtime = stat.st_size, stat.st_mtime
+            touched.append(row)
+            continue
+        changed.add(path)
+        signatures[path] = {"path": path, "size": stat.st_size, "mtime": stat.st_mtime, "hash": content_hash}
+
+    if touched:
+        ParsedFile.objects.bulk_update(touched, ["size", "mtime"], batch_size=500)
+
+    if group_by_root:
+        changed_roots = {paths[path][0] for path in changed}
+        selected = [path for path, (root, _) in paths.items() if root in changed_roots]
+        for path in selected:
+            if path not in signatures:
+                stat = os.stat(path)
+                signatures[path] = {
+                    "path": path, "size": stat.st_size, "mtime": stat.st_mtime, "hash": file_hash(path),
+                }
+    else:
+        selected = [path for path in paths if path in changed]
+    return [paths[path] for path in selected], signatures
+
+
+def attach_source_files(file_data, signatures, root, files):
+    """파싱 결과 dict에 원본 파일 시그니처 추가 (load_json_file에서 manifest 저장에 사용)"""
+    file_data[SOURCE_FILES_KEY] = [
+        signatures[path]
+        for path in (os.path.abspath(os.path.join(root, file)) for file in files)
+        if path in signatures
+    ]
+    return file_data
+
+
+@transaction.atomic
+def record_parsed_files(source_files, instance=None):
+    """
+    파싱 후 저장까지 끝난 파일들을 manifest에 기록 (instance: 이 파일들로 저장된 측정 데이터).
+    저장에 실패한 파일은 기록하지 않으므로 다음 실행에서 다시 파싱됨.
+    """
+    for source in source_files or []:
+        ParsedFile.objects.update_or_create(
+            path=source["path"],
+            defaults={
+                "size": source["size"],
+                "mtime": source["mtime"],
+                "content_hash": source["hash"],
+                "measurement_model": instance.__class__.__name__ if instance is not None else "",
+                "measurement_id": instance.pk if instance is not None else None,
+                "missing": False,
+            },
+        )
+
+
+def record_parsed_files_bulk(entries, batch_size=500):
+    """
+    record_parsed_files의 bulk 버전 (path 기준 upsert, batch당 1 statement).
+
+    Args:
+        entries (list): (source_files, instance) 튜플 리스트.
+    """
+    rows = {}
+    for source_files, instance in entries:
+        for source in source_files or []:
+            rows[source["path"]] = ParsedFile(
+                path=source["path"],
+                size=source["size"],
+                mtime=source["mtime"],
+                content_hash=source["hash"],
+                measurement_model=instance.__class__.__name__ if instance is not None else "",
+                measurement_id=instance.pk if instance is not None else None,
+                missing=False,
+            )
+    if rows:
+        ParsedFile.objects.bulk_create(
+            list(rows.values()), batch_size=batch_size, update_conflicts=True, unique_fields=["path"],
+            update_fields=["size", "mtime", "content_hash", "measurement_model", "measurement_id", "missing", "parsed_at"],
+        )
+
+
+def record_empty_files(source_files, batch_size=500):
+    """
+    파싱 결과가 없는 파일을 manifest에 기록 (측정 데이터 없음, 다음 실행에서 다시 hash / 파싱하지 않음).
+    이미 있는 행은 시그니처만 갱신하고 이전 측정 데이터 연결은 그대로 둠.
+    """
+    rows = {
+        source["path"]: ParsedFile(
+            path=source["path"],
+            size=source["size"],
+            mtime=source["mtime"],
+            content_hash=source["hash"],
+            measurement_model="",
+            measurement_id=None,
+            missing=False,
+        )
+        for source in source_files or []
+    }
+    if rows:
+        ParsedFile.objects.bulk_create(
+            list(rows.values()), batch_size=batch_size, update_conflicts=True, unique_fields=["path"],
+            update_fields=["size", "mtime", "content_hash", "missing", "parsed_at"],
+        )
+
+
+def delete_previous_measurements(source_files, model_class):
+    """
+    바뀐 파일로 이전에 저장된 측정 데이터 삭제 (from_dict는 get_or_create라 기존 값을 갱신하지 않음).
+
+    Returns:
+        int: 삭제한 측정 데이터 수.
+    """
+    paths = [source["path"] for source in source_files or []]
+    ids = set(
+        ParsedFile.objects.filter(path__in=paths, measurement_model=model_class.__name__)
+        .exclude(measurement_id=None)
+        .values_list("measurement_id", flat=True)
+    )
+    if not ids:
+        return 0
+    return model_class.objects.filter(pk__in=ids).delete()[1].get(model_class._meta.label, 0)
+
+
+def flag_missing_files(folder_path, scanned_files, delete=False):
+    """
+    folder_path 아래 manifest 중 이번 스캔에 없고 실제로도 없는 파일을 missing으로 표시.
+    delete=True면 해당 파일로 저장된 측정 데이터도 삭제.
+
+    Args:
+        folder_path (str): 스캔한 루트 폴더 경로.
+        scanned_files (list): 이번에 수집된 (폴더 경로, 파일 이름) 리스트.
+
+    Returns:
+        list: 새로 missing 처리된 파일 경로.
+    """
+    prefix = os.path.join(os.path.abspath(folder_path), "")
+    scanned = {os.path.abspath(os.path.join(root, file)) for root, file in scanned_files}
+    missing_rows = [
+        row for row in ParsedFile.objects.filter(path__startswith=prefix, missing=False).only(
+            "path", "measurement_model", "measurement_id", "missing"
+        )
+        if row.path not in scanned and not os.path.exists(row.path)
+    ]
+    if not missing_rows:
+        return []
+
+    if delete:
+        ids_by_model = defaultdict(set)
+        for row in missing_rows:
+            if row.measurement_model and row.measurement_id is not None:
+                ids_by_model[row.measurement_model].add(row.measurement_id)
+        for model_name, ids in ids_by_model.items():
+            apps.get_model("dvmt", model_name).objects.filter(pk__in=ids).delete()
+
+    for row in missing_rows:
+        row.missing = True
+    ParsedFile.objects.bulk_update(missing_rows, ["missing"], batch_size=500)
+    return [row.path for row in missing_rows]
@@ -0,0 +1,173 @@
+import io
+import re
+
+import numpy as np
+import pandas as pd
+
+# 장비별 측정 파일 reader
+# 파일을 한 번만 읽어 줄 단위로 header keyword / 숫자 block 위치를 찾고,
+# 숫자 block만 numpy / pandas C engine으로 float64 배열로 변환
+
+NUMERIC_BLOCK_THRESHOLD = 10  # 숫자 block으로 인정하는 연속 숫자 행 수
+HEADER_NUMBER_PATTERN = re.compile(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?")
+
+
+def read_lines(path, encoding="utf-8"):
+    """파일 전체를 한 번 읽어 줄 리스트로 반환 (decode 불가 문자는 치환)"""
+    with open(path, "r", encoding=encoding, errors="replace") as f:
+        return f.read().splitlines()
+
+
+def _is_number(token):
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
+def is_numeric_line(line, delimiter=None):
+    """빈 칸을 제외한 모든 값이 숫자인 행인지 (빈 행은 False)"""
+    tokens = [token.strip() for token in line.split(delimiter)]
+    tokens = [token for token in tokens if token]
+    return bool(tokens) and all(_is_number(token) for token in tokens)
+
+
+def find_numeric_block(lines, start=0, delimiter=None, consecutive_threshold=NUMERIC_BLOCK_THRESHOLD):
+    """
+    start 이후 숫자 행이 consecutive_threshold개 이상 연속되는 첫 위치.
+    파일 끝까지 숫자 행만 남은 경우 threshold보다 짧아도 그 시작 위치 반환.
+
+    Returns:
+        int | None: 숫자 block 시작 행 index.
+    """
+    block_start, count = None, 0
+    for i in range(start, len(lines)):
+        if is_numeric_line(lines[i], delimiter):
+            if block_start is None:
+                block_start = i
+            count += 1
+            if count >= consecutive_threshold:
+                return block_start
+        else:
+            block_start, count = None, 0
+    return block_start
+
+
+def numeric_block_end(lines, start, delimiter=None):
+    """start부터 이어지는 숫자 행의 끝 index (footer 등 숫자가 아닌 행 직전까지)"""
+    end = start
+    while end < len(lines) and is_numeric_line(lines[end], delimiter):
+        end += 1
+    return end
+
+
+def find_keyword_line(lines, keyword, start=0, stop=None):
+    """keyword가 들어 있는 첫 행 index (없으면 None)"""
+    for i in range(start, len(lines) if stop is None else min(stop, len(lines))):
+        if keyword in lines[i]:
+            return i
+    return None
+
+
+def keyword_number(line, keyword):
+    """'NPOINTS=1024', 'NPOINTS 1024' 형태에서 keyword 뒤의 첫 숫자"""
+    match = HEADER_NUMBER_PATTERN.search(line, line.index(keyword) + len(keyword))
+    return float(match.group()) if match else None
+
+
+def parse_numeric_block(lines, delimiter=None, usecols=None):
+    """숫자 block 행들 → float64 2차원 배열 (빈 칸은 NaN, pandas C engine)"""
+    if not lines:
+        return np.empty((0, 0), dtype=np.float64)
+    if delimiter is None:
+        return np.loadtxt(lines, dtype=np.float64, usecols=usecols, ndmin=2)
+    df = pd.read_csv(
+        io.StringIO("\n".join(lines)), header=None, sep=delimiter, usecols=usecols,
+        dtype=np.float64, engine="c", skipinitialspace=True,
+    )
+    return df.to_numpy(dtype=np.float64)
+
+
+def read_ltpl(path, check_item="TITLE"):
+    """
+    LTPL (cp949, 공백 구분) 파일 reader.
+    check_item이 없거나 NPOINTS / 숫자 block을 찾지 못하면 None.
+
+    Returns:
+        dict: {"npoints": int, "wavelength": ndarray, "rawdata": ndarray}
+    """
+    lines = read_lines(path, encoding="cp949")
+    if find_keyword_line(lines, check_item) is None:
+        return None
+
+    npoints_row = find_keyword_line(lines, "NPOINTS")
+    if npoints_row is None:
+        return None
+    npoints = keyword_number(lines[npoints_row], "NPOINTS")
+    data_start = find_numeric_block(lines, npoints_row + 1)
+    if npoints is None or data_start is None:
+        return None
+
+    npoints = int(npoints)
+    data = parse_numeric_block(lines[data_start:data_start + npoints], usecols=(0, 1))
+    return {"npoints": npoints, "wavelength": data[:, 0], "rawdata": data[:, 1]}
+
+
+def read_cv(path, aclevel_key="Measurement.Secondary.ACLevel", frequency_key="Measurement.Secondary.Frequency"):
+    """
+    CV (utf-8, csv) 파일 reader.
+    'DataName' 다음 행부터 끝까지 숫자 block, 1번 열 vbias / 4번 열 capdata (빈 값은 0).
+    ACLevel / Frequency는 'DataName' 이전 header에서 keyword 행의 두 번째 값.
+
+    Returns:
+        dict: {"aclevel": str | None, "frequency": str | None, "vbias": ndarray, "capdata": ndarray}
+    """
+    lines = read_lines(path, encoding="utf-8")
+    data_name_row = next(
+        (i for i, line in enumerate(lines) if line.split(",", 1)[0].strip() == "DataName"), None
+    )
+    header_end = len(lines) if data_name_row is None else data_name_row
+
+    def header_value(keyword):
+        for line in lines[:header_end]:
+            cells = [cell.strip() for cell in line.split(",")]
+            if cells[0] == keyword and len(cells) > 1:
+                return cells[1]
+        return None
+
+    vbias = capdata = np.empty(0, dtype=np.float64)
+    block = lines[data_name_row + 1:] if data_name_row is not None else []
+    block = [line for line in block if line.strip()]
+    if block:
+        data = np.nan_to_num(parse_numeric_block(block, delimiter=",", usecols=[1, 4]), nan=0.0)
+        vbias, capdata = data[:, 0], data[:, 1]
+
+    return {
+        "aclevel": header_value(aclevel_key),
+        "frequency": header_value(frequency_key),
+        "vbias": vbias,
+        "capdata": capdata,
+    }
+
+
+def read_plqy(path, check_item="ALL"):
+    """
+    PLQY (tab 구분) 파일 reader.
+    header(숫자 block 이전 행)는 cursor / Exposure Time 등 메타데이터 해석용 문자열 DataFrame으로,
+    숫자 block은 float64 배열로 반환. check_item이 header에 없거나 숫자 block이 없으면 None.
+
+    Returns:
+        dict: {"header": DataFrame, "data": ndarray, "data_start": int}
+    """
+    # 빈 행 제외 (행 index를 기존 read_csv 결과와 맞춤)
+    lines = [line for line in read_lines(path, encoding="utf-8") if line.strip()]
+    data_start = find_numeric_block(lines, delimiter="\t")
+    if data_start is None:
+        return None
+    if find_keyword_line(lines, check_item, stop=data_start) is None:
+        return None
+
+    header = pd.DataFrame([line.split("\t") for line in lines[:data_start]], dtype=str)
+    data = parse_numeric_block(lines[data_start:numeric_block_end(lines, data_start, "\t")], delimiter="\t")
+    return {"header": header, "data": data, "data_start": data_start}
@@ -0,0 +1,194 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from scipy.optimize import minimize
+from dvmt.models import IVFitJob, IVMeas
+from dvmt.utils.bulk_loader import upsert_fitting_results
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+IV_FIT_WORKERS = getattr(settings, "DVMT_IV_FIT_WORKERS", None) or min(4, os.cpu_count() or 1)
+
+IV_EMISSION_AREA = 0.0009
+IV_AMPERE_RESCALE = 1000
+IV_VBI = 0.0009
+IV_Q = 1.6e-19
+IV_MU_ZERO = 1.0e-2
+IV_NV_FOR_HOD = 1.0e21
+IV_NC_FOR_EOD = 3.0e21
+IV_THERMAL_VOLTAGE = 0.0259
+IV_FIT_END_VOLTAGE = 6.0
+IV_FIT_WINDOW = 30  # Poole-Frenkel 직선 구간으로 찾는 연속 점 수
+
+_fit_pool = None  # fitting 작업 스레드 (scipy minimize, DB 저장)
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _fit_pool
+    if _fit_pool is None:
+        _fit_pool = ThreadPoolExecutor(max_workers=IV_FIT_WORKERS, thread_name_prefix="dvmt-iv-fit")
+    return _fit_pool
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    cumsum = np.concatenate(([0.0], np.cumsum(values)))
+    return cumsum[window:] - cumsum[:-window]
+
+
+def min_window_sum(values: np.ndarray, window: int = IV_FIT_WINDOW) -> float:
+    """
+    연속 window개 합의 최솟값 (누적합 차이로 계산).
+    NaN / inf가 포함된 구간은 제외, 점이 window보다 적거나 유효 구간이 없으면 inf.
+    """
+    if len(values) < window:
+        return float("inf")
+    invalid = ~np.isfinite(values)
+    sums = _window_sums(np.where(invalid, 0.0, values), window)
+    sums[_window_sums(invalid.astype(float), window) > 0] = np.inf
+    return float(sums.min())
+
+
+def fit_poole_frenkel(iv_vbias, iv_idata, iv_total_thickness, iv_device_structure) -> dict:
+    """
+    IV 데이터 Poole-Frenkel fitting (0V 다음 점 ~ 6V 직전 구간).
+    ln(J / (q·N·μ0·E)) = slope·√E + intercept 직선이 가장 잘 맞는 연속 IV_FIT_WINDOW개 구간의 오차 합을 최소화.
+
+    Returns:
+        dict: {"measurement": IVMeas 갱신 필드, "fitting": FittingResult 값}
+    """
+    iv_nv_or_nc = IV_NV_FOR_HOD if iv_device_structure == "HOD" else IV_NC_FOR_EOD
+    q_n_mu = IV_Q * IV_MU_ZERO * iv_nv_or_nc
+
+    zero_index = iv_vbias.index(0)
+    end_index = iv_vbias.index(IV_FIT_END_VOLTAGE)
+    vbias = np.round(np.asarray(iv_vbias[zero_index + 1:end_index], dtype=float), 1)
+    idata = np.asarray(iv_idata[zero_index + 1:end_index], dtype=float)
+    jdata = np.abs(idata / IV_EMISSION_AREA * IV_AMPERE_RESCALE)
+
+    # 오차 계산은 IV_VBI 기준 전계 사용 (기존 fitting과 동일, vbi 파라미터는 최종 곡선 계산에만 사용)
+    field = (vbias - IV_VBI) / iv_total_thickness
+    field_root = np.sqrt(field)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exp_data = np.log(jdata / (q_n_mu * field))
+
+    def objective(params):
+        _, slope, intercept = params
+        return min_window_sum((exp_data - (field_root * slope + intercept)) ** 2)
+
+    result = minimize(objective, [0.0, 1.0e-3, -10.0], bounds=[(0, None), (None, None), (None, None)])
+    vbi_opt, slope_opt, intercept_opt = result.x
+
+    field_opt = (vbias - vbi_opt) / iv_total_thickness
+    field_root_opt = np.sqrt(field_opt)
+    alpha = IV_THERMAL_VOLTAGE * intercept_opt + 0.1
+    alpha_plus_delta = alpha - 0.1
+    jv_fit = q_n_mu * field_opt * np.exp((alpha_plus_delta / IV_THERMAL_VOLTAGE) + slope_opt * field_root_opt)
+    fit_mobility = IV_MU_ZERO * np.exp((alpha / IV_THERMAL_VOLTAGE) + slope_opt * field_root_opt)
+
+    measurement = {
+        "iv_vbias": vbias.tolist(),
+        "iv_idata": idata.tolist(),
+        "iv_jdata": jdata.tolist(),
+        "iv_sqrt_e": field_root_opt.tolist(),
+        "iv_jv_fit": jv_fit.tolist(),
+        "iv_fit_mobility": fit_mobility.tolist(),
+    }
+    values = (
+        float((-0.1) * alpha),
+        float(slope_opt * IV_THERMAL_VOLTAGE),
+        float(IV_MU_ZERO * np.exp(alpha / IV_THERMAL_VOLTAGE)),
+    )
+    if iv_device_structure == "HOD":
+        fitting = dict(zip(("iv_h_activation_energy", "iv_h_pf_factor", "iv_h_zero_field_mobilty"), values))
+    elif iv_device_structure == "EOD":
+        fitting = dict(zip(("iv_e_activation_energy", "iv_e_pf_factor", "iv_e_zero_field_mobilty"), values))
+    else:
+        fitting = {}
+    return {"measurement": measurement, "fitting": fitting}
+
+
+def enqueue_iv_fits(instances, submit=True) -> list[IVFitJob]:
+    """
+    IVMeas fitting 작업 등록 (이미 있으면 PENDING으로 초기화).
+    worker 실행은 저장 transaction commit 이후 (fitting이 저장 transaction을 잡고 있지 않도록).
+    submit=False면 등록만 (run_pending_iv_fit_jobs로 직접 실행).
+    """
+    instances = list(instances)
+    if not instances:
+        return []
+    existing = {job.iv_id: job for job in IVFitJob.objects.filter(iv__in=instances)}
+    for job in existing.values():
+        job.status, job.message, job.finished_at = IVFitJob.StatusChoices.PENDING, "", None
+    if existing:
+        IVFitJob.objects.bulk_update(list(existing.values()), ["status", "message", "finished_at"])
+    new_jobs = IVFitJob.objects.bulk_create(
+        [IVFitJob(iv=instance) for instance in instances if instance.pk not in existing]
+    )
+
+    job_ids = [job.pk for job in existing.values()] + [job.pk for job in new_jobs]
+
+    def submit_jobs():
+        pool = _get_pool()
+        for job_id in job_ids:
+            pool.submit(run_iv_fit_job, job_id)
+
+    if submit:
+        transaction.on_commit(submit_jobs)
+    return list(existing.values()) + new_jobs
+
+
+def run_iv_fit_job(job_id: int) -> None:
+    """IVFitJob 1건 처리: fitting → IVMeas / FittingResult 저장 → 상태 기록"""
+    close_old_connections()
+    # PENDING인 작업만 STARTED로 가져옴 (다른 worker / 재실행과 중복 방지)
+    if not IVFitJob.objects.filter(pk=job_id, status=IVFitJob.StatusChoices.PENDING).update(
+        status=IVFitJob.StatusChoices.STARTED, updated_at=timezone.now()
+    ):
+        close_old_connections()
+        return
+
+    job = IVFitJob.objects.select_related("iv").get(pk=job_id)
+    iv = job.iv
+    try:
+        result = fit_poole_frenkel(iv.iv_vbias, iv.iv_idata, iv.iv_total_thickness, iv.iv_device_structure)
+        with transaction.atomic():
+            # queryset update: post_save(fitting 재등록)를 다시 발생시키지 않음
+            IVMeas.objects.filter(pk=iv.pk).update(**result["measurement"])
+            upsert_fitting_results([(iv.sample_id, iv.created_by_id, result["fitting"])])
+        job.status = IVFitJob.StatusChoices.SUCCESS
+        job.message = ""
+    except Exception as e:
+        logger.error(f"IV fitting 실패 ({iv}): {e}", exc_info=True)
+        job.status = IVFitJob.StatusChoices.FAILURE
+        job.message = str(e)
+    finally:
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "message", "finished_at", "updated_at"])
+        close_old_connections()
+
+
+def run_pending_iv_fit_jobs() -> int:
+    """남아 있는 PENDING 작업을 현재 프로세스에서 실행 (서버 재시작 등으로 worker가 처리하지 못한 작업)"""
+    job_ids = list(
+        IVFitJob.objects.filter(status=IVFitJob.StatusChoices.PENDING).order_by("pk").values_list("pk", flat=True)
+    )
+    for job_id in job_ids:
+        run_iv_fit_job(job_id)
+    return len(job_ids)
+
+
+def pending_iv_sample_ids(sample_ids) -> set:
+    """fitting이 끝나지 않은(PENDING / STARTED) IV 측정이 있는 sample id"""
+    return set(
+        IVFitJob.objects.filter(
+            iv__sample_id__in=sample_ids,
+            status__in=[IVFitJob.StatusChoices.PENDING, IVFitJob.StatusChoices.STARTED],
+        ).values_list("iv__sample_id", flat=True)
+    )
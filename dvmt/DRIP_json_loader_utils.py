@@ -1,30 +1,12 @@
 def load_json_file(json_file_path, user, ip_address, model_class):
-    try:
-        with open(json_file_path, 'r') as file:
-            data_list = json.load(file)
-            
-        for data in data_list:
-            instance = model_class.from_dict(data, user, ip_address)
-            
-            if model_class.__name__ == 'UVVISMeas':
-                if model_class.objects.filter(sample=instance.sample).exists():
-                    
-                    instance.save()
-                     
-            if model_class.__name__ == 'PLQYMeas' ans 'plqy_value' in data:
-                cal_value = float(data['plqy_value'])
-                fitting_result, created = Fittingresult.objects.get_or_create(
-                    # mat_name = instance.sample.material.mat_name,
-                    # pd_equip = instance.sample.pd_equip,
-                    sample=sample,
-                    defaults={
-                        # 'sample':instance.sample,
-                        'created_by' : instance.created_by,
-                        'plqy_value' : cal_value,
-                    })
-                if not created:
-                    fitting_result.plqy_value = cal_value
-                    fitting_result.save(update_fields=['plqy_value'])
-                    
-    except Exception as e:
-        print(f'Error loading JSON file {json_file_path}: {e}')
\ No newline at end of file
+    """
+    JSON 파싱 결과 저장: Material / Sample / 측정 데이터 / FittingResult를 batch 단위로 bulk 저장
+    (incremental 파싱의 이전 측정 데이터 삭제, manifest 기록, PLQY 값 upsert 포함)
+
+    Returns:
+        int: 새로 저장한 측정 데이터 수.
+    """
+    # bulk_loader가 이 모듈의 계산 함수를 import하므로 함수 안에서 import
+    from dvmt.utils.bulk_loader import load_json_file_bulk
+
+    return load_json_file_bulk(json_file_path, user, ip_address, model_class)
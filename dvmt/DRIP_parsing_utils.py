@@ -1,26 +1,15 @@
 @staticmethod
 def find_data_extract_start(df, search_range=None, consecutive_threshold=10):
-    consecutive_count = 0
-    start_index = None
     search_range = search_range if search_range is not None else len(df)
-    
-    for i in range(min(search_range, len(df))):
-        try:
-            # 해당 행의 모든 값이 숫자로 변환 가능한지 확인
-            row = df.iloc[i]
-            # 각 컬럼별로 숫자 변환 시도
-            pd.to_numeric(row, errors='raise')
-            
-            if start_index is None:
-                start_index = i
-            consecutive_count += 1
-                
-        except (ValueError, TypeError):
-            consecutive_count = 0
-            start_index = None
-            continue
-            
-        if consecutive_count >= consecutive_threshold:
-            return start_index
-    
-    return None
\ No newline at end of file
+    rows = df.iloc[:min(search_range, len(df))]
+    if len(rows) < consecutive_threshold:
+        return None
+
+    # 행 단위 pd.to_numeric 반복 대신 전체를 한 번에 변환: 빈 칸(NaN)이 아닌 값이 모두 숫자인 행
+    numeric = rows.apply(pd.to_numeric, errors="coerce")
+    is_numeric_row = (numeric.notna() | rows.isna()).all(axis=1).to_numpy()
+
+    # 숫자 행이 consecutive_threshold개 연속으로 끝나는 첫 위치 → 시작 index
+    run_counts = np.convolve(is_numeric_row.astype(int), np.ones(consecutive_threshold, dtype=int), mode="valid")
+    hits = np.flatnonzero(run_counts == consecutive_threshold)
+    return int(hits[0]) if len(hits) else None
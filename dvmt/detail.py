@@ -1,11 +1,14 @@
 from dvmt.models import (
     AC3Meas,
     EllipsometerMeas,
+    IVMeas,
     PLMeas,
     PLQYMeas,
     UVVISMeas,
 )
 
+IV_FITTING_PENDING_LABEL = "fitting 중"  # IV fitting 작업(IVFitJob)이 끝나지 않은 측정 표시
+
 def get_pl_data(sample_ids):
     pl_data = PLMeas.objects.filter(sample_id__in=sample_ids)
     data_list = []
@@ -478,15 +481,17 @@ def get_iv_data(sample_ids):
     Returns:
         list: 각 샘플의 IV 데이터를 담은 딕셔너리 리스트.
     """
-    iv_data = IVMeas.objects.filter(sample_id__in=sample_ids)
+    iv_data = IVMeas.objects.filter(sample_id__in=sample_ids).select_related('sample__material', 'fit_job')
     data_list = []
     
     for item in iv_data:
+        fit_job = getattr(item, 'fit_job', None)
         data_list.append({
             'sample_id': item.sample_id,
             'material_name': item.sample.material.mat_name,
-            'iv_sqrt_e': item.iv_sqrt_e,
-            'iv_fit_mobility': item.iv_fit_mobility,
+            'iv_sqrt_e': item.iv_sqrt_e or [],
+            'iv_fit_mobility': item.iv_fit_mobility or [],
+            'fit_pending': bool(fit_job and fit_job.is_pending),
         })
     
     return data_list
@@ -509,7 +514,7 @@ def iv_chart(data_list, sample_ids):
         if data:
             mat_name = data['material_name']
             datasets.append({
-                'label': f"{mat_name}",
+                'label': f"{mat_name} ({IV_FITTING_PENDING_LABEL})" if data['fit_pending'] else f"{mat_name}",
                 'data': [{'x': e, 'y': m} for e, m in zip(data['iv_sqrt_e'], data['iv_fit_mobility'])],
                 'sample_id': sample_id,
                 'chart_type': 'line',
@@ -593,8 +593,65 @@ class IVMeas(TimestampedModel):
                 'ip' : ip_address,
             }
         )[0]
-        
-        
+
+
+class IVFitJob(models.Model):
+    """
+    IV Poole-Frenkel fitting 작업 1건 (IVMeas 1개)
+    - IVMeas 생성 시 post_save에서 PENDING으로 등록, dvmt.utils.iv_fitting의 worker가 fitting 후
+      IVMeas fitting 데이터 / FittingResult 저장
+    - 측정 화면은 PENDING / STARTED인 동안 "fitting 중"으로 표시
+    """
+    class StatusChoices(models.TextChoices):
+        PENDING = "PENDING", "대기"
+        STARTED = "STARTED", "처리 중"
+        SUCCESS = "SUCCESS", "완료"
+        FAILURE = "FAILURE", "실패"
+
+    class Meta:
+        indexes = [models.Index(fields=["status"])]
+
+    iv = models.OneToOneField(IVMeas, on_delete=models.CASCADE, related_name="fit_job")
+    status = models.CharField(choices=StatusChoices.choices, max_length=10, default=StatusChoices.PENDING)
+    message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def is_pending(self):
+        return self.status in (self.StatusChoices.PENDING, self.StatusChoices.STARTED)
+
+    def __str__(self):
+        return f"{self.iv}_{self.status}"
+
+
+class ParsedFile(models.Model):
+    """
+    DRIP rawdata 파싱 manifest (파일 1개당 1건)
+    - size / mtime이 그대로인 파일은 다음 파싱에서 제외, 바뀐 파일만 content_hash까지 비교
+    - measurement_model / measurement_id: 이 파일로 저장된 측정 데이터 (load_json_file에서 연결)
+    - missing: 다음 스캔에서 원본 파일이 사라진 경우
+    """
+    path = models.CharField(max_length=500, unique=True)
+    size = models.BigIntegerField()
+    mtime = models.FloatField()
+    content_hash = models.CharField(max_length=64)
+    measurement_model = models.CharField(max_length=50, blank=True)
+    measurement_id = models.PositiveIntegerField(null=True, blank=True)
+    missing = models.BooleanField(default=False)
+    parsed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["measurement_model", "measurement_id"]),
+            models.Index(fields=["missing"]),
+        ]
+
+    def __str__(self):
+        return self.path
+
+
 class ManualFile(models.Model):
     title = models.CharField(max_length=255)
     file = models.FileField(upload_to='dvmt/manual')
@@ -13,8 +13,10 @@ from dvmt.detail import (
     get_uvvis_data, uvvis_chart, get_ac3_data, ac3_chart,
     get_ellipsometer_data, ellipsometer_chart,
     get_cv_data, cv_chart, get_iv_data, iv_chart,
-    get_trpl_data, trpl_chart, get_ltpl_data, ltpl_chart
+    get_trpl_data, trpl_chart, get_ltpl_data, ltpl_chart,
+    IV_FITTING_PENDING_LABEL
 )
+from dvmt.utils.iv_fitting import pending_iv_sample_ids
 import json
 
 def format_value(val, precision="{:.2f}"):
@@ -290,6 +292,7 @@ def meas_compare(request):
     # 5. FittingResult 전체 수집
     fitting_results = FittingResult.objects.filter(sample_id__in=sample_ids)
     fitting_dict = {r.sample_id: r for r in fitting_results}
+    iv_pending_ids = pending_iv_sample_ids(sample_ids)  # IV fitting이 아직 끝나지 않은 샘플
 
     # 6. 그래프 데이터 준비
     all_chart_data = {
@@ -341,6 +344,9 @@ def meas_compare(request):
         row['pd_equip'] = sample.pd_equip
         row['sample_ids'].append(sid)
 
+        if sid in iv_pending_ids:
+            row['iv_property'].append(IV_FITTING_PENDING_LABEL)
+
         if not result:
             continue
 
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class PaoConfig(AppConfig):
+    name = "pao"
+
+    def ready(self):
+        # post_save / pre_save receiver 등록 (보간 스펙트럼, DOE 집계 무효화, 컬럼형 expt, 스펙트럼 특징, fitting 캐시)
+        import pao.signals  # noqa: F401
@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.core.management.base import BaseCommand
+from pao.models import IVL
+from pao.utils.spectral_features import compute_spectral_features, first_spectrum, save_spectral_features
+
+
+def _init_worker() -> None:
+    django.setup()
+
+
+def _compute_batch(items: list[tuple[int, dict]]) -> list[tuple[int, dict | None]]:
+    """worker 프로세스에서 실행: [(ivl pk, 첫 번째 스펙트럼)] → [(pk, feature)] (DB 접근 없음)"""
+    results = []
+    for pk, spec in items:
+        try:
+            results.append((pk, compute_spectral_features([{"0": spec}])))
+        except Exception:
+            results.append((pk, None))
+    return results
+
+
+class Command(BaseCommand):
+    help = "기존 IVL의 스펙트럼 peak / FWHM / LBL(IVLSpectralFeature)을 병렬로 계산해 저장"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="이미 저장된 IVL도 다시 계산")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, **options):
+        queryset = IVL.objects.only("pk", "expt_spec").order_by("pk")
+        if not options["all"]:
+            queryset = queryset.filter(spectral_feature__isnull=True)
+
+        batch_size = options["batch_size"]
+        # 동시에 제출해 두는 batch 수 상한 (스펙트럼을 전부 메모리에 올리지 않도록 완료된 batch부터 저장)
+        max_in_flight = options["workers"] * 2
+        saved = total = 0
+
+        def drain(futures: set, limit: int) -> set:
+            nonlocal saved, total
+            while len(futures) > limit:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results = future.result()
+                    ivls = [IVL(pk=pk) for pk, _ in results]
+                    saved += save_spectral_features(ivls, [feature for _, feature in results])
+                    total += len(results)
+                    self.stdout.write(f"{total}건 처리 ({saved}건 저장)")
+            return futures
+
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        ) as pool:
+            futures, batch = set(), []
+            for ivl in queryset.iterator(chunk_size=batch_size):
+                batch.append((ivl.pk, first_spectrum(ivl.expt_spec)))
+                if len(batch) >= batch_size:
+                    futures.add(pool.submit(_compute_batch, batch))
+                    batch = []
+                    futures = drain(futures, max_in_flight)
+            if batch:
+                futures.add(pool.submit(_compute_batch, batch))
+            drain(futures, 0)
+
+        self.stdout.write(self.style.SUCCESS(f"IVL 스펙트럼 특성 backfill 완료: {saved}/{total}건"))
@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from pao.utils.upload_jobs import requeue_stale_upload_jobs
+
+
+class Command(BaseCommand):
+    help = "오래 PENDING / STARTED로 남은 업로드 작업(UploadJob)을 다시 실행 (서버 재시작 등으로 남은 작업 처리)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stale-minutes", type=int, default=30,
+                            help="마지막 상태 변경 후 이 시간(분)이 지난 작업만 대상")
+
+    def handle(self, *args, **options):
+        stale_before = timezone.now() - timedelta(minutes=options["stale_minutes"])
+        count = requeue_stale_upload_jobs(stale_before)
+        self.stdout.write(self.style.SUCCESS(f"{count} upload jobs requeued"))
@@ -1,5 +1,8 @@
+import uuid
+from functools import cached_property
+
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 class AccessLog(models.Model):
@@ -161,11 +164,50 @@ class LayerMaterialProcess(models.Model):
         return f"{self.layer}_{self.material}_{self.ratio:.2f}"
         
 
+class InterpolatedSpectrumMixin(models.Model):
+    """
+    expt_spec를 380~780nm(1nm) grid로 cubic 보간한 (N×401) float32 행렬 저장
+    - i번째 행 = expt_spec[i]의 첫 번째 스펙트럼 (보간 실패 행은 NaN)
+    - 저장 시 한 번 계산 (pao.signals), 조회 시 np.frombuffer로 복사 없이 읽음
+    """
+    expt_spec_interp = models.BinaryField(null=True, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def spec_matrix(self):
+        """(N×401) 읽기 전용 행렬, 저장값이 없으면 None"""
+        from pao.utils.spectrum_interp import decode_spec_matrix
+        return decode_spec_matrix(self.expt_spec_interp)
+
+    def refresh_spec_matrix(self) -> None:
+        """expt_spec으로부터 보간 행렬 재계산 (save는 호출하지 않음)"""
+        from pao.utils.spectrum_interp import build_spec_matrix, encode_spec_matrix
+        self.expt_spec_interp = encode_spec_matrix(build_spec_matrix(self.expt_spec))
+
+    def has_spec_matrix(self) -> bool:
+        """저장된 보간 행렬이 있는지 (지연 로딩 중이면 있다고 간주)"""
+        return "expt_spec_interp" in self.get_deferred_fields() or self.expt_spec_interp is not None
+
+    def expt_spec_changed(self) -> bool:
+        """
+        expt_spec이 DB 값과 다른지 (새 행은 True, 지연 로딩 중이면 바뀌지 않은 것)
+        비교는 DB에서 jsonb 동등 비교로 수행 (기존 expt_spec을 다시 읽어오지 않음)
+        """
+        if self._state.adding or self.pk is None:
+            return True
+        if "expt_spec" in self.get_deferred_fields():
+            return False
+        return not type(self)._base_manager.filter(pk=self.pk, expt_spec=self.expt_spec).exists()
+
+
 	    
 #수정 버전
-class IVL(AccessLog, models.Model):
+class IVL(InterpolatedSpectrumMixin, AccessLog, models.Model):
     """
-	expt = [{"x": 0.2, "y": 0.3, "cct": 9000, "n(QE)": 40, "order": 1.0, "V(volt)": 3, "CE(cd/A)": 100, "LE(lm/W)": 20, "filename": "V190101-2.csv (0)", "J(mA/cm2)": 0.25, "Current(mA)": 0.01, "L(cd/m2(nit))": 300}, {"order": 2.0, ...}, ...,]
+	expt = {"schema": 1, "n": 2, "columns": {"x": [0.2, ...], "y": [0.3, ...], "cct": [9000, ...], "n(QE)": [40, ...], "order": [1.0, 2.0], "V(volt)": [3, ...], "CE(cd/A)": [100, ...], "LE(lm/W)": [20, ...], "J(mA/cm2)": [0.25, ...], "Current(mA)": [0.01, ...], "L(cd/m2(nit))": [300, ...]}, "text": {"filename": ["V190101-2.csv (0)", ...]}}
+	  (컬럼형, pao.utils.expt_columns 참고. 행 단위 [{"x": 0.2, ...}, ...]로 넣어도 저장 시 변환)
 	expt_spec = [{"0": {"380.0": 0.0, "384.0": 0.1, "388.0": 0.1, ..., "780.0": 0.1}}, {"1": {"380.0": 0.0, ...}}, ...]
     """
     class Meta:
@@ -183,6 +225,22 @@ class IVL(AccessLog, models.Model):
     def __str__(self):
         return f"{self.ivl_id}"
 
+    @cached_property
+    def expt_arrays(self) -> dict:
+        """{컬럼명: 배열} (숫자 컬럼 float64, 결측 NaN), expt를 바꾸면 del ivl.expt_arrays"""
+        from pao.utils.expt_columns import decode_expt_columns
+        return decode_expt_columns(self.expt)
+
+    @property
+    def expt_len(self) -> int:
+        from pao.utils.expt_columns import expt_length
+        return expt_length(self.expt)
+
+    def expt_column(self, key: str):
+        """컬럼 1개 (없으면 NaN 배열)"""
+        import numpy as np
+        return self.expt_arrays.get(key, np.full(self.expt_len, np.nan))
+
     @property
     def check_is_J10(self) -> bool:
         """
@@ -190,15 +248,62 @@ class IVL(AccessLog, models.Model):
         - 데이터가 1개만 있고 J≈10 → True
         - 그 외 (Sweep 포함) → False
         """
-        expt = self.expt
-        if len(expt) == 1:
-            j = float(expt[0].get("J(mA/cm2)", -999))
-            if abs(j - 10) < 0.5:  # 허용 오차
+        if self.expt_len == 1:
+            j = self.expt_column("J(mA/cm2)")[0]
+            if abs(j - 10) < 0.5:  # 허용 오차 (NaN이면 False)
                 return True
         return False
 
+
+
+class IVLSpectralFeature(models.Model):
+    """
+    IVL 첫 번째 스펙트럼(expt_spec[0]["0"])의 peak / FWHM / LBL (TVSpectrumAnalyzer.analyze_spec 결과)
+    - IVL 저장 시 계산 (pao.signals), 기존 데이터는 manage.py backfill_ivl_spectral_features
+    - 계산할 수 없는 항목은 null
+    """
+    # analyze_spec 결과 key → field
+    FIELD_MAP = {
+        "B Peak": "b_peak",
+        "B Peak WL": "b_peak_wl",
+        "B FWHM": "b_fwhm",
+        "YG Peak": "yg_peak",
+        "YG Peak WL": "yg_peak_wl",
+        "YG FWHM": "yg_fwhm",
+        "LBL": "lbl",
+    }
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["b_peak_wl"]),
+            models.Index(fields=["b_fwhm"]),
+            models.Index(fields=["yg_peak_wl"]),
+            models.Index(fields=["yg_fwhm"]),
+            models.Index(fields=["lbl"]),
+        ]
+
+    ivl = models.OneToOneField(IVL, on_delete=models.CASCADE, primary_key=True, related_name="spectral_feature")
+    b_peak = models.FloatField(null=True, blank=True)
+    b_peak_wl = models.FloatField(null=True, blank=True)
+    b_fwhm = models.FloatField(null=True, blank=True)
+    yg_peak = models.FloatField(null=True, blank=True)
+    yg_peak_wl = models.FloatField(null=True, blank=True)
+    yg_fwhm = models.FloatField(null=True, blank=True)
+    lbl = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.ivl_id}"
+
+    def as_spec_analysis(self) -> dict:
+        """analyze_spec과 같은 형식 ({"B Peak": 값, ...}, 없는 값은 "N/A")"""
+        return {
+            key: "N/A" if getattr(self, field) is None else getattr(self, field)
+            for key, field in self.FIELD_MAP.items()
+        }
+
         
-class LT(AccessLog, models.Model):
+class LT(InterpolatedSpectrumMixin, AccessLog, models.Model):
     """
     expt = [{"vdelta":0.0, "tempset":40.0, "J(mA/cm2)": 40.0025, "[Channel]": 3.0, "[Hour(h)]": 0.1, "datafolder": "D:\\#pluto12\\OC3\\85차", "[Intensity(%)]": 100.0, ...},{},{},...,{}]
     expt_spec = [{"0": {"380.0": 0.0001, "384": 0.0002,...,"780.0": 0.0001}, "1" : {...}, ...}]
@@ -230,9 +335,64 @@ class LT(AccessLog, models.Model):
     filename = models.CharField(max_length=100, blank=True)
     expt = models.JSONField(blank=False, null=False)
     expt_spec = models.JSONField(blank=False, null=False)
+
+    # 장기 수명 데이터(수천 시점)는 보간 행렬을 DB 대신 .npy 파일로 저장하고 memmap으로 읽음
+    MMAP_MIN_POINTS = 500
+
+    class SpecStorageChoices(models.TextChoices):
+        INLINE = "inline", "DB (expt_spec_interp)"
+        MMAP = "mmap", "Memory-mapped file"
+
+    spec_storage = models.CharField(
+        choices=SpecStorageChoices.choices, max_length=10, default=SpecStorageChoices.INLINE, editable=False
+    )
+    spec_file = models.FileField(upload_to="pao/lt_spec/", null=True, blank=True, editable=False)
     
     def __str__(self):
         return f"{self.lt_id}"
+
+    @property
+    def spec_matrix(self):
+        """(time×401) 행렬, MMAP 모드는 읽기 전용 memmap (행렬 전체를 메모리에 올리지 않음)"""
+        if self.spec_storage == self.SpecStorageChoices.MMAP and self.spec_file:
+            from pao.utils.spectrum_interp import open_spec_memmap
+            return open_spec_memmap(self.spec_file.path)
+        return super().spec_matrix
+
+    def refresh_spec_matrix(self) -> None:
+        """
+        expt_spec 시점 수가 MMAP_MIN_POINTS 이상이면 .npy 파일(spec_file)에,
+        그 외에는 expt_spec_interp에 보간 행렬 저장 (save는 호출하지 않음)
+        """
+        from django.core.files.base import ContentFile
+        from pao.utils.spectrum_interp import build_spec_matrix, encode_spec_npy
+
+        if len(self.expt_spec or []) < self.MMAP_MIN_POINTS:
+            self.delete_spec_file()
+            self.spec_storage = self.SpecStorageChoices.INLINE
+            super().refresh_spec_matrix()
+            return
+
+        content = ContentFile(encode_spec_npy(build_spec_matrix(self.expt_spec)))
+        self.delete_spec_file()
+        self.spec_file.save(f"{self.lt_id or 'lt'}.npy", content, save=False)
+        self.spec_storage = self.SpecStorageChoices.MMAP
+        self.expt_spec_interp = None
+
+    def has_spec_matrix(self) -> bool:
+        if self.spec_storage == self.SpecStorageChoices.MMAP:
+            return bool(self.spec_file)
+        return super().has_spec_matrix()
+
+    def delete_spec_file(self) -> None:
+        """
+        .npy 파일 참조 제거 (save는 호출하지 않음)
+        실제 파일 삭제는 DB commit 이후 (rollback 시 기존 행이 가리키는 파일 유지)
+        """
+        if self.spec_file:
+            storage, name = self.spec_file.storage, self.spec_file.name
+            transaction.on_commit(lambda: storage.delete(name))
+            self.spec_file = None
         
         
         
@@ -264,7 +424,7 @@ class IV(AccessLog, models.Model):
         return f"{self.iv_id}"
         
         
-class Angle(AccessLog, models.Model):
+class Angle(InterpolatedSpectrumMixin, AccessLog, models.Model):
     """
     expt = [{"x": 0.2, "y": 0.3, "cct": 16000, "n(QE)": 40.1, "order": 1.0, "V(volt)": 10.2, "CE(cd/A)": 10.3, "LE(lm/W)": 10.2, "filename": "V150144-1.csv (0)", "J(mA/cm2)": 9.99, "Current(mA)": 0.399, L(cd/m2(nit))": 10000.2}, {...,"filename": "V150144-1.csv (15)",...}, {...,"filename": "V150144-1.csv (30)",...}, {...,"filename": "V150144-1.csv (45)",...}, {...,"filename": "V150144-1.csv (60)",...}]
     """
@@ -280,6 +440,103 @@ class Angle(AccessLog, models.Model):
     
     def __str__(self):
         return f"{self.angle_id}"
+
+
+
+class LTFitResult(models.Model):
+    """
+    LT 수명 모델 fitting 결과 캐시 (LT, aging time, model, params_key)별 1건
+    - params = {channel: {"params", "success", "rmse"}} (pao.utils.lifetime_models.fit_lifetime_model)
+    - params_key "po": PO 수명(LT_Processor) fitting, channel "W" 1개 (pao.utils.fitting_lt.lt_fit_params)
+    - params_key = color filter 등 채널 계산 파라미터 hash: TV 채널별 fitting (tv_get_lt_fits)
+    - LT 저장 시 삭제 (pao.signals), 조회 시 없는 LT만 fitting
+    """
+    class ModelChoices(models.TextChoices):
+        LINEAR = "linear", "Linear"
+        STRETCHED_EXP = "stretched_exp", "Stretched exponential"
+        BIEXP = "biexp", "Bi-exponential"
+        POWER_LAW = "power_law", "Power law"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["lt", "aging_time", "model", "params_key"], name="lt_fit_result_uniq"
+            )
+        ]
+
+    lt = models.ForeignKey(LT, on_delete=models.CASCADE, related_name="fit_results")
+    aging_time = models.FloatField()
+    model = models.CharField(choices=ModelChoices.choices, max_length=30)
+    params_key = models.CharField(max_length=64, blank=True, default="")
+    params = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.lt_id}_{self.model}_{self.aging_time:g}"
+
+
+class TVDOEAggregate(models.Model):
+    """
+    TV compare 테이블용 DOE 단위 집계 결과
+    - rows = {fieldName: 값}, extras = 그래프/스펙트럼 등 DOE별 부가 데이터
+    - params_key: 집계에 쓰인 파라미터(color filter, aging time 등) hash, 파라미터 없으면 ""
+    - IVL / LT / Angle 저장·삭제 시 해당 DOE의 집계를 삭제 (pao.signals), 조회 시 없는 DOE만 재계산
+    """
+    class DatasetChoices(models.TextChoices):
+        IVL = "ivl", "IVL"
+        LT = "lt", "LT"
+        ANGLE = "angle", "Angle"
+
+    class Meta:
+        indexes = [models.Index(fields=["dataset", "params_key", "doe"])]
+        constraints = [
+            models.UniqueConstraint(fields=["doe", "dataset", "params_key"], name="tv_doe_aggregate_uniq")
+        ]
+
+    doe = models.ForeignKey(DOE, on_delete=models.CASCADE, related_name="tv_aggregates")
+    dataset = models.CharField(choices=DatasetChoices.choices, max_length=10)
+    params_key = models.CharField(max_length=64, blank=True, default="")
+    rows = models.JSONField(default=dict, blank=True)
+    extras = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.doe_id}_{self.dataset}_{self.params_key or '-'}"
+
+
+
+class UploadJob(AccessLog, models.Model):
+    """
+    측정 파일 비동기 업로드 작업 1건 (파일 1개)
+    - 업로드 파일은 staged_path에 저장 후 pao.utils.upload_jobs의 worker pool이 파싱·저장
+    - status는 업로드 페이지 polling(upload_status) 응답 형식과 동일
+    """
+    class StatusChoices(models.TextChoices):
+        PENDING = "PENDING", "대기"
+        STARTED = "STARTED", "처리 중"
+        SUCCESS = "SUCCESS", "완료"
+        FAILURE = "FAILURE", "실패"
+        REVOKED = "REVOKED", "취소"
+
+    class Meta:
+        ordering = ["-pk"]
+        indexes = [models.Index(fields=["status"])]
+
+    task_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    model_name = models.CharField(max_length=20)
+    filename = models.CharField(max_length=255)
+    staged_path = models.CharField(max_length=500)
+    parse_func = models.CharField(max_length=200, help_text="파일 → DataFrame 함수 (dotted path)")
+    assign_func = models.CharField(max_length=200, help_text="DataFrame → 모델 인스턴스 함수 (dotted path)")
+    exp_date = models.CharField(max_length=20, blank=True)
+    product_type = models.CharField(max_length=5, blank=True)
+    batch_id = models.UUIDField(null=True, blank=True, help_text="bulk assign으로 함께 처리하는 작업 묶음 (run_upload_batch)")
+    status = models.CharField(choices=StatusChoices.choices, max_length=10, default=StatusChoices.PENDING)
+    message = models.TextField(blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.model_name}_{self.filename}_{self.status}"
             
 # class Tristimulus(models.Model):
 #     label = models.CharField(max_length=50, unique=True, default="CIE1931")
@@ -521,6 +778,13 @@ class ProfilePOAdditions(AccessLog, models.Model):
 		return f"POAdditions<profile={self.analysis_profile_id}>"
 		
 		
+TV_LT_THRESHOLDS_DEFAULT = [95.0]  # LT 수명 테이블 기본 기준 (T95)
+
+
+def default_tv_lt_thresholds() -> list[float]:
+    return list(TV_LT_THRESHOLDS_DEFAULT)
+
+
 class ProfileTVAdditions(AccessLog, models.Model):
     """TV 분석 프로필 추가 정보
     
@@ -528,6 +792,7 @@ class ProfileTVAdditions(AccessLog, models.Model):
     - ColorFilter: RGB 색상 필터
     - LineFactor: 라인 보정 계수
     - AgingTime: LT 분석 시간 (분)
+    - LTThresholds: LT 수명 테이블 기준 intensity(%) 목록 (T97, T95, T90 ...)
     - TableState: 테이블 UI 상태 (숨김, 순서, 선택 등)
     """
     
@@ -563,6 +828,12 @@ class ProfileTVAdditions(AccessLog, models.Model):
         help_text="LT 분석 시간 (분), 기본값 30분"
     )
     
+    lt_thresholds = models.JSONField(
+        default=default_tv_lt_thresholds,
+        blank=True,
+        help_text="LT 수명 테이블 기준 intensity(%) 목록 (예: [97, 95, 90, 80]), T95는 항상 포함"
+    )
+    
     # ✨ 테이블 UI 상태 (개별 필드)
     hidden_columns = models.JSONField(
         default=list,
@@ -0,0 +1,78 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from pao.models import IVL, LT, Angle, LTFitResult, TVDOEAggregate
+from pao.utils.expt_columns import encode_expt_columns, is_columnar_expt
+from pao.utils.spectral_features import save_spectral_features
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(pre_save, sender=IVL)
+@receiver(pre_save, sender=LT)
+@receiver(pre_save, sender=Angle)
+def refresh_spec_matrix(sender, instance, update_fields=None, **kwargs):
+    """
+    expt_spec 보간 행렬(expt_spec_interp)을 저장 직전에 갱신
+    update_fields가 지정된 경우 expt_spec_interp가 포함될 때만 재계산
+    LT는 시점 수에 따라 spec_file / spec_storage도 바뀌므로 update_fields에 함께 지정할 것
+    expt_spec이 그대로이고 저장된 보간 행렬이 있으면 다시 계산하지 않음 (LT .npy 재작성 방지)
+    """
+    if update_fields is not None and "expt_spec_interp" not in update_fields:
+        return
+    if instance.has_spec_matrix() and not instance.expt_spec_changed():
+        return
+    try:
+        instance.refresh_spec_matrix()
+    except Exception as e:
+        # 실패 시 None으로 두고 조회 시 expt_spec에서 직접 보간
+        logger.warning(f"{sender.__name__}({instance.pk}) 보간 스펙트럼 계산 실패: {e}")
+        instance.expt_spec_interp = None
+        if sender is LT:
+            instance.delete_spec_file()
+            instance.spec_storage = LT.SpecStorageChoices.INLINE
+
+
+@receiver(pre_save, sender=IVL)
+def encode_ivl_expt(sender, instance, **kwargs):
+    """행 단위로 들어온 IVL.expt를 컬럼형으로 변환 (pao.utils.expt_columns)"""
+    if not is_columnar_expt(instance.expt):
+        instance.expt = encode_expt_columns(instance.expt)
+        instance.__dict__.pop("expt_arrays", None)
+
+
+@receiver(post_save, sender=IVL)
+def refresh_ivl_spectral_feature(sender, instance, update_fields=None, **kwargs):
+    """IVL 저장 시 스펙트럼 peak / FWHM / LBL(IVLSpectralFeature) 갱신, expt_spec이 바뀌지 않은 update는 제외"""
+    if update_fields is not None and "expt_spec" not in update_fields:
+        return
+    try:
+        save_spectral_features([instance])
+    except Exception as e:
+        logger.warning(f"IVL({instance.pk}) 스펙트럼 특성 저장 실패: {e}")
+
+
+@receiver(post_save, sender=LT)
+def invalidate_lt_fit_results(sender, instance, created=False, **kwargs):
+    """LT 저장 시 수명 모델 fitting 캐시(LTFitResult) 삭제 (삭제 시에는 CASCADE)"""
+    if not created:
+        LTFitResult.objects.filter(lt_id=instance.pk).delete()
+
+
+@receiver(post_delete, sender=LT)
+def delete_lt_spec_file(sender, instance, **kwargs):
+    """LT 삭제 시 memory-mapped 스펙트럼 파일(spec_file)도 삭제"""
+    instance.delete_spec_file()
+
+
+
+@receiver(post_save, sender=IVL)
+@receiver(post_save, sender=LT)
+@receiver(post_save, sender=Angle)
+@receiver(post_delete, sender=IVL)
+@receiver(post_delete, sender=LT)
+@receiver(post_delete, sender=Angle)
+def invalidate_doe_aggregates(sender, instance, **kwargs):
+    """IVL / LT / Angle 변경 시 해당 DOE의 TV 테이블 집계 삭제 (다음 조회 때 재계산)"""
+    TVDOEAggregate.objects.filter(doe_id=instance.doe_id, dataset=sender.__name__.lower()).delete()
@@ -1,14 +1,17 @@
 import json
+import numpy as np
+from functools import cached_property
 from django.contrib import messages
 from django.db import models
-from django.http import JsonResponse, HttpRequest, HttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, HttpRequest, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse_lazy
 from django.views.decorators.http import require_http_methods, require_GET
 from core.decorators import login_required_hx
 from ipware import get_client_ip
 from pao.forms import FittingForm, TVLineFactorForm
-from pao.models import AnalysisProfile, TVColorFilter, TVLineFactor, AnalysisProfilePermission, ProfileTVAdditions, ProfileDOE, DOE, TVDeltaVBaseline
+from pao.models import AnalysisProfile, TVColorFilter, TVLineFactor, AnalysisProfilePermission, ProfileTVAdditions, ProfileDOE, DOE, LT, TVDeltaVBaseline
 
 from pao.utils.pivot_table import (
 	TVSpectrumAnalyzer, 
@@ -20,7 +23,13 @@ from pao.utils.pivot_table import (
 	tv_process_color_filter_upload, 
 	tv_generate_angle_table,
 	calculate_spectrum_averages,
-	calculate_angle_uv_components
+	calculate_angle_uv_components,
+	tv_get_spec_matrix,
+	tv_partition_ivls,
+	tv_lt_thresholds,
+	tv_lt_models,
+	LT_LIFETIME_CHANNELS,
+	WL_INTERP
 )
 
 from utls.plotly_tv import (
@@ -125,6 +134,7 @@ def compare_tv(request: HttpRequest, profile_id: int) -> HttpResponse:
 		        "hidden_rows_json": json.dumps(tv_additions.hidden_rows if tv_additions else []),
 		        "column_order_json": json.dumps(tv_additions.column_order if tv_additions else []),
 		        "reference_columns_json": json.dumps(tv_additions.reference_columns if tv_additions else []),
+                "lt_thresholds": ",".join(f"{t:g}" for t in tv_lt_thresholds(tv_additions.lt_thresholds if tv_additions else None)),
             }
             
             return render(request, "pao/compare_tv.html", context)
@@ -248,6 +258,7 @@ def tv_save_additions(request: HttpRequest, profile_id: int) -> JsonResponse:
         color_filter_id = body.get("color_filter")
         line_factor_id = body.get("line_factor")
         aging_time = body.get("aging_time", 30)
+        lt_thresholds = body.get("lt_thresholds")
         
         # ✨ 추가: 테이블 상태 필드들
         hidden_columns = body.get("hidden_columns")
@@ -291,6 +302,8 @@ def tv_save_additions(request: HttpRequest, profile_id: int) -> JsonResponse:
         tv_additions.color_filter = color_filter
         tv_additions.line_factor = line_factor
         tv_additions.aging_time = aging_time
+        if lt_thresholds is not None:
+            tv_additions.lt_thresholds = tv_lt_thresholds(lt_thresholds)
         tv_additions.modified_by = request.user
         
         # ✨ 추가: 테이블 상태 업데이트 (전달된 경우에만)
@@ -326,7 +339,11 @@ def tv_save_additions(request: HttpRequest, profile_id: int) -> JsonResponse:
             
 def tv_get_valid_doe_or_redirect(request: HttpRequest) -> tuple[dict[str, list[models.Model]], HttpResponse | None]:
     try:
-        tag, doe_result = get_selected_doe(request, prefetch_fields=["ivl_set", "angle_set", "lt_set"])
+        # LT 원본 스펙트럼(JSON)만 지연 로딩 (보간 행렬은 tv_get_spec_matrix가 바로 읽음, MMAP 저장 LT는 None)
+        lt_prefetch = models.Prefetch("lt_set", queryset=LT.objects.defer("expt_spec"))
+        tag, doe_result = get_selected_doe(
+            request, prefetch_fields=["ivl_set", "ivl_set__spectral_feature", "angle_set", lt_prefetch]
+        )
         match tag:
             case "warning":
                 getattr(messages, tag)(request, doe_result)
@@ -560,7 +577,8 @@ def tv_get_lt_table(request: HttpRequest) -> JsonResponse:
             [lt for doe in grouped_does["lt"] for lt in doe.lt_set.all()],
             color_filter_obj,
             aging_time,
-            all_doe_labels
+            all_doe_labels,
+            lt_thresholds=request.GET.get("lt_thresholds"),
         )
 
         return JsonResponse({
@@ -706,6 +724,9 @@ def tv_linefactor_edit(request: HttpRequest) -> HttpResponse:
         "edit_instance": edit_instance,
     })
     
+LT_CHANNEL_LABELS = {"W": "White", "R": "Red", "G": "Green", "B": "Blue", "Bpeak": "Blue Peak"}
+
+
 @cache_page(60 * 5)
 def tv_get_graph_options(request: HttpRequest) -> JsonResponse:
     """그래프 X/Y축 선택 옵션 반환"""
@@ -757,12 +778,22 @@ def tv_get_graph_options(request: HttpRequest) -> JsonResponse:
                 # Angle 관련
                 {"value": "Angle-Δu'v'(60°)", "label": "Δu'v' at 60°", "category": "각도"},
                 
-                # LT 관련 (수정된 부분)
-                {"value": "T95-W", "label": "T95 White", "category": "LT"},
-                {"value": "T95-R", "label": "T95 Red", "category": "LT"},
-                {"value": "T95-G", "label": "T95 Green", "category": "LT"},
-                {"value": "T95-B", "label": "T95 Blue", "category": "LT"},
-                {"value": "T95-Bpeak", "label": "T95 Blue Peak", "category": "LT"},
+                # LT 관련 (수명 기준별: T95 + lt_thresholds)
+                *[
+                    {"value": f"T{threshold:g}-{key}", "label": f"T{threshold:g} {LT_CHANNEL_LABELS[key]}", "category": "LT"}
+                    for threshold in tv_lt_thresholds(request.GET.get("lt_thresholds"))
+                    for key in LT_LIFETIME_CHANNELS
+                ],
+                *[
+                    {
+                        "value": f"T{threshold:g}-{key} ({name})",
+                        "label": f"T{threshold:g} {LT_CHANNEL_LABELS[key]} ({name})",
+                        "category": "LT",
+                    }
+                    for name in tv_lt_models(request.GET.get("lt_models"))
+                    for threshold in tv_lt_thresholds(request.GET.get("lt_thresholds"))
+                    for key in LT_LIFETIME_CHANNELS
+                ],
                 {"value": "ΔV(T95-G)", "label": "ΔV at T95 Green", "category": "LT"},  # 수정됨
             ],
             "chart_types": [
@@ -801,7 +832,9 @@ def tv_get_dynamic_graph_data(request: HttpRequest) -> JsonResponse:
         return JsonResponse({"error": "X축, Y축을 선택해주세요."}, status=400)
     
     graph_data = tv_collect_graph_data_from_tables(
-        grouped_does, x_field, y_field, y2_field, color_filter_id, line_factor_id, selected_columns_list
+        grouped_does, x_field, y_field, y2_field, color_filter_id, line_factor_id, selected_columns_list,
+        lt_thresholds=request.GET.get("lt_thresholds"),
+        lt_models=request.GET.get("lt_models"),
     )
 
     return JsonResponse({
@@ -816,7 +849,8 @@ def tv_get_dynamic_graph_data(request: HttpRequest) -> JsonResponse:
     })
 
 
-def tv_collect_graph_data_from_tables(grouped_does, x_field, y_field, y2_field, color_filter_id, line_factor_id, selected_columns_list=None):
+def tv_collect_graph_data_from_tables(grouped_does, x_field, y_field, y2_field, color_filter_id, line_factor_id, selected_columns_list=None,
+                                      lt_thresholds=None, lt_models=None):
     graph_data = {"traces": []}
     
     # 전체 DOE 라벨 수집
@@ -877,7 +911,7 @@ def tv_collect_graph_data_from_tables(grouped_does, x_field, y_field, y2_field,
             color_filter_obj = TVColorFilter.objects.get(id=color_filter_id).rgb_data
             lt_rows, lt_graph_data = tv_generate_lt_table(
                 [lt for doe in grouped_does["lt"] for lt in doe.lt_set.all()],
-                color_filter_obj, 30.0
+                color_filter_obj, 30.0, lt_thresholds=lt_thresholds, lt_models=lt_models
             )
             lt_data = {"rows": lt_rows, "graph": lt_graph_data}
             if x_field == "doe_id":
@@ -1101,6 +1135,234 @@ def tv_collect_graph_data_from_tables(grouped_does, x_field, y_field, y2_field,
     return graph_data
     
 
+class TVCompareContext:
+    """
+    TV compare 요청 1건 안에서 공유하는 데이터
+    - DOE 그룹 / 라벨, Color Filter / Line Factor, TVSpectrumAnalyzer는 한 번만 조회·생성
+    - 각 테이블 결과는 처음 사용할 때 계산 후 재사용 (테이블과 차트가 같은 결과를 씀)
+    """
+
+    def __init__(self, grouped_does: dict[str, list[models.Model]], color_filter_id: str | None = None,
+                 line_factor_id: str | None = None, aging_time: float | None = 30, resample_time: bool = False,
+                 lt_thresholds: list[float] | str | None = None, lt_models: list[str] | str | None = None):
+        self.grouped_does = grouped_does
+        self.aging_time = aging_time
+        self.resample_time = resample_time
+        self.lt_thresholds = tv_lt_thresholds(lt_thresholds)
+        self.lt_models = tv_lt_models(lt_models)
+        self.color_filter = (
+            TVColorFilter.objects.filter(id=color_filter_id).values_list("rgb_data", flat=True).first()
+            if color_filter_id else None
+        )
+        self.line_factor = TVLineFactor.objects.filter(id=line_factor_id).first() if line_factor_id else None
+
+    @cached_property
+    def all_doe_labels(self) -> list[str]:
+        return tv_get_all_doe_labels(self.grouped_does)
+
+    @cached_property
+    def analyzer(self) -> TVSpectrumAnalyzer | None:
+        return TVSpectrumAnalyzer(self.color_filter) if self.color_filter is not None else None
+
+    @cached_property
+    def ivl_groups(self) -> dict[int, dict[str, list[models.Model]]]:
+        """DOE별 J10 / J100 IVL 분류 (tv_partition_ivls)"""
+        return tv_partition_ivls(self.grouped_does.get("ivl", []))
+
+    @cached_property
+    def angles(self) -> list[models.Model]:
+        return [angle for doe in self.grouped_does.get("angle", []) for angle in doe.angle_set.all()]
+
+    @cached_property
+    def lts(self) -> list[models.Model]:
+        return [lt for doe in self.grouped_does.get("lt", []) for lt in doe.lt_set.all()]
+
+    @cached_property
+    def ivl_table(self) -> tuple[dict, dict]:
+        """(ivl_rows, spectrum_storage)"""
+        return tv_generate_ivl_table(self.grouped_does.get("ivl", []), self.all_doe_labels)
+
+    @cached_property
+    def color_table(self) -> tuple[dict, dict]:
+        """(color_rows, color_graph_data)"""
+        return self.analyzer.generate_color_table(
+            self.grouped_does.get("ivl", []), self.line_factor, self.all_doe_labels, self.ivl_groups
+        )
+
+    @cached_property
+    def angle_table(self) -> tuple[dict, dict, dict]:
+        """(angle_rows, angle_averages, angle_spectrum_averages)"""
+        return tv_generate_angle_table(self.angles, self.all_doe_labels)
+
+    @cached_property
+    def lt_table(self) -> tuple[dict, dict]:
+        """(lt_rows, lt_graph_data)"""
+        return tv_generate_lt_table(
+            self.lts, self.color_filter, self.aging_time, self.all_doe_labels, self.resample_time,
+            lt_thresholds=self.lt_thresholds, lt_models=self.lt_models,
+        )
+
+
+def tv_get_all_doe_labels(grouped_does: dict[str, list[models.Model]]) -> list[str]:
+    """IVL, Angle, LT 모든 데이터셋의 DOE 라벨 (DOE id 순)"""
+    all_doe_ids = {doe.id for dataset_type in ["ivl", "angle", "lt"] for doe in grouped_does.get(dataset_type, [])}
+    return [f"DOE-{doe_id}" for doe_id in sorted(all_doe_ids)]
+
+
+def _tv_build_chart_data(ctx: TVCompareContext, selected_doe_labels: list[str]) -> dict:
+    """TV 분석용 고정 차트 데이터 (테이블 결과는 ctx에서 공유)"""
+    grouped_does = ctx.grouped_does
+    chart_data = {}
+    
+    # IVL 기반 차트들 (1-4번)
+    if grouped_does.get("ivl"):
+        # 1. J-V 차트
+        chart_data["jv_chart"] = generate_jv_chart_data(grouped_does["ivl"], selected_doe_labels, ctx.ivl_groups)
+        
+        # 2. cd/A-J 차트
+        chart_data["cj_chart"] = generate_cj_chart_data(grouped_does["ivl"], selected_doe_labels, ctx.ivl_groups)
+        
+        # 3. Spectrum 차트
+        _, spectrum_storage = ctx.ivl_table
+        chart_data["spectrum_chart"] = generate_spectrum_chart_data(spectrum_storage, selected_doe_labels)
+
+    # Angle 기반 차트들
+    if grouped_does.get("angle"):
+        _, angle_averages, _ = ctx.angle_table
+        chart_data["angular_spectrum_chart"] = generate_angular_spectrum_chart_data(ctx.angles, selected_doe_labels)
+        chart_data["delta_uv_angle_chart"] = generate_delta_uv_angle_chart_data(angle_averages, selected_doe_labels)
+        chart_data["delta_u_delta_v_chart"] = generate_delta_u_delta_v_chart_data(ctx.angles, selected_doe_labels)
+
+    # LT 기반 차트들 (aging_time 형식 오류면 빈 차트)
+    if grouped_does.get("lt") and ctx.color_filter is not None and ctx.aging_time is not None:
+        _, lt_graph_data = ctx.lt_table
+        chart_data["lt_chart"] = generate_lt_chart_data(lt_graph_data, selected_doe_labels)
+        chart_data["delta_v_chart"] = generate_delta_v_chart_data(lt_graph_data, selected_doe_labels)
+    elif grouped_does.get("lt"):
+        chart_data["lt_chart"] = {"traces": []}
+        chart_data["delta_v_chart"] = {"traces": []}
+
+    # Color 기반 차트
+    if grouped_does.get("ivl") and ctx.color_filter is not None and ctx.line_factor is not None:
+        color_table_data, _ = ctx.color_table
+        chart_data["wxy_chart"] = generate_wxy_chart_data(
+            grouped_does["ivl"], selected_doe_labels, ctx.color_filter, ctx.line_factor, ctx.ivl_groups
+        )
+        chart_data["color_coordinate_chart"] = generate_color_coordinate_chart_data(
+            color_table_data, selected_doe_labels
+        )
+    elif grouped_does.get("ivl"):
+        chart_data["color_coordinate_chart"] = {"traces": []}
+        chart_data["wxy_chart"] = {"traces": []}
+
+    return chart_data
+
+
+TV_BUNDLE_SECTIONS = ["ivl", "ivl_color", "angle", "lt", "chart"]
+
+
+def _tv_bundle_section(ctx: TVCompareContext, section: str, selected_doe_labels: list[str]) -> dict:
+    """번들 응답의 섹션 1개 (기존 개별 endpoint와 같은 table_data / graph_data 형식)"""
+    labels = ctx.all_doe_labels
+    match section:
+        case "ivl":
+            if ctx.grouped_does.get("ivl"):
+                ivl_rows, spectrum_storage = ctx.ivl_table
+                # IVL 데이터가 없는 DOE는 IVL 관련 row를 공백으로
+                ivl_doe_labels = {f"DOE-{doe.id}" for doe in ctx.grouped_does["ivl"]}
+                for row in ivl_rows.values():
+                    for label in labels:
+                        if label not in ivl_doe_labels:
+                            row[label] = ""
+            else:
+                ivl_rows = tv_generate_base_table("ivl", labels, default_value="")
+                for count_key in ["J10 Count", "J100 Count"]:
+                    ivl_rows[count_key] = {"fieldName": count_key, **{label: "" for label in labels}}
+                spectrum_storage = {}
+            return {"table_data": list(ivl_rows.values()), "graph_data": {"spectrum_storage": spectrum_storage}}
+
+        case "ivl_color":
+            if ctx.analyzer is None or ctx.line_factor is None:
+                return {"level": "warning", "message": "color_filter와 line_factor는 필수입니다.", "table_data": []}
+            color_rows, color_graph_data = ctx.color_table
+            return {"table_data": list(color_rows.values()), "graph_data": color_graph_data}
+
+        case "angle":
+            angle_rows, angle_averages, _ = ctx.angle_table
+            return {"table_data": list(angle_rows.values()), "graph_data": {"angle_averages": angle_averages}}
+
+        case "lt":
+            if ctx.aging_time is None:
+                return {"level": "error", "message": "aging_time은 숫자여야 합니다.", "table_data": []}
+            if ctx.color_filter is None:
+                return {"level": "warning", "message": "color_filter는 필수입니다.", "table_data": []}
+            lt_rows, lt_graph_data = ctx.lt_table
+            return {"table_data": list(lt_rows.values()), "graph_data": {"lt": lt_graph_data}}
+
+        case "chart":
+            return {
+                "chart_data": _tv_build_chart_data(ctx, selected_doe_labels),
+                "layouts": TVPlotlyProcessor().get_all_layouts(),
+            }
+
+    raise ValueError(f"Unknown section: {section}")
+
+
+def tv_get_compare_bundle(request: HttpRequest) -> HttpResponse:
+    """
+    TV compare 페이지의 모든 테이블 + 차트 데이터를 NDJSON으로 스트리밍
+    - DOE 조회 / prefetch / 라벨 / 필터 조회 / analyzer 생성은 한 번만 수행하고 섹션끼리 결과 공유
+    - 섹션이 끝날 때마다 한 줄씩 전송: {"section": "ivl", "success": true, "level": ..., "table_data": ..., ...}
+    - sections 파라미터로 일부 섹션만 요청 가능 (기본: ivl, ivl_color, angle, lt, chart)
+    - resample_time=1이면 LT 시계열을 인덱스 대신 공통 시간축으로 보간해 평균
+    - aging_time이 숫자가 아니면 lt 섹션만 error (다른 섹션은 그대로 전송)
+    """
+    grouped_does, redirect_response = tv_get_valid_doe_or_redirect(request)
+    if redirect_response:
+        return redirect_response
+
+    try:
+        aging_time = float(request.GET.get("aging_time") or 30)
+        if not np.isfinite(aging_time):
+            raise ValueError(aging_time)
+    except ValueError:
+        logger.warning(f"TV 번들 aging_time 형식 오류: {request.GET.get('aging_time')!r}")
+        aging_time = None
+
+    sections = [s for s in request.GET.get("sections", "").split(",") if s in TV_BUNDLE_SECTIONS]
+    sections = sections or TV_BUNDLE_SECTIONS
+
+    selected_columns = request.GET.get("selected_columns", "")
+    selected_columns_list = selected_columns.split(",") if selected_columns else []
+
+    ctx = TVCompareContext(
+        grouped_does,
+        color_filter_id=request.GET.get("color_filter"),
+        line_factor_id=request.GET.get("line_factor"),
+        aging_time=aging_time,
+        resample_time=request.GET.get("resample_time") == "1",
+        lt_thresholds=request.GET.get("lt_thresholds"),
+        lt_models=request.GET.get("lt_models"),
+    )
+    if selected_columns_list:
+        selected_doe_labels = [label for label in ctx.all_doe_labels if label in selected_columns_list]
+    else:
+        selected_doe_labels = ctx.all_doe_labels
+
+    def stream():
+        for section in sections:
+            try:
+                payload = {"level": "success", "message": f"{section} 데이터 적용"}
+                payload.update(_tv_bundle_section(ctx, section, selected_doe_labels))
+                payload["success"] = payload["level"] == "success"
+            except Exception as e:
+                logger.error(f"TV 번들 [{section}] 처리 오류: {e}", exc_info=True)
+                payload = {"success": False, "level": "error", "message": f"{section} 데이터 오류"}
+            yield json.dumps({"section": section, **payload}, cls=DjangoJSONEncoder) + "\n"
+
+    return StreamingHttpResponse(stream(), content_type="application/x-ndjson")
+
+
 def tv_gamut_analysis(request: HttpRequest) -> HttpResponse:
     """색역분석 새창 페이지"""
     context = {
@@ -1117,12 +1379,7 @@ def tv_get_chart_data(request: HttpRequest) -> JsonResponse:
         if redirect_response:
             return redirect_response
 
-        # 전체 DOE 라벨 수집
-        all_doe_ids = set()
-        for dataset_type in ["ivl", "angle", "lt"]:
-            for doe in grouped_does.get(dataset_type, []):
-                all_doe_ids.add(doe.id)
-        all_doe_labels = [f"DOE-{doe_id}" for doe_id in sorted(all_doe_ids)]
+        all_doe_labels = tv_get_all_doe_labels(grouped_does)
 
         # ✨ 변경: label → id
         color_filter_id = request.GET.get("color_filter")
@@ -1137,109 +1394,15 @@ def tv_get_chart_data(request: HttpRequest) -> JsonResponse:
         else:
             selected_doe_labels = all_doe_labels
 
-        # 기본 차트 데이터 생성
-        chart_data = {}
-        
-        # IVL 기반 차트들 (1-4번)
-        if grouped_does.get("ivl"):
-            # 1. J-V 차트
-            chart_data["jv_chart"] = generate_jv_chart_data(
-                grouped_does["ivl"], 
-                selected_doe_labels
-            )
-            
-            # 2. cd/A-J 차트
-            chart_data["cj_chart"] = generate_cj_chart_data(
-                grouped_does["ivl"], 
-                selected_doe_labels
-            )
-            
-            # 3. Spectrum 차트
-            _, spectrum_storage = tv_generate_ivl_table(
-                grouped_does["ivl"], 
-                selected_doe_labels
-            )
-            chart_data["spectrum_chart"] = generate_spectrum_chart_data(
-                spectrum_storage, 
-                selected_doe_labels
-            )
-
-        # Angle 기반 차트들
-        if grouped_does.get("angle"):
-            _, angle_averages, _ = tv_generate_angle_table(
-                [angle for doe in grouped_does["angle"] for angle in doe.angle_set.all()],
-                selected_doe_labels
-            )
-            
-            chart_data["angular_spectrum_chart"] = generate_angular_spectrum_chart_data(
-                [angle for doe in grouped_does["angle"] for angle in doe.angle_set.all()],
-                selected_doe_labels  
-            )
-            
-            chart_data["delta_uv_angle_chart"] = generate_delta_uv_angle_chart_data(
-                angle_averages, 
-                selected_doe_labels
-            )
-            
-            chart_data["delta_u_delta_v_chart"] = generate_delta_u_delta_v_chart_data(
-                [angle for doe in grouped_does["angle"] for angle in doe.angle_set.all()],
-                selected_doe_labels
-            )
-
-        # LT 기반 차트들
-        # ✨ 변경: label → id로 조회
-        if grouped_does.get("lt") and color_filter_id:
-            try:
-                color_filter_obj = TVColorFilter.objects.get(id=color_filter_id).rgb_data
-                _, lt_graph_data = tv_generate_lt_table(
-                    [lt for doe in grouped_does["lt"] for lt in doe.lt_set.all()],
-                    color_filter_obj, 
-                    aging_time, 
-                )
-                
-                chart_data["lt_chart"] = generate_lt_chart_data(
-                    lt_graph_data, 
-                    selected_doe_labels
-                )
-                
-                chart_data["delta_v_chart"] = generate_delta_v_chart_data(
-                    lt_graph_data, 
-                    selected_doe_labels
-                )
-                
-            except TVColorFilter.DoesNotExist:
-                chart_data["lt_chart"] = {"traces": []}
-                chart_data["delta_v_chart"] = {"traces": []}
-
-        # Color 기반 차트
-        # ✨ 변경: label → id로 조회
-        if grouped_does.get("ivl") and color_filter_id and line_factor_id:
-            try:
-                color_filter_obj = TVColorFilter.objects.get(id=color_filter_id).rgb_data
-                line_factor_obj = TVLineFactor.objects.get(id=line_factor_id)
-                analyzer = TVSpectrumAnalyzer(color_filter_obj)
-                
-                color_table_data, _ = analyzer.generate_color_table(
-                    grouped_does["ivl"], 
-                    line_factor_obj, 
-                    selected_doe_labels
-                )
-                
-                chart_data["wxy_chart"] = generate_wxy_chart_data(
-                    grouped_does["ivl"], 
-                    selected_doe_labels,
-                    color_filter_obj,
-                    line_factor_obj
-                )
-                
-                chart_data["color_coordinate_chart"] = generate_color_coordinate_chart_data(
-                    color_table_data, 
-                    selected_doe_labels
-                )
-                
-            except (TVColorFilter.DoesNotExist, TVLineFactor.DoesNotExist):
-                chart_data["color_coordinate_chart"] = {"traces": []}
-                chart_data["wxy_chart"] = {"traces": []}
+        ctx = TVCompareContext(
+            grouped_does,
+            color_filter_id=color_filter_id,
+            line_factor_id=line_factor_id,
+            aging_time=aging_time,
+            lt_thresholds=request.GET.get("lt_thresholds"),
+            lt_models=request.GET.get("lt_models"),
+        )
+        chart_data = _tv_build_chart_data(ctx, selected_doe_labels)
                 
         tv_processor = TVPlotlyProcessor()
         layouts = tv_processor.get_all_layouts()
@@ -1408,9 +1571,8 @@ def doe_angle_charts(request: HttpRequest) -> JsonResponse:
         
         for angle in angles:  # ✨ 수정: idx 제거, angle 객체 직접 사용
             expt = angle.expt
-            expt_spec = angle.expt_spec
             
-            if not expt or not expt_spec:
+            if not expt:
                 continue
             
             # angle_id 가져오기
@@ -1451,33 +1613,26 @@ def doe_angle_charts(request: HttpRequest) -> JsonResponse:
                 "mode": "lines+markers"
             })
             
-            # 5번: Angular Spectrum
-            for entry, spec in zip(expt, expt_spec):
+            # 5번: Angular Spectrum (expt_spec_interp 보간 행 사용)
+            wavelengths = WL_INTERP.tolist()
+            for entry, row in zip(expt, tv_get_spec_matrix(angle)):
                 try:
                     filename = entry.get("filename", "")
                     degree = int(filename.split("(")[-1].replace(")", ""))
-                    
-                    spectrum_dict = None
-                    if isinstance(spec, dict):
-                        first_key = next(iter(spec.keys()))
-                        spectrum_dict = spec[first_key]
-                    
-                    if spectrum_dict and isinstance(spectrum_dict, dict):
-                        wavelengths = sorted([float(wl) for wl in spectrum_dict.keys() 
-                                            if str(wl).replace(".", "").isdigit()], key=float)
-                        intensities = [float(spectrum_dict[str(wl)]) for wl in wavelengths]
-                        
-                        angle_spectrum_traces.append({
-                            "x": wavelengths,
-                            "y": intensities,
-                            "name": f"ID{angle_id}_{degree}°",  # ✨ 수정: angle_id 사용
-                            "type": "scatter",
-                            "mode": "lines"
-                        })
-                        
                 except (ValueError, KeyError) as e:
                     logger.warning(f"Spectrum 데이터 파싱 오류: {e}")
                     continue
+                
+                if not np.isfinite(row).all():
+                    continue
+                
+                angle_spectrum_traces.append({
+                    "x": wavelengths,
+                    "y": row.tolist(),
+                    "name": f"ID{angle_id}_{degree}°",  # ✨ 수정: angle_id 사용
+                    "type": "scatter",
+                    "mode": "lines"
+                })
         
         return JsonResponse({
             "success": True,
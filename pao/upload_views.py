@@ -1,14 +1,49 @@
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from pao.models import UploadJob
+from pao.utils.upload_jobs import enqueue_upload_jobs, upload_job_status
+from pao.utils.uploadfiletodb import assign_ivl_bulk
+
+
 @login_required_hx
 def upload_ivlfiles(request):
     product_type = request.POST.get("product_type")
     print("product_type in upload_ivelfiles at views:", product_type)
-    return upload_files(request, IVL, upload_ivl_to_dataframe, assign_ivl, "ivlDate", product_type)
+    return upload_files(
+        request, IVL, upload_ivl_to_dataframe, assign_ivl, "ivlDate", product_type, bulk_assign_func=assign_ivl_bulk
+    )
+
+
+def upload_files(request, model_class, upload_to_dataframe_func, assign_func, datekey, product_type,
+                 bulk_assign_func=None):
+    """
+    업로드 파일을 staging 후 파일별 UploadJob으로 등록하고 바로 응답 (파싱·저장은 worker pool에서 처리)
+    응답: {"status": "started", "tasks": [{"task_id": ..., "filename": ...}, ...]} → upload_status로 polling
+    """
+    if request.method != "POST":
+        return JsonResponse({"status": "error", "message": "잘못된 요청입니다."}, status=405)
+
+    experiment_date = request.POST.get(datekey)
+    files = [file for key, file in request.FILES.items() if key.startswith("files[")]
+    if not files:
+        return JsonResponse({"status": "error", "message": "업로드할 파일이 없습니다."}, status=400)
+
+    jobs = enqueue_upload_jobs(
+        request, files, model_class.__name__, upload_to_dataframe_func, assign_func, experiment_date, product_type,
+        bulk_assign_func=bulk_assign_func,
+    )
+    return JsonResponse({
+        "status": "started",
+        "tasks": [{"task_id": str(job.task_id), "filename": job.filename} for job in jobs],
+    })
 
 
-def upload_files(request, model_class, upload_to_dataframe_func, assign_func, datekey, product_type):
-    if request,method == "POST":
-        experiement_date = request.POST.get(datekey)
-        print("RAW DATA:", dict(request.POST))
+@login_required_hx
+def upload_status(request, task_id):
+    """업로드 작업 진행 상태 (PENDING / STARTED / SUCCESS / FAILURE / REVOKED)"""
+    job = get_object_or_404(UploadJob, task_id=task_id, created_user=request.user)
+    return JsonResponse(upload_job_status(job))
+
 
 @login_required_hx
 def delete_for_detail(request, model_class, doe_id, model_is, model_name):
@@ -9,12 +9,14 @@ urlpatterns = [
     path(route="device/list", view=tab_view.device_list, name="device_list"),
     path(route="device/get", view=tab_view.get_device, name="get_device"),
     path(route="device/delete", view=tab_view.delete_device, name="delete_device"),
+    path(route="upload_status/<uuid:task_id>/", view=upload_views.upload_status, name="upload_status"),
     # TV
     path(route="device/tv/compare/<int:profile_id>/", view=tv_views.compare_tv, name="compare_tv"),
     path(route="device/tv/get_ivl_table/", view=tv_views.tv_get_ivl_table, name="tv_get_ivl_table"),
     path(route="device/tv/get_ivl_color_table/", view=tv_views.tv_get_ivl_color_table, name="tv_get_ivl_color_table"),
     path(route="device/tv/get_angle_table/", view=tv_views.tv_get_angle_table, name="tv_get_angle_table"),
     path(route="device/tv/get_lt_table/", view=tv_views.tv_get_lt_table, name="tv_get_lt_table"),
+    path(route="device/tv/get_compare_bundle/", view=tv_views.tv_get_compare_bundle, name="tv_get_compare_bundle"),
     path(route="device/tv/colorfilter_edit/", view=tv_views.tv_colorfilter_edit, name="tv_colorfilter_edit"),
     path(route="device/tv/linefactor_edit/", view=tv_views.tv_linefactor_edit, name="tv_linefactor_edit"),
     path('device/tv/colorfilter/list/', tv_views.tv_colorfilter_list, name='tv_color_filter_list'),
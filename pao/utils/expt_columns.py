@@ -0,0 +1,119 @@
+import math
+
+import numpy as np
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# IVL.expt 컬럼형 저장 형식
+# - 기존(행 단위): [{"V(volt)": 3.0, "J(mA/cm2)": 0.25, ..., "filename": "V190101-2.csv (0)"}, ...]
+# - 컬럼형(schema 1): {"schema": 1, "n": 행 수,
+#                      "columns": {"V(volt)": [3.0, ...], "J(mA/cm2)": [0.25, ...], ...},  숫자 (결측 null)
+#                      "text": {"filename": ["V190101-2.csv (0)", ...]}}                  문자열
+# 행마다 반복되던 컬럼명이 한 번만 저장되고, 조회 시 컬럼별로 np.asarray 한 번이면 배열이 된다.
+EXPT_SCHEMA_VERSION = 1
+
+
+def is_columnar_expt(expt) -> bool:
+    return isinstance(expt, dict) and expt.get("schema") == EXPT_SCHEMA_VERSION
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _json_float(value) -> float | None:
+    """NaN / inf는 JSON에 저장할 수 없으므로 null"""
+    if value is None:
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def encode_expt_columns(expt: list[dict] | dict | None) -> dict:
+    """행 단위 expt → 컬럼형 (이미 컬럼형이면 그대로 반환)"""
+    if is_columnar_expt(expt):
+        return expt
+
+    rows = expt or []
+    keys = list(dict.fromkeys(key for row in rows for key in row))  # 컬럼 순서 유지
+    columns, text = {}, {}
+    for key in keys:
+        values = [row.get(key) for row in rows]
+        if all(value is None or _is_number(value) for value in values):
+            columns[key] = [_json_float(value) for value in values]
+        else:
+            text[key] = [None if value is None else str(value) for value in values]
+
+    return {"schema": EXPT_SCHEMA_VERSION, "n": len(rows), "columns": columns, "text": text}
+
+
+def expt_length(expt) -> int:
+    if is_columnar_expt(expt):
+        return expt["n"]
+    return len(expt or [])
+
+
+def decode_expt_columns(expt) -> dict[str, np.ndarray]:
+    """
+    expt(컬럼형 / 행 단위 모두 허용) → {컬럼명: 배열}
+    숫자 컬럼은 float64 (결측 NaN), 문자열 컬럼은 object 배열
+    """
+    expt = encode_expt_columns(expt)
+    arrays = {key: np.array(values, dtype=float) for key, values in expt["columns"].items()}  # null → NaN
+    for key, values in expt["text"].items():
+        arrays[key] = np.asarray(values, dtype=object)
+    for arr in arrays.values():
+        arr.flags.writeable = False
+    return arrays
+
+
+def expt_to_rows(expt) -> list[dict]:
+    """컬럼형 expt → 기존 행 단위 형식 (결측 값은 key 생략)"""
+    if not is_columnar_expt(expt):
+        return list(expt or [])
+
+    rows = [{} for _ in range(expt["n"])]
+    for section in ("columns", "text"):
+        for key, values in expt[section].items():
+            for row, value in zip(rows, values):
+                if value is not None:
+                    row[key] = value
+    return rows
+
+
+def convert_ivl_expt_to_columnar(apps, schema_editor, batch_size: int = 500) -> None:
+    """
+    기존 IVL.expt(행 단위)를 컬럼형으로 변환하는 data migration (RunPython forwards)
+        migrations.RunPython(convert_ivl_expt_to_columnar, convert_ivl_expt_to_rows)
+    """
+    _convert_ivl_expt(apps, encode_expt_columns, batch_size)
+
+
+def convert_ivl_expt_to_rows(apps, schema_editor, batch_size: int = 500) -> None:
+    """convert_ivl_expt_to_columnar의 reverse"""
+    _convert_ivl_expt(apps, expt_to_rows, batch_size)
+
+
+def _convert_ivl_expt(apps, convert, batch_size: int) -> None:
+    IVL = apps.get_model("pao", "IVL")
+    queryset = IVL.objects.only("pk", "expt").order_by("pk")
+
+    batch, converted = [], 0
+    for ivl in queryset.iterator(chunk_size=batch_size):
+        new_expt = convert(ivl.expt)
+        if new_expt == ivl.expt:
+            continue
+        ivl.expt = new_expt
+        batch.append(ivl)
+        if len(batch) >= batch_size:
+            IVL.objects.bulk_update(batch, ["expt"])
+            converted += len(batch)
+            batch = []
+    if batch:
+        IVL.objects.bulk_update(batch, ["expt"])
+        converted += len(batch)
+
+    logger.info(f"IVL.expt 변환 완료: {converted}건")
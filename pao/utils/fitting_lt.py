@@ -1,18 +1,23 @@
 import numpy as np
 import pandas as pd
-from scipy.optimize import curve_fit, root
-from sklearn.linear_model import LinearRegression
+from pao.models import LTFitResult
+from pao.utils.lifetime import fit_time_vs_intensity, predict_time
+from pao.utils.lifetime_models import fit_lifetime_model, model_lifetimes
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+PO_FIT_KEY = "po"       # LTFitResult.params_key: PO 수명(aging time 기준 intensity) fitting
+PO_FIT_CHANNEL = "W"    # PO fitting은 white intensity 1채널
 
-def stretched_exp_decay(x, A, tau, B):
-    return A * np.exp(-np.clip((x / tau) **B, None, 700))
-    
-def stretched_f_LT(x, A, tau, B, R):
-    return R * A - stretched_exp_decay(x, A, tau, B)
     
 class LT_Processor:
-    def __init__(self, expt, aging_time=3) -> None:
+    def __init__(self, expt, aging_time=3, fit_params=None) -> None:
         self.df = pd.DataFrame(expt)
         self.aging_time = aging_time
+        self.fit_params = dict(fit_params or {})  # {model: {PO_FIT_CHANNEL: fit}}, lt_fit_params 캐시
         self.make_new_df()
         
     def make_new_df(self) -> None:
@@ -71,34 +76,73 @@ class LT_Processor:
                 }
                 
     def fit_LT_stretched(self) -> float:
-        p0 = [100, 0.1, 0.1] #A, tau, B
-        bounds = (
-            [99.5, 0, 0.02],
-            [100.5, np.inf, 1]
-        )
-        popt, _ = curve_fit(
-            stretched_exp_decay, self.time, self.lumin, p0=p0, bounds=bounds, maxfev=10000
-        )
-        A, tau, B = popt
-        
-        t_LT95 = root(stretched_f_LT, 0.0, args(A, tau, B, self.target_ratio))
+        model = LTFitResult.ModelChoices.STRETCHED_EXP
+        channel_fits = self.fit_params.setdefault(model, {})
+        if PO_FIT_CHANNEL not in channel_fits:
+            channel_fits[PO_FIT_CHANNEL] = fit_lifetime_model(model, self.time, self.lumin)
+        fit = channel_fits[PO_FIT_CHANNEL]
+        if not fit or not fit["success"]:
+            logger.warning("LT stretched-exp fitting 실패")
+            return 0
+        # target은 fitting된 초기 intensity(A) 대비 비율
+        t_LT = model_lifetimes(model, fit, self.target_ratio * fit["params"][0])[0]
+        if not np.isfinite(t_LT):
+            return 0
 
-        return np.round(t_LT95.x[0], 2)
+        return np.round(t_LT, 2)
         
     def fit_LT_linear(self, index_start, index_end) -> float:
-        try:
-            y_close = self.time[index_start: index_end + 1].reshape(-1, 1)
-            x_close = self.lumin[index_start: index_end +1].reshape(-1, 1)
-            model = LinearRegression().fit(x_close, y_close)
-            t95_pred = model.predict(np.array([[self.target_lum]]))
-            t95_fit = np.round(t95_pred[0][0], 3)
-        except ValueError as e:
-            print(e)
-            t95_fit = 0
-            
-        return t95_fit
+        y_close = self.time[index_start: index_end + 1]
+        x_close = self.lumin[index_start: index_end + 1]
+        fit = fit_time_vs_intensity(x_close, y_close)
+        t95_pred = predict_time(fit, self.target_lum)["time"][0, 0]
+        if not np.isfinite(t95_pred):
+            logger.warning(f"LT linear fitting 실패: index {index_start}~{index_end}")
+            return 0
+        
+        return np.round(t95_pred, 3)
         
     def time_lum_array(self) -> pd.DataFrame:
         lt_array = self.df[[f"[Hour-{self.aging_time}hr]", f"[Intensity-{self.aging_time}hr]"]].copy()
         lt_array.columns = ["[Hour(h)]", "[Intensity(%)"]
-        return lt_array
\ No newline at end of file
+        return lt_array
+
+def lt_fit_params(lts: list, aging_time: float,
+                  model: str = LTFitResult.ModelChoices.STRETCHED_EXP) -> dict[int, dict]:
+    """
+    LT들의 수명 모델 fitting {lt.pk: {model: {PO_FIT_CHANNEL: fit}}} (LT_Processor(fit_params=...)에 전달)
+    TV 채널별 fitting과 같은 형식 (pao.utils.lifetime_models.fit_lifetime_model), params_key = PO_FIT_KEY
+    LTFitResult에 저장된 값을 한 번의 쿼리로 조회, 없는 LT만 fitting 후 수렴한(success) 결과만 저장
+    (fitting이 필요 없는 LT는 빠지며, LT_Processor가 필요할 때 직접 fitting)
+    """
+    cached = {
+        lt_id: {model: params}
+        for lt_id, params in LTFitResult.objects.filter(
+            lt__in=lts, aging_time=aging_time, model=model, params_key=PO_FIT_KEY
+        ).values_list("lt_id", "params")
+    }
+    fitted = {}
+    for lt in lts:
+        if lt.pk in cached:
+            continue
+        try:
+            processor = LT_Processor(lt.expt, aging_time)
+            processor.check_progress()
+        except Exception as e:
+            logger.warning(f"LT({lt.pk}) 수명 데이터 전처리 실패: {e}")
+            continue
+        if processor.progress != 1:
+            continue  # stretched fitting은 target 미도달(progress 1) LT만 사용
+        fitted[lt] = {PO_FIT_CHANNEL: fit_lifetime_model(model, processor.time, processor.lumin)}
+
+    # 수렴하지 않은 fitting(초기값)은 이번 응답에만 쓰고 저장하지 않음 (다음 조회 때 다시 fitting)
+    LTFitResult.objects.bulk_create(
+        [
+            LTFitResult(lt=lt, aging_time=aging_time, model=model, params_key=PO_FIT_KEY, params=channel_fits)
+            for lt, channel_fits in fitted.items()
+            if (channel_fits[PO_FIT_CHANNEL] or {}).get("success")
+        ],
+        ignore_conflicts=True,
+    )
+    cached.update({lt.pk: {model: channel_fits} for lt, channel_fits in fitted.items()})
+    return cached
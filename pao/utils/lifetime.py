@@ -0,0 +1,156 @@
+import numpy as np
+from scipy.stats import t as student_t
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# 수명(Txx) 추정: intensity(%)가 level 이하로 내려가는 시간
+# - 측정 구간 안에서 level을 지나면 측정값 (first_crossing)
+# - 아직 지나지 않았으면 time = slope × intensity + intercept 직선으로 외삽 (fit_time_vs_intensity)
+# 채널(W/R/G/B/Bpeak ...)은 (채널 수 × 시점 수) 행렬로 한 번에 계산
+LIFETIME_CONFIDENCE = 0.95
+
+
+def first_crossing(times: np.ndarray, intensity: np.ndarray, levels) -> np.ndarray:
+    """
+    채널별로 intensity가 처음 level 이하가 되는 시점 (직전 측정값이 level에 더 가까우면 직전 시점)
+    times: (N,) 또는 (C×N), intensity: (C×N), NaN은 건너뜀
+    반환: (C × level 수) 시간 (측정 구간 안에서 지나지 않으면 NaN)
+
+    누적 최소값(단조 감소 envelope)에서 "envelope <= level"이 처음 성립하는 index가 곧 첫 교차점이므로
+    채널마다 envelope을 한 번 만들고 모든 level을 searchsorted로 한 번에 찾음 (O(N + L log N))
+    """
+    intensity = np.atleast_2d(np.asarray(intensity, dtype=float))
+    times = np.broadcast_to(np.asarray(times, dtype=float), intensity.shape)
+    levels = np.atleast_1d(np.asarray(levels, dtype=float))
+    n_channels, n_points = intensity.shape
+    result = np.full((n_channels, len(levels)), np.nan)
+    if n_points == 0:
+        return result
+
+    valid = np.isfinite(intensity) & np.isfinite(times)
+    envelope = np.minimum.accumulate(np.where(valid, intensity, np.inf), axis=1)
+
+    # 직전 유효 측정 index (NaN 건너뜀)
+    cols = np.arange(n_points)
+    last_valid = np.maximum.accumulate(np.where(valid, cols, -1), axis=1)
+
+    for c in range(n_channels):
+        # -envelope은 단조 증가 → -level 이상이 되는 첫 index
+        idx = np.searchsorted(-envelope[c], -levels, side="left")
+        crossed = idx < n_points
+        idx = np.minimum(idx, n_points - 1)
+        prev = np.where(idx > 0, last_valid[c, np.maximum(idx - 1, 0)], -1)
+
+        curr_dist = np.abs(intensity[c, idx] - levels)
+        prev_dist = np.abs(intensity[c, np.maximum(prev, 0)] - levels)
+        idx = np.where((prev >= 0) & (prev_dist < curr_dist), prev, idx)
+        result[c, crossed] = times[c, idx[crossed]]
+    return result
+
+
+def fit_time_vs_intensity(intensity: np.ndarray, times: np.ndarray, mask: np.ndarray = None) -> dict[str, np.ndarray]:
+    """
+    채널별 최소제곱 직선 time = slope × intensity + intercept (closed form, 채널 축 벡터화)
+    mask: (N,) 또는 (C×N) 추가 선택 조건 (예: times >= aging_time)
+    반환: {"slope", "intercept", "n", "mean_x", "sxx", "s2"} 각 (C,) 배열 (계산 불가 채널은 NaN)
+    """
+    intensity = np.atleast_2d(np.asarray(intensity, dtype=float))
+    times = np.broadcast_to(np.asarray(times, dtype=float), intensity.shape)
+    valid = np.isfinite(intensity) & np.isfinite(times)
+    if mask is not None:
+        valid &= np.broadcast_to(mask, intensity.shape)
+
+    n = valid.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = np.where(valid, intensity, 0.0).sum(axis=1) / n
+        mean_y = np.where(valid, times, 0.0).sum(axis=1) / n
+        dx = np.where(valid, intensity - mean_x[:, None], 0.0)
+        dy = np.where(valid, times - mean_y[:, None], 0.0)
+        sxx = (dx * dx).sum(axis=1)
+        slope = np.where(sxx > 0, (dx * dy).sum(axis=1) / sxx, np.nan)
+        intercept = mean_y - slope * mean_x
+        residual = np.where(valid, dy - slope[:, None] * dx, 0.0)
+        s2 = np.where(n > 2, (residual * residual).sum(axis=1) / (n - 2), np.nan)
+
+    return {"slope": slope, "intercept": intercept, "n": n, "mean_x": mean_x, "sxx": sxx, "s2": s2}
+
+
+def predict_time(fit: dict[str, np.ndarray], levels, confidence: float = LIFETIME_CONFIDENCE) -> dict[str, np.ndarray]:
+    """
+    fit_time_vs_intensity 결과로 level별 시간과 신뢰구간(평균 예측값의 t-분포 구간) 계산
+    반환: {"time", "ci_low", "ci_high"} 각 (C × level 수), 점이 2개뿐이면 구간은 NaN
+    """
+    levels = np.atleast_1d(np.asarray(levels, dtype=float))[None, :]
+    slope, intercept = fit["slope"][:, None], fit["intercept"][:, None]
+    n, mean_x, sxx, s2 = (fit[key][:, None] for key in ["n", "mean_x", "sxx", "s2"])
+
+    time = slope * levels + intercept
+    with np.errstate(divide="ignore", invalid="ignore"):
+        se = np.sqrt(s2 * (1.0 / n + (levels - mean_x) ** 2 / sxx))
+        dof = np.where(n > 2, n - 2, np.nan)
+        half_width = student_t.ppf(0.5 + confidence / 2, dof) * se
+    return {"time": time, "ci_low": time - half_width, "ci_high": time + half_width}
+
+
+# Stretched exponential 수명 모델: I(t) = A × exp(-(t/tau)^beta)
+# - ln(-ln(I/A)) = beta × ln t - beta × ln tau 직선화로 초기값을 구하고, log 시간 grid로 줄인 점에 curve_fit
+# - T(ratio) = tau × (-ln ratio)^(1/beta) (root 탐색 없이 closed form)
+# - fitting / 수명 계산은 pao.utils.lifetime_models.StretchedExpModel (PO / TV 공용)
+STRETCHED_EXP_BOUNDS = ([99.5, 0.0, 0.02], [100.5, np.inf, 1.0])  # A, tau, beta
+STRETCHED_EXP_GRID_POINTS = 200
+STRETCHED_EXP_MAXFEV = 2000
+
+
+def stretched_exp_decay(x, A, tau, B):
+    return A * np.exp(-np.clip((x / tau) ** B, None, 700))
+
+
+def log_time_grid(times: np.ndarray, intensity: np.ndarray,
+                  n_points: int = STRETCHED_EXP_GRID_POINTS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    t > 0인 유효 측정점을 log 간격 시간 bin 평균으로 downsample (점 수가 n_points 이하면 그대로)
+    장기 측정(수천 점)도 초반 급감 구간의 해상도는 유지하면서 fitting 점 수를 제한
+    """
+    times = np.asarray(times, dtype=float)
+    intensity = np.asarray(intensity, dtype=float)
+    valid = np.isfinite(times) & np.isfinite(intensity) & (times > 0)
+    times, intensity = times[valid], intensity[valid]
+    if len(times) <= n_points or times.min() == times.max():
+        return times, intensity
+
+    edges = np.geomspace(times.min(), times.max(), n_points + 1)
+    bins = np.clip(np.searchsorted(edges, times, side="right") - 1, 0, n_points - 1)
+    counts = np.bincount(bins, minlength=n_points)
+    filled = counts > 0
+    grid_times = np.bincount(bins, weights=times, minlength=n_points)[filled] / counts[filled]
+    grid_intensity = np.bincount(bins, weights=intensity, minlength=n_points)[filled] / counts[filled]
+    return grid_times, grid_intensity
+
+
+def stretched_exp_initial_guess(times: np.ndarray, intensity: np.ndarray, A: float = 100.0) -> list[float]:
+    """log-log 직선화 ln(-ln(I/A)) = beta × ln t - beta × ln tau 의 최소제곱 해로 [A, tau, beta] 초기값"""
+    times = np.asarray(times, dtype=float)
+    ratio = np.asarray(intensity, dtype=float) / A
+    valid = np.isfinite(times) & np.isfinite(ratio) & (times > 0) & (ratio > 0) & (ratio < 1)
+    lower, upper = STRETCHED_EXP_BOUNDS
+
+    beta, tau = 0.5, float(times[np.isfinite(times)].max(initial=1.0)) or 1.0
+    if valid.sum() >= 2:
+        u, v = np.log(times[valid]), np.log(-np.log(ratio[valid]))
+        du = u - u.mean()
+        sxx = (du * du).sum()
+        if sxx > 0:
+            beta = float((du * (v - v.mean())).sum() / sxx)
+            beta = float(np.clip(beta, lower[2], upper[2]))
+            tau = float(np.exp(u.mean() - v.mean() / beta))
+    elif valid.any():
+        # 감소한 점이 1개뿐이면 beta 기본값으로 그 점을 지나는 tau
+        t, r = times[valid][0], ratio[valid][0]
+        tau = float(t / (-np.log(r)) ** (1 / beta))
+
+    if not np.isfinite(tau) or tau <= 0:
+        tau = 1.0
+    return [A, tau, beta]
@@ -0,0 +1,240 @@
+import numpy as np
+from scipy.optimize import brentq, curve_fit
+
+from pao.utils.lifetime import (
+    STRETCHED_EXP_BOUNDS,
+    STRETCHED_EXP_GRID_POINTS,
+    STRETCHED_EXP_MAXFEV,
+    log_time_grid,
+    stretched_exp_decay,
+    stretched_exp_initial_guess,
+)
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# 수명 외삽 모델 (name → LifetimeModel), register_lifetime_model로 추가
+LIFETIME_MODELS = {}
+LIFETIME_SEARCH_MAX_TIME = 1e7  # closed form이 없는 모델의 수명 탐색 상한 (hr)
+
+
+def register_lifetime_model(cls: type) -> type:
+    LIFETIME_MODELS[cls.name] = cls()
+    return cls
+
+
+class LifetimeModel:
+    """
+    수명 모델 I(t) = func(t, *params) 기본 형태
+
+    - func / jac: t 배열에 대한 벡터화 모델 값과 analytic Jacobian (len(t) × 파라미터 수), curve_fit(jac=...)에 사용
+    - initial_guess: 데이터에서 직접 계산한 초기값 (수렴 속도 / 안정성)
+    - lifetime: I(t) = level이 되는 시간, 기본은 단조 감소를 가정한 수치 해 (closed form이 있으면 override)
+    - fit_after_aging: True면 aging_time 이후 데이터만 fitting
+    """
+    name = ""
+    param_names = ()
+    bounds = (-np.inf, np.inf)
+    fit_after_aging = False
+
+    def func(self, t, *params):
+        raise NotImplementedError
+
+    def jac(self, t, *params):
+        raise NotImplementedError
+
+    def initial_guess(self, t: np.ndarray, y: np.ndarray) -> list[float]:
+        raise NotImplementedError
+
+    def lifetime(self, params: list[float], levels) -> np.ndarray:
+        levels = np.atleast_1d(np.asarray(levels, dtype=float))
+        result = np.full(len(levels), np.nan)
+        start = float(self.func(np.array([0.0]), *params)[0])
+        for i, level in enumerate(levels):
+            if not level < start:
+                continue
+            upper = 1.0
+            while self.func(np.array([upper]), *params)[0] > level and upper < LIFETIME_SEARCH_MAX_TIME:
+                upper *= 2
+            if upper >= LIFETIME_SEARCH_MAX_TIME:
+                continue
+            result[i] = brentq(lambda t: self.func(np.array([t]), *params)[0] - level, 0.0, upper)
+        return result
+
+
+@register_lifetime_model
+class LinearModel(LifetimeModel):
+    """I = a + b×t (aging_time 이후 구간)"""
+    name = "linear"
+    param_names = ("a", "b")
+    fit_after_aging = True
+
+    def func(self, t, a, b):
+        return a + b * t
+
+    def jac(self, t, a, b):
+        return np.column_stack([np.ones(len(t)), t])
+
+    def initial_guess(self, t, y):
+        dt = t - t.mean()
+        sxx = (dt * dt).sum()
+        b = float((dt * (y - y.mean())).sum() / sxx) if sxx > 0 else 0.0
+        return [float(y.mean() - b * t.mean()), b]
+
+    def lifetime(self, params, levels):
+        a, b = params
+        levels = np.atleast_1d(np.asarray(levels, dtype=float))
+        if not b < 0:
+            return np.full(len(levels), np.nan)
+        return (levels - a) / b
+
+
+@register_lifetime_model
+class StretchedExpModel(LifetimeModel):
+    """I = A×exp(-(t/tau)^beta)"""
+    name = "stretched_exp"
+    param_names = ("A", "tau", "beta")
+    bounds = STRETCHED_EXP_BOUNDS
+
+    def func(self, t, A, tau, beta):
+        return stretched_exp_decay(t, A, tau, beta)
+
+    def jac(self, t, A, tau, beta):
+        ratio = np.maximum(t, 0) / tau
+        z = np.clip(ratio ** beta, None, 700)
+        e = np.exp(-z)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_log = np.where(ratio > 0, z * np.log(ratio), 0.0)
+        return np.column_stack([e, A * e * z * beta / tau, -A * e * z_log])
+
+    def initial_guess(self, t, y):
+        return stretched_exp_initial_guess(t, y)
+
+    def lifetime(self, params, levels):
+        A, tau, beta = params
+        levels = np.atleast_1d(np.asarray(levels, dtype=float))
+        ratios = levels / A
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = tau * (-np.log(ratios)) ** (1.0 / beta)
+        return np.where((ratios > 0) & (ratios < 1), result, np.nan)
+
+
+@register_lifetime_model
+class BiExpModel(LifetimeModel):
+    """I = A1×exp(-t/tau1) + A2×exp(-t/tau2) (초기 급감 + 장기 감소)"""
+    name = "biexp"
+    param_names = ("A1", "tau1", "A2", "tau2")
+    bounds = ([0.0, 1e-6, 0.0, 1e-6], [200.0, np.inf, 200.0, np.inf])
+
+    def func(self, t, A1, tau1, A2, tau2):
+        return A1 * np.exp(-t / tau1) + A2 * np.exp(-t / tau2)
+
+    def jac(self, t, A1, tau1, A2, tau2):
+        e1, e2 = np.exp(-t / tau1), np.exp(-t / tau2)
+        return np.column_stack([e1, A1 * e1 * t / tau1 ** 2, e2, A2 * e2 * t / tau2 ** 2])
+
+    def initial_guess(self, t, y):
+        # stretched exponential 초기값의 tau 기준으로 빠른 성분 20%, 느린 성분 80%
+        A, tau, _ = stretched_exp_initial_guess(t, y)
+        return [0.2 * A, tau / 10, 0.8 * A, tau * 2]
+
+
+@register_lifetime_model
+class PowerLawModel(LifetimeModel):
+    """I = A×(1 + t/tau)^(-n)"""
+    name = "power_law"
+    param_names = ("A", "tau", "n")
+    bounds = ([0.0, 1e-9, 1e-6], [200.0, np.inf, 10.0])
+
+    def func(self, t, A, tau, n):
+        return A * (1 + t / tau) ** (-n)
+
+    def jac(self, t, A, tau, n):
+        base = 1 + t / tau
+        p = base ** (-n)
+        return np.column_stack([p, A * n * p / base * t / tau ** 2, -A * p * np.log(base)])
+
+    def initial_guess(self, t, y):
+        # tau 고정 후 ln(A/I) = n×ln(1 + t/tau) 원점 통과 직선의 기울기
+        A = 100.0
+        tau = float(t.max() / 10) if len(t) and t.max() > 0 else 1.0
+        valid = (y > 0) & (y < A)
+        u = np.log(1 + t[valid] / tau)
+        v = np.log(A / y[valid])
+        n = float((u * v).sum() / (u * u).sum()) if (u * u).sum() > 0 else 1.0
+        return [A, tau, float(np.clip(n, 1e-3, 10.0))]
+
+    def lifetime(self, params, levels):
+        A, tau, n = params
+        levels = np.atleast_1d(np.asarray(levels, dtype=float))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = tau * ((A / levels) ** (1.0 / n) - 1)
+        return np.where((levels > 0) & (levels < A), result, np.nan)
+
+
+def fit_lifetime_model(name: str, times: np.ndarray, intensity: np.ndarray, aging_time: float = 0.0,
+                       grid_points: int = STRETCHED_EXP_GRID_POINTS,
+                       maxfev: int = STRETCHED_EXP_MAXFEV) -> dict | None:
+    """
+    모델 1개 fitting → {"params": [...], "success": bool, "rmse": float | None} (JSON 저장 가능)
+    log 시간 grid로 줄인 점에 초기값 + analytic Jacobian으로 curve_fit, 점이 부족하면 None
+    수렴하지 않으면 초기값을 그대로 반환 (success=False)
+    """
+    model = LIFETIME_MODELS[name]
+    times = np.asarray(times, dtype=float)
+    intensity = np.asarray(intensity, dtype=float)
+    if model.fit_after_aging:
+        selected = times >= aging_time
+        times, intensity = times[selected], intensity[selected]
+    t, y = log_time_grid(times, intensity, grid_points)
+    if len(t) < len(model.param_names):
+        return None
+
+    params, success = model.initial_guess(t, y), False
+    lower, upper = (np.broadcast_to(b, len(params)) for b in model.bounds)
+    params = list(np.clip(params, lower, upper))
+    try:
+        params, _ = curve_fit(model.func, t, y, p0=params, bounds=model.bounds, jac=model.jac, maxfev=maxfev)
+        success = True
+    except (RuntimeError, ValueError) as e:
+        logger.debug(f"{name} 수명 모델 fitting 실패: {e}")
+
+    residual = y - model.func(t, *params)
+    rmse = float(np.sqrt(np.mean(residual ** 2)))
+    return {
+        "params": [float(p) for p in params],
+        "success": success,
+        "rmse": rmse if np.isfinite(rmse) else None,
+    }
+
+
+def fit_lifetime_models(names: list[str], times: np.ndarray, channels: dict[str, np.ndarray],
+                        aging_time: float = 0.0, fits: dict = None) -> dict[str, dict[str, dict | None]]:
+    """
+    여러 모델 × 여러 채널 fitting → {model: {channel: fit}}
+    fits: 이미 있는 결과 (LTFitResult 캐시), 있는 (model, channel)은 다시 fitting하지 않음
+    """
+    result = {name: dict((fits or {}).get(name, {})) for name in names}
+    for name in names:
+        for key, values in channels.items():
+            if key not in result[name]:
+                result[name][key] = fit_lifetime_model(name, times, values, aging_time)
+    return result
+
+
+def model_lifetimes(name: str, fit: dict | None, levels) -> np.ndarray:
+    """fit 결과로 level별 수명 (fit이 없거나 수렴하지 않았으면 NaN)"""
+    levels = np.atleast_1d(np.asarray(levels, dtype=float))
+    if not fit or not fit.get("success"):
+        return np.full(len(levels), np.nan)
+    return LIFETIME_MODELS[name].lifetime(fit["params"], levels)
+
+
+def model_curve(name: str, fit: dict | None, times: np.ndarray) -> np.ndarray:
+    """fit 결과의 시간별 모델 값 (차트용, fit이 없거나 수렴하지 않았으면 NaN)"""
+    times = np.asarray(times, dtype=float)
+    if not fit or not fit.get("success"):
+        return np.full(len(times), np.nan)
+    return LIFETIME_MODELS[name].func(times, *fit["params"])
@@ -0,0 +1,95 @@
+import numpy as np
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+OPERATING_POINT_KEYS = ["V(volt)", "CE(cd/A)", "n(QE)", "x", "y"]
+TARGET_SNAP_TOLERANCE = 0.5  # 측정 범위 밖 target이 끝점에서 이 거리 이내면 끝점 값 사용 (J10 단일 포인트 측정)
+
+
+class OperatingPointExtractor:
+    """
+    sweep 1개에서 임의의 target(J 또는 휘도)의 동작점(V, CE, EQE, x, y ...)을 보간으로 추출
+
+    - lookup 축(x)을 한 번 정렬해 두고, target은 searchsorted로 O(log n) 조회
+    - 구간별 선형 보간: 단조 구간에서 overshoot 없음 (monotone)
+    - 측정 범위 밖 target은 NaN (snap_tolerance 이내면 가까운 끝점 값)
+    - 같은 x가 여러 번 측정된 경우 해당 값들의 평균 사용
+    """
+
+    def __init__(self, x: np.ndarray, columns: dict[str, np.ndarray],
+                 snap_tolerance: float = TARGET_SNAP_TOLERANCE):
+        x = np.asarray(x, dtype=float)
+        valid = np.isfinite(x)
+        order = np.argsort(x[valid], kind="stable")
+        grid, inverse = np.unique(x[valid][order], return_inverse=True)
+
+        self.x = grid
+        self.snap_tolerance = snap_tolerance
+        self.columns = {}
+        for key, values in columns.items():
+            values = np.asarray(values, dtype=float)[valid][order]
+            finite = np.isfinite(values)
+            sums = np.bincount(inverse, weights=np.where(finite, values, 0.0), minlength=len(grid))
+            n = np.bincount(inverse, weights=finite.astype(float), minlength=len(grid))
+            self.columns[key] = np.divide(sums, n, out=np.full(len(grid), np.nan), where=n > 0)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def lookup(self, targets, keys: list[str] = None) -> dict[str, np.ndarray]:
+        """targets(스칼라 또는 배열)에서의 {key: 값 배열} (값이 없으면 NaN)"""
+        targets = np.atleast_1d(np.asarray(targets, dtype=float))
+        keys = list(self.columns) if keys is None else keys
+        if len(self.x) == 0:
+            return {key: np.full(len(targets), np.nan) for key in keys}
+
+        x = self.x
+        # 범위 밖이지만 끝점 근처인 target은 끝점으로 당김
+        snapped = targets.copy()
+        snapped[(targets < x[0]) & (x[0] - targets <= self.snap_tolerance)] = x[0]
+        snapped[(targets > x[-1]) & (targets - x[-1] <= self.snap_tolerance)] = x[-1]
+        in_range = (snapped >= x[0]) & (snapped <= x[-1])
+
+        # x[i-1] <= t <= x[i] 구간 찾기
+        upper = np.clip(np.searchsorted(x, snapped, side="left"), 1, max(len(x) - 1, 1))
+        lower = upper - 1
+        if len(x) == 1:
+            upper = lower = np.zeros(len(targets), dtype=int)
+        span = x[upper] - x[lower]
+        weight = np.divide(snapped - x[lower], span, out=np.zeros(len(targets)), where=span > 0)
+
+        result = {}
+        for key in keys:
+            values = self.columns.get(key)
+            if values is None:
+                result[key] = np.full(len(targets), np.nan)
+                continue
+            interpolated = values[lower] + weight * (values[upper] - values[lower])
+            result[key] = np.where(in_range, interpolated, np.nan)
+        return result
+
+
+def batch_operating_points(extractors: list[OperatingPointExtractor], targets,
+                           keys: list[str] = OPERATING_POINT_KEYS) -> dict[str, np.ndarray]:
+    """여러 sweep × 여러 target 일괄 조회 → {key: (sweep 수 × target 수) 배열}"""
+    targets = np.atleast_1d(np.asarray(targets, dtype=float))
+    result = {key: np.full((len(extractors), len(targets)), np.nan) for key in keys}
+    for row, extractor in enumerate(extractors):
+        if extractor is None:
+            continue
+        for key, values in extractor.lookup(targets, keys).items():
+            result[key][row] = values
+    return result
+
+
+def ivl_operating_point_extractor(ivl, by: str = "J(mA/cm2)",
+                                  keys: list[str] = OPERATING_POINT_KEYS) -> OperatingPointExtractor:
+    """IVL.expt 측정값 기준 extractor (by 컬럼 기준 조회, IVL 인스턴스에 캐시)"""
+    cache = ivl.__dict__.setdefault("_operating_points", {})
+    cache_key = (by, tuple(keys))
+    if cache_key not in cache:
+        cache[cache_key] = OperatingPointExtractor(ivl.expt_column(by), {key: ivl.expt_column(key) for key in keys})
+    return cache[cache_key]
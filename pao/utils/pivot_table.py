@@ -1,18 +1,34 @@
 import numpy as np
 import pandas as pd
 from scipy.interpolate import interp1d
-import numbers
+import hashlib
+import json
 from collections import defaultdict
 import csv
 import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from pao.models import TVColorFilter
+from typing import Callable
+from pao.models import TV_LT_THRESHOLDS_DEFAULT, LTFitResult, TVColorFilter, TVDOEAggregate
+from pao.utils.lifetime import first_crossing, fit_time_vs_intensity, predict_time
+from pao.utils.lifetime_models import LIFETIME_MODELS, fit_lifetime_models, model_curve, model_lifetimes
+from pao.utils.operating_point import (
+    OPERATING_POINT_KEYS,
+    OperatingPointExtractor,
+    batch_operating_points,
+    ivl_operating_point_extractor,
+)
+from pao.utils.spectral_features import first_spectrum, ivl_spec_analysis
+from pao.utils.spectrum_peaks import LT_BLUE_PEAK_BAND, SPECTRAL_BANDS, band_peaks, spectral_band_features
+from pao.utils.spectrum_interp import SPECTRUM_INTERPOLATOR, WL_GRID, build_spec_matrix, open_spec_memmap, spec_row_dot
 from shapely.geometry import Polygon
-from sklearn.linear_model import LinearRegression
 from scipy.optimize import curve_fit
+import django
+from django.conf import settings
 from django.db import models
 import re
-from functools import lru_cache
          
 import logging
 
@@ -51,12 +67,21 @@ COLOR_SPACE_XY = {
     "BT.2020": [(0.708, 0.292), (0.170, 0.797), (0.131, 0.046)]
 }
 
-WL_INTERP= np.arange(380.0, 781.0, 1.0)
+WL_INTERP= WL_GRID  # 380~780nm, 1nm
+
+# LT 수명 테이블 채널 (T95-W, T95-R ...) / ΔV 기준 수명
+LT_LIFETIME_CHANNELS = ["W", "R", "G", "B", "Bpeak"]
+LT_CHANNEL_GRAPH_KEYS = {"W": "white", "R": "red", "G": "green", "B": "blue", "Bpeak": "blue_peak"}
+LT_DELTA_V_THRESHOLD = 95.0
+
+# J100(Sweep) IVL에서 보간으로 추가 표시할 J target (mA/cm²) → "J50-V(volt)" 등의 행
+TV_IVL_SWEEP_TARGETS = [1.0, 50.0, 200.0]
 
 TABLE_ROW_HEADERS = {
     "ivl": {
         "J10": ["V(volt)", "CE(cd/A)", "n(QE)", "x", "y"],
         "J100": ["V(volt)"],
+        **{f"J{target:g}": ["V(volt)", "CE(cd/A)", "n(QE)", "x", "y"] for target in TV_IVL_SWEEP_TARGETS},
         "Spec": ["B Peak", "B Peak WL", "B FWHM", "YG Peak", "YG Peak WL", "YG FWHM", "LBL"],
         # "Count": ["J10 Count", "J100 Count"],
     },
@@ -74,7 +99,7 @@ TABLE_ROW_HEADERS = {
             "Sample Info",
             "Condition",
             "T95-W", "T95-R", "T95-G", "T95-B", "T95-Bpeak",
-            "Δv(T95-Green)"
+            "ΔV(T95-G)"
         ]
     }
 }
@@ -125,6 +150,21 @@ def tv_get_valid_does_grouped(does: list[models.Model]) -> dict[str, list[models
 
     return {k: sorted(v, key=lambda x: x.id) for k, v in valid_does.items()}
     
+def tv_partition_ivls(does: list[models.Model]) -> dict[int, dict[str, list[models.Model]]]:
+    """
+    DOE별 IVL을 J10 / J100(Sweep)으로 메모리에서 한 번에 분류
+    ivl_set.filter()는 prefetch를 우회해 DOE마다 쿼리가 나가므로, 분류 결과를 하위 함수에 넘겨서 사용
+    Note: prefetch_related('ivl_set') 되어 있어야 효율적
+    반환: {doe_id: {"J10": [ivl, ...], "J100": [ivl, ...]}}
+    """
+    ivl_groups = {}
+    for doe in does:
+        groups = {"J10": [], "J100": []}
+        for ivl in doe.ivl_set.all():
+            groups["J10" if ivl.is_J10 else "J100"].append(ivl)
+        ivl_groups[doe.id] = groups
+    return ivl_groups
+    
 # def tv_get_ivl_labels(does: list[models.Model]) -> dict[str, list[str]]:
 #     """
 #     IVL 기준으로 DOE를 J10 / J100으로 분류 (ivl이 없는 DOE는 제외)
@@ -144,6 +184,76 @@ def tv_get_valid_does_grouped(does: list[models.Model]) -> dict[str, list[models
 #                 found_j100 = True
 #     return ivl_labels
     
+def tv_get_spec_matrix(obj: models.Model) -> np.ndarray:
+    """
+    IVL / LT / Angle의 (N×401) 보간 스펙트럼 행렬 (보간 실패 행은 NaN)
+    MMAP 저장 LT는 spec_file의 읽기 전용 memmap 반환
+    저장된 expt_spec_interp가 없으면(기존 데이터) expt_spec에서 직접 보간
+    """
+    matrix = obj.spec_matrix
+    if matrix is None:
+        matrix = build_spec_matrix(obj.expt_spec)
+    return matrix
+
+
+def _as_spec_rows(expt_spec_interp: list[np.ndarray] | np.ndarray) -> np.ndarray:
+    """보간 스펙트럼 리스트 → (N×401) 행렬, 이미 행렬(memmap 포함)이면 그대로 반환"""
+    if isinstance(expt_spec_interp, np.ndarray):
+        return expt_spec_interp
+    return np.vstack(expt_spec_interp)
+
+
+def tv_aggregate_params_key(**params) -> str:
+    """집계 파라미터(color filter 내용, aging time 등) → TVDOEAggregate.params_key (blake2b hex)"""
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def tv_get_doe_aggregates(
+    dataset: str,
+    doe_ids: list[int],
+    build: Callable[[int], tuple[dict, dict]] | None,
+    params_key: str = "",
+    build_many: Callable[[list[int]], dict[int, tuple[dict, dict]]] = None,
+) -> dict[int, tuple[dict, dict]]:
+    """
+    DOE별 집계(TVDOEAggregate)를 한 번의 쿼리로 조회, 저장값이 없는 DOE만 build(doe_id)로 계산 후 저장
+    build는 JSON 저장 가능한 (rows, extras) 반환 - rows = {fieldName: 값}
+    build_many가 있으면 저장값이 없는 DOE 전체를 한 번에 넘겨 계산 ({doe_id: (rows, extras)}, 병렬 처리용)
+    반환: {doe_id: (rows, extras)} (doe_ids 순서)
+    """
+    doe_ids = list(dict.fromkeys(doe_ids))
+    aggregates = {
+        agg.doe_id: (agg.rows, agg.extras)
+        for agg in TVDOEAggregate.objects.filter(doe_id__in=doe_ids, dataset=dataset, params_key=params_key)
+    }
+
+    missing = [doe_id for doe_id in doe_ids if doe_id not in aggregates]
+    if build_many is not None and missing:
+        built = build_many(missing)
+    else:
+        built = {doe_id: build(doe_id) for doe_id in missing}
+
+    new_aggregates = []
+    for doe_id in missing:
+        rows, extras = built[doe_id]
+        aggregates[doe_id] = (rows, extras)
+        new_aggregates.append(
+            TVDOEAggregate(doe_id=doe_id, dataset=dataset, params_key=params_key, rows=rows, extras=extras)
+        )
+    if new_aggregates:
+        # 동시 요청이 먼저 저장한 경우는 무시
+        TVDOEAggregate.objects.bulk_create(new_aggregates, ignore_conflicts=True)
+
+    return {doe_id: aggregates[doe_id] for doe_id in doe_ids}
+
+
+def tv_fill_pivot_rows(pivot_rows: dict, label: str, rows: dict) -> None:
+    """DOE 집계 rows({fieldName: 값})를 pivot 테이블의 label 컬럼에 채움"""
+    for field_name, value in rows.items():
+        pivot_rows.setdefault(field_name, {"fieldName": field_name})[label] = value
+
+
 def tv_get_row_header(table_key: str) -> list[str]:
     """
     table_key에 해당하는 row header 목록을 반환.
@@ -167,12 +277,56 @@ def tv_get_row_header(table_key: str) -> list[str]:
     return combined_headers
 
 
-def tv_generate_base_table(table_key: str, doe_labels: list[str], default_value: str = "") -> dict:
+def tv_lt_thresholds(values=None) -> list[float]:
+    """
+    LT 수명 기준 intensity(%) 정리 (ProfileTVAdditions.lt_thresholds, "97,95,90" 문자열도 허용)
+    0~100 사이 숫자만, 중복 제거 후 내림차순, ΔV 기준인 T95는 항상 포함
+    """
+    if isinstance(values, str):
+        values = values.split(",")
+    thresholds = {LT_DELTA_V_THRESHOLD}
+    for value in values or TV_LT_THRESHOLDS_DEFAULT:
+        if is_number(value) and 0 < float(value) < 100:
+            thresholds.add(float(value))
+    return sorted(thresholds, reverse=True)
+
+
+def tv_lt_models(values=None) -> list[str]:
+    """LT 수명 외삽 모델 이름 정리 ("linear,biexp" 문자열도 허용), LIFETIME_MODELS에 있는 것만 등록 순서대로"""
+    if isinstance(values, str):
+        values = values.split(",")
+    names = {str(value).strip() for value in values or []}
+    return [name for name in LIFETIME_MODELS if name in names]
+
+
+def tv_lt_row_headers(thresholds: list[float], lt_models: list[str] = ()) -> list[str]:
+    """
+    LT 테이블 row header: TABLE_ROW_HEADERS["lt"]의 T95 행 뒤에
+    추가 기준(T97, T90 ...) 행과 모델별 예측(T95-W (stretched_exp) ...) 행 삽입
+    """
+    headers = tv_get_row_header("lt")
+    extra = [
+        f"T{threshold:g}-{key}"
+        for threshold in thresholds if threshold != LT_DELTA_V_THRESHOLD
+        for key in LT_LIFETIME_CHANNELS
+    ] + [
+        f"T{threshold:g}-{key} ({name})"
+        for name in lt_models
+        for threshold in thresholds
+        for key in LT_LIFETIME_CHANNELS
+    ]
+    position = headers.index(f"T{LT_DELTA_V_THRESHOLD:g}-{LT_LIFETIME_CHANNELS[-1]}") + 1
+    return headers[:position] + extra + headers[position:]
+
+
+def tv_generate_base_table(table_key: str, doe_labels: list[str], default_value: str = "",
+                           headers: list[str] = None) -> dict:
     """
     주어진 table_key에 대해, 모든 row header와 DOE label을 포함한 빈 테이블 생성
     default_value: 기본값 설정 (기본: "-", 공백 원하면 "" 또는 None)
+    headers: row header 직접 지정 (없으면 tv_get_row_header(table_key))
     """
-    headers = tv_get_row_header(table_key)
+    headers = headers or tv_get_row_header(table_key)
     base_table = {}
     for header in headers:
         base_table[header] = {"fieldName": header}
@@ -244,6 +398,7 @@ def tv_generate_ivl_table(
     IVL 평균 테이블 생성 (DOE 기준)
     - DOE 안에서 J10 IVL들끼리 평균
     - DOE 안에서 J100(Sweep) IVL들끼리 평균 (V(volt) 중심)
+    - DOE별 평균은 TVDOEAggregate에 저장된 값을 사용, 없는 DOE만 계산
     """
     doe_labels = all_doe_labels or [f"DOE-{doe.id}" for doe in does]
     pivot_rows = tv_generate_base_table("ivl", doe_labels)
@@ -254,6 +409,32 @@ def tv_generate_ivl_table(
         for label in doe_labels:
             pivot_rows[count_key][label] = 0  # ✅ "-" → 0으로 초기화
 
+    spectrum_storage = {label: {"J10": None, "J100": None} for label in doe_labels}
+
+    does_by_id = {doe.id: doe for doe in does if f"DOE-{doe.id}" in doe_labels}
+    aggregates = tv_get_doe_aggregates(
+        TVDOEAggregate.DatasetChoices.IVL,
+        list(does_by_id),
+        lambda doe_id: _tv_ivl_doe_aggregate(does_by_id[doe_id]),
+        params_key=tv_aggregate_params_key(
+            sweep_targets=TV_IVL_SWEEP_TARGETS, spectral_bands=SPECTRAL_BANDS, spectra="average"
+        ),
+    )
+    for doe_id, (rows, extras) in aggregates.items():
+        label = f"DOE-{doe_id}"
+        tv_fill_pivot_rows(pivot_rows, label, rows)
+        spectrum_storage[label] = extras.get("spectra", {"J10": None, "J100": None})
+
+    return pivot_rows, spectrum_storage
+
+
+def _tv_ivl_doe_aggregate(doe: models.Model) -> tuple[dict, dict]:
+    """
+    DOE 1개의 IVL 평균 (rows = {fieldName: 값}, extras = {"spectra": {"J10": 평균 스펙트럼, "J100": 평균 스펙트럼}})
+    평균 스펙트럼은 380~780nm 보간 강도 리스트 (유효 스펙트럼이 없으면 None), 원본 expt_spec은 저장하지 않음
+    Note: prefetch_related('ivl_set') 되어 있어야 효율적
+    """
+    label = f"DOE-{doe.id}"
     pivot_structure = TABLE_ROW_HEADERS["ivl"]
     j10_keys, j100_keys, spec_keys = (
         pivot_structure["J10"],
@@ -261,177 +442,217 @@ def tv_generate_ivl_table(
         pivot_structure["Spec"],
     )
 
-    spectrum_storage = {label: {"J10": [], "J100": []} for label in doe_labels}
-
-    for doe in does:
-        label = f"DOE-{doe.id}"
-        if label not in doe_labels:
-            continue
-
-        ivl_data = {"J10": defaultdict(list), "J100": defaultdict(list), "Spec": defaultdict(list)}
-        
-        # ✅ IVL 개수 카운터 추가
-        j10_count = 0
-        j100_count = 0
-        
-        # ✅ 디버깅용: IVL ID 수집
-        j10_ivl_ids = []
-        j100_ivl_ids = []
-
-        for ivl in doe.ivl_set.all():
-            expt = ivl.expt or []
-
-            if ivl.is_J10:
-                # --- J10 평균 처리 ---
-                j10_entries = [e for e in expt if abs(float(e.get("J(mA/cm2)", -999)) - 10) < 0.5]
-                if not j10_entries and expt:
-                    j10_entries = [expt[0]]
-
-                # ✅ entry 루프 밖에서 유효성 체크
-                has_valid_data = False
-                for entry in j10_entries:
-                    for key in j10_keys:
-                        val = entry.get(key)
-                        ivl_data["J10"][key].append(float(val) if val is not None else None)
-                        if val is not None:
-                            has_valid_data = True
-                
-                # ✅ IVL당 1번만 카운트
-                if has_valid_data:
-                    j10_count += 1
-                    j10_ivl_ids.append(ivl.ivl_id or f"pk-{ivl.pk}")  # ✅ ID 수집
-
-                # 스펙트럼 분석
-                if ivl.expt_spec:
-                    spec = ivl.expt_spec[0].get("0", {})
-                    if spec:
-                        spectrum_storage[label]["J10"].append(spec)
-                        spec_analysis = TVSpectrumAnalyzer.analyze_spec(spec)
-                        for k, v in spec_analysis.items():
-                            ivl_data["Spec"][k].append(v)
-                    else:
-                        for k in spec_keys:
-                            ivl_data["Spec"][k].append(None)
-                else:
-                    for k in spec_keys:
-                        ivl_data["Spec"][k].append(None)
+    ivl_data = defaultdict(lambda: defaultdict(list))
+    spectra = {"J10": [], "J100": []}
+    
+    # ✅ IVL 개수 카운터 추가
+    j10_count = 0
+    j100_count = 0
+    
+    # ✅ 디버깅용: IVL ID 수집
+    j10_ivl_ids = []
+    j100_ivl_ids = []
 
-            else:
-                # --- J100 평균 처리 ---
-                # ✅ 면적 계산
-	            area = calculate_area_from_first_points(expt, ivl.id)
-	            if area is None:
-	                continue  # 면적 계산 불가 시 스킵
-	            
-	            # ✅ 전류밀도 재계산
-	            recalculated_expt = recalculate_current_density(expt, area)
-	            
-	            # ✅ 재계산된 데이터에서 J≈100 탐색
-	            entry_100 = next(
-	                (e for e in recalculated_expt if abs(float(e.get("J(mA/cm2)", -999)) - 100) < 0.5),
-	                None,
-	            )
-                if entry_100:
-                    v_val = entry_100.get("V(volt)")
-                    if v_val is not None:  # ✅ 유효 데이터가 있을 때만
-                        ivl_data["J100"]["V(volt)"].append(float(v_val))
-                        j100_count += 1  # ✅ IVL당 1번 
-                        j100_ivl_ids.append(ivl.ivl_id or f"pk-{ivl.pk}")  # ✅ ID 수집
-
-                # 스펙트럼 저장
-                if ivl.expt_spec:
-                    spec = ivl.expt_spec[0].get("0", {})
-                    if spec:
-                        spectrum_storage[label]["J100"].append(spec)
-        
-        # ✅ 디버깅 로그 출력
-        logger.info(
-            f"{label} | J10: {j10_count}개 {j10_ivl_ids} | J100: {j100_count}개 {j100_ivl_ids}"
-        )
+    ivls = list(doe.ivl_set.all())
+    j10_ivls = [ivl for ivl in ivls if ivl.is_J10]
+    j100_ivls = [ivl for ivl in ivls if not ivl.is_J10]
+    j100_sweeps = dict(zip(map(id, j100_ivls), tv_process_j100_sweeps(j100_ivls)))
 
-        # DOE 단위 평균값 계산
-        for metric in j10_keys:
-            pivot_rows[f"J10-{metric}"][label] = get_formatted_avg(
-                ivl_data["J10"].get(metric, []), metric
-            )
-        for metric in j100_keys:
-            pivot_rows[f"J100-{metric}"][label] = get_formatted_avg(
-                ivl_data["J100"].get(metric, []), metric
-            )
-        for spec_key in spec_keys:
-            pivot_rows[f"Spec-{spec_key}"][label] = get_formatted_avg(
-                ivl_data["Spec"].get(spec_key, []), spec_key
-            )
+    # J10: J=10 동작점 보간 (단일 포인트 측정은 ±0.5 이내면 그 값)
+    j10_points = batch_operating_points(
+        [ivl_operating_point_extractor(ivl) for ivl in j10_ivls], [J10_TARGET], j10_keys
+    )
+    j10_rows = {id(ivl): row for row, ivl in enumerate(j10_ivls)}
+
+    for ivl in ivls:
+        if ivl.is_J10:
+            # --- J10 평균 처리 ---
+            # ✅ entry 루프 밖에서 유효성 체크
+            has_valid_data = False
+            for key in j10_keys:
+                val = j10_points[key][j10_rows[id(ivl)], 0]
+                ivl_data["J10"][key].append(float(val) if np.isfinite(val) else None)
+                if np.isfinite(val):
+                    has_valid_data = True
+            
+            # ✅ IVL당 1번만 카운트
+            if has_valid_data:
+                j10_count += 1
+                j10_ivl_ids.append(ivl.ivl_id or f"pk-{ivl.pk}")  # ✅ ID 수집
+
+            # 스펙트럼 분석 (업로드 시 저장된 IVLSpectralFeature 사용, 없으면 직접 계산)
+            spec = first_spectrum(ivl.expt_spec)
+            if spec:
+                spectra["J10"].append(spec)
+            spec_analysis = ivl_spec_analysis(ivl)
+            for k in spec_keys:
+                ivl_data["Spec"][k].append(spec_analysis.get(k) if spec_analysis else None)
 
-        # ✅ 카운트 저장
-        pivot_rows["J10 Count"][label] = j10_count
-        pivot_rows["J100 Count"][label] = j100_count
+        else:
+            # --- J100 평균 처리 ---
+            # ✅ 면적 계산 + 전류밀도 재계산 (tv_process_j100_sweeps, IVL별 캐시)
+            sweep = j100_sweeps[id(ivl)]
+            if sweep is None:
+                continue  # 면적 계산 불가 시 스킵
+            
+            # ✅ 재계산된 J에서 J=100 / 추가 target 동작점 (보간, 범위 밖이면 NaN)
+            targets = [J100_TARGET] + TV_IVL_SWEEP_TARGETS
+            points = sweep["points"].lookup(targets, OPERATING_POINT_KEYS)
+            v_val = points["V(volt)"][0]
+            if np.isfinite(v_val):  # ✅ 유효 데이터가 있을 때만
+                ivl_data["J100"]["V(volt)"].append(float(v_val))
+                j100_count += 1  # ✅ IVL당 1번 
+                j100_ivl_ids.append(ivl.ivl_id or f"pk-{ivl.pk}")  # ✅ ID 수집
+            for i, target in enumerate(TV_IVL_SWEEP_TARGETS, start=1):
+                for key, values in points.items():
+                    if np.isfinite(values[i]):
+                        ivl_data[f"J{target:g}"][key].append(float(values[i]))
+
+            # 스펙트럼 저장
+            spec = first_spectrum(ivl.expt_spec)
+            if spec:
+                spectra["J100"].append(spec)
+    
+    # ✅ 디버깅 로그 출력
+    logger.info(
+        f"{label} | J10: {j10_count}개 {j10_ivl_ids} | J100: {j100_count}개 {j100_ivl_ids}"
+    )
 
-    return pivot_rows, spectrum_storage
-    
-def calculate_area_from_first_points(expt: list[dict], ivl_id: int) -> float | None:
-    """앞쪽 3개 포인트로 면적 계산 (A = I / J의 평균)"""
-    areas = []
-    
-    for i in range(min(3, len(expt))):
-        entry = expt[i]
-        current = entry.get("Current(mA)")
-        j = entry.get("J(mA/cm2)")
-        
-        if current is None or j is None or j == 0:
-            logger.warning(
-                f"IVL ID {ivl_id}: {i+1}번째 포인트에 유효한 Current 또는 J 값이 없습니다. "
-                f"(Current={current}, J={j})"
-            )
-            continue
-        
-        areas.append(float(current) / float(j))
-    
-    if not areas:
-        logger.error(
-            f"IVL ID {ivl_id}: 앞쪽 3개 포인트 모두에서 면적 계산 불가. "
-            f"해당 샘플 데이터를 스킵합니다."
-        )
+    # DOE 단위 평균값 계산
+    rows = {}
+    for metric in j10_keys:
+        rows[f"J10-{metric}"] = get_formatted_avg(ivl_data["J10"].get(metric, []), metric)
+    for metric in j100_keys:
+        rows[f"J100-{metric}"] = get_formatted_avg(ivl_data["J100"].get(metric, []), metric)
+    for target in TV_IVL_SWEEP_TARGETS:
+        group = f"J{target:g}"
+        for metric in pivot_structure[group]:
+            rows[f"{group}-{metric}"] = get_formatted_avg(ivl_data[group].get(metric, []), metric)
+    for spec_key in spec_keys:
+        rows[f"Spec-{spec_key}"] = get_formatted_avg(ivl_data["Spec"].get(spec_key, []), spec_key)
+
+    # ✅ 카운트 저장
+    rows["J10 Count"] = j10_count
+    rows["J100 Count"] = j100_count
+
+    return rows, {"spectra": {group: _tv_average_spectrum(specs, label) for group, specs in spectra.items()}}
+
+
+def _tv_average_spectrum(spectra_list: list[dict], label: str) -> list[float] | None:
+    """스펙트럼들을 380~780nm로 일괄 보간 후 파장별 평균 (보간 가능한 스펙트럼이 없으면 None)"""
+    if not spectra_list:
         return None
+    intensity_matrix, valid = TVSpectrumAnalyzer.get_interpolated_spectra_batch(spectra_list)
+    if not valid.any():
+        logger.warning(f"스펙트럼 보간 실패 ({label})")
+        return None
+    return intensity_matrix[valid].mean(axis=0).tolist()
     
-    avg_area = sum(areas) / len(areas)
-    logger.debug(f"IVL ID {ivl_id}: 계산된 평균 면적 = {avg_area:.4f} cm²")
-    return avg_area
+J10_TARGET = 10.0     # J10 행: J10 측정 IVL의 J = 10 mA/cm² 동작점
+J100_TARGET = 100.0   # J100 행: 재계산된 J = 100 mA/cm² 에서의 V
+J100_AREA_POINTS = 3  # 면적 계산에 쓰는 앞쪽 포인트 수
 
-def recalculate_current_density(expt: list[dict], area: float) -> list[dict]:
-    """전류를 기준으로 모든 포인트의 전류밀도 재계산 (J = I / A)"""
-    recalculated = []
-    
-    for entry in expt:
-        current = entry.get("Current(mA)")
-        
-        if current is not None:
-            new_j = float(current) / area
-            new_entry = {
-                "J(mA/cm2)": round(new_j, 2),  # 소수점 둘째자리 반올림
-                "V(volt)": entry.get("V(volt)")
+
+def tv_process_j100_sweeps(ivls: list[models.Model]) -> list[dict | None]:
+    """
+    J100(Sweep) IVL들을 한 번에 처리
+    - 앞쪽 3개 포인트로 면적 계산 (A = I / J의 평균) → 전류 기준으로 전류밀도 재계산 (J = I / A)
+    - 재계산된 J 기준 동작점 extractor 생성 (J=100 및 TV_IVL_SWEEP_TARGETS 조회에 사용)
+    결과는 IVL 인스턴스에 캐시되어 IVL 테이블 / J-V 차트가 같은 값을 공유
+    반환: ivls 순서대로 {"area": A, "J(mA/cm2)": 배열, "V(volt)": 배열, "points": OperatingPointExtractor}
+          (면적 계산 불가 시 None)
+    """
+    pending = [ivl for ivl in ivls if "_j100_sweep" not in ivl.__dict__]
+    if pending:
+        lengths = np.array([ivl.expt_len for ivl in pending])
+        max_length = int(lengths.max(initial=0))
+        current = _stack_series([ivl.expt_column("Current(mA)") for ivl in pending], max_length)
+        j = _stack_series([ivl.expt_column("J(mA/cm2)") for ivl in pending], max_length)
+        voltage = _stack_series([ivl.expt_column("V(volt)") for ivl in pending], max_length)
+
+        # 1) 면적: 앞쪽 포인트 중 Current, J가 유효(J≠0)한 것들의 I/J 평균
+        head_current, head_j = current[:, :J100_AREA_POINTS], j[:, :J100_AREA_POINTS]
+        head_valid = np.isfinite(head_current) & np.isfinite(head_j) & (head_j != 0)
+        counts = head_valid.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio_sum = np.where(head_valid, head_current / head_j, 0.0).sum(axis=1)
+            areas = np.divide(ratio_sum, counts, out=np.full(len(pending), np.nan), where=counts > 0)
+            # 2) 전류밀도 재계산 (소수점 둘째자리 반올림)
+            recalculated = np.round(current / areas[:, None], 2)
+
+        for row, ivl in enumerate(pending):
+            for i in np.flatnonzero(~head_valid[row, :lengths[row]]):
+                logger.warning(
+                    f"IVL ID {ivl.id}: {i+1}번째 포인트에 유효한 Current 또는 J 값이 없습니다. "
+                    f"(Current={head_current[row, i]}, J={head_j[row, i]})"
+                )
+            if not counts[row]:
+                logger.error(
+                    f"IVL ID {ivl.id}: 앞쪽 {J100_AREA_POINTS}개 포인트 모두에서 면적 계산 불가. "
+                    f"해당 샘플 데이터를 스킵합니다."
+                )
+                ivl.__dict__["_j100_sweep"] = None
+                continue
+
+            logger.debug(f"IVL ID {ivl.id}: 계산된 평균 면적 = {areas[row]:.4f} cm²")
+            keep = np.isfinite(current[row, :lengths[row]])  # Current가 없는 포인트 제외
+            sweep_j = recalculated[row, :lengths[row]][keep]
+            ivl.__dict__["_j100_sweep"] = {
+                "area": float(areas[row]),
+                "J(mA/cm2)": sweep_j,
+                "V(volt)": voltage[row, :lengths[row]][keep],
+                "points": OperatingPointExtractor(
+                    sweep_j, {key: ivl.expt_column(key)[keep] for key in OPERATING_POINT_KEYS}
+                ),
             }
-            recalculated.append(new_entry)
-    
-    return recalculated
+
+    return [ivl.__dict__["_j100_sweep"] for ivl in ivls]
     
 def tv_generate_angle_table(angles: list[models.Model], all_doe_labels: list[str] = None) -> tuple[dict, dict, dict]:
     """
     각도 데이터 테이블 생성 및 각도별 평균 계산
-    반환: (angle_rows, angle_graph_data, angle_spectrum_data, angle_averages)
+    DOE별 결과는 TVDOEAggregate에 저장된 값을 사용, 없는 DOE만 계산
+    반환: (angle_rows, angle_averages, angle_spectrum_averages)
     """
+    angles_by_doe = defaultdict(list)
+    for angle in angles:
+        angles_by_doe[angle.doe_id].append(angle)
+
     if all_doe_labels:
         doe_labels = all_doe_labels
     else:
-        doe_labels = [f"DOE-{angle.doe.id}" for angle in angles]
+        doe_labels = [f"DOE-{doe_id}" for doe_id in angles_by_doe]
     
     angle_rows = tv_generate_base_table("angle", doe_labels)
+    angle_averages = {}
+    angle_spectrum_averages = {}
+
+    aggregates = tv_get_doe_aggregates(
+        TVDOEAggregate.DatasetChoices.ANGLE,
+        list(angles_by_doe),
+        lambda doe_id: _tv_angle_doe_aggregate(f"DOE-{doe_id}", angles_by_doe[doe_id]),
+    )
+    for doe_id, (rows, extras) in aggregates.items():
+        label = f"DOE-{doe_id}"
+        tv_fill_pivot_rows(angle_rows, label, rows)
+        if extras.get("averages"):
+            angle_averages[label] = extras["averages"]
+        if extras.get("spectrum_averages"):
+            # JSON 저장 시 문자열이 된 각도 key 복원
+            angle_spectrum_averages[label] = {int(deg): v for deg, v in extras["spectrum_averages"].items()}
+        
+    return angle_rows, angle_averages, angle_spectrum_averages
+
+
+def _tv_angle_doe_aggregate(label: str, angles: list[models.Model]) -> tuple[dict, dict]:
+    """
+    DOE 1개의 Angle 집계 (같은 DOE에 Angle이 여러 개면 마지막 데이터 사용)
+    rows = {"Angle-Δu'v'(60°)": 값}, extras = {"averages": {...}, "spectrum_averages": {각도: {...}}}
+    """
     angle_graph_data = {}
     angle_spectrum_data = {}
     
     for angle in angles:
-        label = f"DOE-{angle.doe.id}"
-        
         expt = angle.expt
         expt_spec = angle.expt_spec
         if not expt or not expt_spec:
@@ -454,22 +675,23 @@ def tv_generate_angle_table(angles: list[models.Model], all_doe_labels: list[str
             continue
         
         u0, v0 = uv_by_angle[0]
-        delta_uv = {
+        angle_graph_data[label] = {
             deg: round(((u - u0) ** 2 + (v - v0) ** 2) ** 0.5, 5)
             for deg, (u, v) in uv_by_angle.items()
         }
-        
-        angle_rows["Angle-Δu'v'(60°)"][label] = delta_uv.get(60, "N/A")
-        angle_graph_data[label] = delta_uv
         angle_spectrum_data[label] = {
-            entry.get("filename", ""): spec for entry, spec in zip(expt, expt_spec)
+            entry.get("filename", ""): row for entry, row in zip(expt, tv_get_spec_matrix(angle))
         }
-    
-    # 각도별 평균 계산
-    angle_averages = calculate_angle_averages(angle_graph_data, doe_labels)
-    angle_spectrum_averages = calculate_angle_spectrum_averages(angle_spectrum_data, doe_labels)
-        
-    return angle_rows, angle_averages, angle_spectrum_averages
+
+    if label not in angle_graph_data:
+        return {}, {}
+
+    rows = {"Angle-Δu'v'(60°)": angle_graph_data[label].get(60, "N/A")}
+    extras = {
+        "averages": calculate_angle_averages(angle_graph_data, [label]).get(label),
+        "spectrum_averages": calculate_angle_spectrum_averages(angle_spectrum_data, [label]).get(label),
+    }
+    return rows, extras
     
 def calculate_angle_averages(angle_graph_data: dict, doe_labels: list[str]) -> dict:
     """기존 angle_graph_data를 활용한 각도별 평균 계산"""
@@ -506,7 +728,7 @@ def calculate_angle_spectrum_averages(angle_spectrum_data: dict, doe_labels: lis
     DOE별, 각도별 스펙트럼 평균 계산
     
     Args:
-        angle_spectrum_data: {doe_label: {filename: spectrum_dict}}
+        angle_spectrum_data: {doe_label: {filename: 보간된 스펙트럼(401) 또는 spectrum_dict}}
         doe_labels: DOE 라벨 리스트
     
     Returns:
@@ -527,11 +749,11 @@ def calculate_angle_spectrum_averages(angle_spectrum_data: dict, doe_labels: lis
         angle_groups = {0: [], 15: [], 30: [], 45: [], 60: []}
         
         # 파일명 기준으로 각도별 그룹핑
-        for filename, spectrum_dict in doe_spectra.items():
+        for filename, spectrum in doe_spectra.items():
             for pattern, angle in angle_patterns.items():
                 if pattern in filename:
-                    if spectrum_dict:  # 스펙트럼 데이터가 있는 경우
-                        angle_groups[angle].append(spectrum_dict)
+                    if spectrum is not None and len(spectrum):  # 스펙트럼 데이터가 있는 경우
+                        angle_groups[angle].append(spectrum)
                     break
         
         # 각도별 평균 계산
@@ -540,27 +762,24 @@ def calculate_angle_spectrum_averages(angle_spectrum_data: dict, doe_labels: lis
             if not spectra_list:
                 continue
                 
-            # 스펙트럼을 380~780nm로 보간
-            interpolated_spectra = []
-            for spectrum in spectra_list:
-			    try:
-			        # 중첩된 딕셔너리에서 실제 스펙트럼 추출
-			        if isinstance(spectrum, dict):
-			            # 첫 번째 값이 스펙트럼 데이터라고 가정
-			            actual_spectrum = next(iter(spectrum.values()))
-			            spec_tuple = tuple(actual_spectrum.items())
-			        else:
-			            spec_tuple = tuple(spectrum.items())
-			            
-			        intensity_interp = TVSpectrumAnalyzer.get_interpolated_spectrum_cubic(spec_tuple)
-			        interpolated_spectra.append(intensity_interp)
-			    except Exception as e:
-			        logger.warning(f"각도 스펙트럼 보간 실패 ({doe_label}, {angle}°): {e}")
-			        continue
+            # 이미 보간된 행(expt_spec_interp)은 그대로, dict 스펙트럼만 일괄 보간
+            # 중첩된 딕셔너리는 첫 번째 값이 스펙트럼 데이터라고 가정
+            rows = [np.asarray(s, dtype=float) for s in spectra_list if isinstance(s, np.ndarray)]
+            dict_spectra = [
+                next(iter(s.values()), {}) if isinstance(next(iter(s.values()), None), dict) else s
+                for s in spectra_list if isinstance(s, dict)
+            ]
+            if dict_spectra:
+                interp_matrix, _ = TVSpectrumAnalyzer.get_interpolated_spectra_batch(dict_spectra)
+                rows.extend(interp_matrix)
+            intensity_matrix = np.vstack(rows)
+            valid = np.isfinite(intensity_matrix).all(axis=1)
+            if not valid.all():
+                logger.warning(f"각도 스펙트럼 보간 실패 ({doe_label}, {angle}°): {int((~valid).sum())}건")
             
-            if interpolated_spectra:
+            if valid.any():
                 # 파장별 평균 계산
-                avg_intensities = np.mean(interpolated_spectra, axis=0)
+                avg_intensities = intensity_matrix[valid].mean(axis=0)
                 doe_angle_spectrum_averages[angle] = {
                     "wavelength": WL_INTERP.tolist(),  # 380~780nm
                     "intensity": avg_intensities.tolist()
@@ -659,17 +878,27 @@ def tv_generate_lt_table(
     lts: list[models.Model],
     color_filter: dict,
     aging_time: float = 30,
-    all_doe_labels: list[str] = None
+    all_doe_labels: list[str] = None,
+    resample_time: bool = False,
+    workers: int = None,
+    lt_thresholds: list[float] = None,
+    lt_models: list[str] = None,
 ) -> tuple[dict, dict]:
     """
     LT 데이터 테이블 생성 및 시간별 평균 계산
     DOE별로 여러 LT 데이터가 있는 경우 평균값으로 처리
+    resample_time: 시계열 평균 시 인덱스 대신 공통 시간축으로 보간 (_calculate_average_time_series)
+    DOE별 결과는 (color filter, aging time)별 TVDOEAggregate에 저장된 값을 사용, 없는 DOE만 계산
+    workers: LT별 분석(_tv_analyze_lt)을 나눠 돌릴 프로세스 수 (None이면 LT_ANALYSIS_WORKERS(기본 1), 1 이하면 직렬)
+    lt_thresholds: 수명 기준 intensity(%) 목록 (tv_lt_thresholds로 정리, T95 항상 포함) → "T90-W" 등의 행
+    lt_models: 함께 표시할 수명 외삽 모델 (pao.utils.lifetime_models) → "T95-W (biexp)" 등의 행 / 차트 곡선
+               LT별 fitting 결과는 LTFitResult에 저장해 기준·모델 조합이 바뀌어도 다시 fitting하지 않음
     반환: (lt_rows, lt_graph_data)
     """
     # DOE별로 LT 데이터 그룹핑
     doe_lt_groups = defaultdict(list)
     for lt in lts:
-        doe_lt_groups[lt.doe.id].append(lt)
+        doe_lt_groups[lt.doe_id].append(lt)
     
     # 전체 DOE 라벨 설정
     if all_doe_labels:
@@ -677,188 +906,419 @@ def tv_generate_lt_table(
     else:
         doe_labels = [f"DOE-{doe_id}" for doe_id in sorted(doe_lt_groups.keys())]
     
-    lt_rows = tv_generate_base_table("lt", doe_labels)
+    thresholds = tv_lt_thresholds(lt_thresholds)
+    lt_models = tv_lt_models(lt_models)
+    lt_rows = tv_generate_base_table("lt", doe_labels, headers=tv_lt_row_headers(thresholds, lt_models))
     lt_graph_data = {}
     
     analyzer = TVSpectrumAnalyzer(color_filter)
-
-    # DOE별로 처리
-    for doe_id, lt_list in doe_lt_groups.items():
+    aggregates = tv_get_doe_aggregates(
+        TVDOEAggregate.DatasetChoices.LT,
+        list(doe_lt_groups),
+        None,
+        build_many=lambda doe_ids: _tv_build_lt_aggregates(
+            {doe_id: doe_lt_groups[doe_id] for doe_id in doe_ids},
+            analyzer, aging_time, resample_time, LT_ANALYSIS_WORKERS if workers is None else workers, thresholds,
+            lt_models, tv_aggregate_params_key(color_filter=color_filter, blue_peak_band=LT_BLUE_PEAK_BAND),
+        ),
+        params_key=tv_aggregate_params_key(
+            color_filter=color_filter, aging_time=aging_time, resample_time=resample_time,
+            blue_peak_band=LT_BLUE_PEAK_BAND, lt_thresholds=thresholds, lt_models=lt_models, lifetime_ci=True,
+        ),
+    )
+    for doe_id, (rows, extras) in aggregates.items():
         label = f"DOE-{doe_id}"
-        
-        # DOE별 집계용 변수들
-        doe_sample_infos = []
-        doe_conditions = []
-        doe_t95_values = defaultdict(list)
-        doe_delta_vs = []
-        doe_times_list = []
-        doe_intensities = {
-            "white": [],
-            "rgb": {"R": [], "G": [], "B": []},
-            "blue_peak": [],
-            "vdelta": []
-        }
+        tv_fill_pivot_rows(lt_rows, label, rows)
+        if extras.get("graph"):
+            lt_graph_data[label] = {**extras["graph"], "lifetime_ci": extras.get("lifetime_ci", {})}
 
-        # DOE 내 모든 LT 데이터 처리
-        for lt in lt_list:
-            # 1) 데이터 준비
-            times, white, rgb, blue_peak, vdelta = _prepare_lt_data(lt.expt, lt.expt_spec, analyzer)
+    return lt_rows, lt_graph_data
 
-            # sample info 전처리
-            datafolder = lt.expt[0].get('datafolder', '')
-            channel = lt.expt[0].get('[Channel]', '')
-            
-            folder_name = ""
-            if datafolder:
-                for part in re.split(r'[\\/]', datafolder):
-                    if part.strip().startswith("#"):
-                        folder_name = part.strip()
-                        break
-            try:
-                channel_str = str(int(float(channel)))
-            except (ValueError, TypeError):
-                channel_str = str(channel)
-            
-            # J(mA/cm2), tempset 전처리
-            try:
-                j_value = str(int(round(float(lt.expt[0].get('J(mA/cm2)', 0)), 0)))
-                t_value = str(int(round(float(lt.expt[0].get('tempset', 0)), 0)))
-            except (ValueError, TypeError):
-                j_value = str(lt.expt[0].get('J(mA/cm2)', ''))
-                t_value = str(lt.expt[0].get('tempset', ''))
-            
-            # 2) T95 계산
-            t95_values, t95_flags = {}, {}
-            for key, arr in {
-                "W": white,
-                "R": rgb["R"],
-                "G": rgb["G"],
-                "B": rgb["B"],
-                "Bpeak": blue_peak
-            }.items():
-                t95, is_pred = _find_t95(times, np.array(arr, dtype=float), aging_time)
-                t95_values[key] = t95
-                t95_flags[key] = is_pred
-                if t95 != "-" and isinstance(t95, (int, float)):
-                    doe_t95_values[key].append(t95)
-
-            # 3) Δv 예측 (Green T95 시점)
-            if t95_values.get("G") != "-":
-                delta_v = _predict_vdelta(times, vdelta, t95_values["G"])
-                if delta_v != "-" and isinstance(delta_v, (int, float)):
-                    doe_delta_vs.append(delta_v)
-
-            # 4) DOE별 데이터 수집
-            doe_sample_infos.append(f"{folder_name}-ch{channel_str}")
-            doe_conditions.append(f"{j_value}J-{t_value}°C")
-            
-            # 시계열 데이터 수집
-            doe_times_list.append(times)
-            doe_intensities["white"].append(white)
-            doe_intensities["rgb"]["R"].append(rgb["R"])
-            doe_intensities["rgb"]["G"].append(rgb["G"])
-            doe_intensities["rgb"]["B"].append(rgb["B"])
-            doe_intensities["blue_peak"].append(blue_peak)
-            doe_intensities["vdelta"].append(vdelta)
-
-        # DOE별 평균값 계산 및 테이블 저장
-        if doe_sample_infos:
-            lt_rows["Sample Info"][label] = doe_sample_infos[0]
-            lt_rows["Condition"][label] = doe_conditions[0]
-            
-            # T95 값들의 평균
-            for key in ["W", "R", "G", "B", "Bpeak"]:
-                if key in doe_t95_values and doe_t95_values[key]:
-                    avg_t95 = round(sum(doe_t95_values[key]) / len(doe_t95_values[key]), 2)
-                    lt_rows[f"T95-{key}"][label] = avg_t95
-                else:
-                    lt_rows[f"T95-{key}"][label] = "-"
-            
-            # Δv 평균
-            if doe_delta_vs:
-                avg_delta_v = round(sum(doe_delta_vs) / len(doe_delta_vs), 4)
-                lt_rows["ΔV(T95-G)"][label] = avg_delta_v
-            else:
-                lt_rows["ΔV(T95-G)"][label] = "-"
-            
-            # 그래프용 평균 시계열 데이터 계산 (모든 메트릭 포함)
-            if doe_times_list:
-                avg_graph_data = _calculate_average_time_series(
-                    doe_times_list, 
-                    doe_intensities["white"],
-                    doe_intensities["rgb"],
-                    doe_intensities["blue_peak"],
-                    doe_intensities["vdelta"]
-                )
-                lt_graph_data[label] = avg_graph_data
 
-    return lt_rows, lt_graph_data
+# 프로세스 pool은 settings.PAO_LT_ANALYSIS_WORKERS > 1일 때만 사용 (기본은 직렬)
+LT_ANALYSIS_WORKERS = getattr(settings, "PAO_LT_ANALYSIS_WORKERS", None) or 1
+LT_WORKER_EXPT_COLUMNS = ("[Hour(h)]", "[Intensity(%)]", "vdelta")        # _prepare_lt_data가 쓰는 열
+LT_WORKER_EXPT_HEADER = ("datafolder", "[Channel]", "J(mA/cm2)", "tempset")  # sample info (첫 행)
+_lt_pools = {}          # workers 수 → ProcessPoolExecutor
+_lt_worker_analyzers = {}  # (worker 프로세스) color filter params_key → TVSpectrumAnalyzer
+
+
+def _init_lt_worker() -> None:
+    """spawn된 LT 분석 프로세스에서 Django 앱 로딩 (pivot_table이 pao.models를 import)"""
+    django.setup()
+
+
+def _get_lt_pool(workers: int) -> ProcessPoolExecutor:
+    if workers not in _lt_pools:
+        # 스레드가 있는 웹 프로세스를 fork하지 않도록 spawn 사용
+        _lt_pools[workers] = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_lt_worker,
+        )
+    return _lt_pools[workers]
+
+
+def _discard_lt_pool(workers: int) -> None:
+    """중단된(BrokenProcessPool) pool을 캐시에서 제거 (다음 요청에서 새로 생성)"""
+    pool = _lt_pools.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _tv_build_lt_aggregates(doe_lt_groups: dict[int, list[models.Model]], analyzer: "TVSpectrumAnalyzer",
+                            aging_time: float, resample_time: bool, workers: int,
+                            thresholds: list[float] = (LT_DELTA_V_THRESHOLD,), lt_models: list[str] = (),
+                            fit_key: str = "") -> dict[int, tuple[dict, dict]]:
+    """
+    여러 DOE의 LT 집계를 한 번에 계산
+    LT별 분석(_tv_analyze_lt)은 서로 독립이므로 workers > 1이면 프로세스 pool로 나눠 실행 후 DOE별로 병합
+    lt_models: 저장된 fitting(LTFitResult, fit_key = color filter 기준)을 넘기고 새로 fitting한 결과만 저장
+    """
+    lt_items = [(doe_id, lt) for doe_id, lt_list in doe_lt_groups.items() for lt in lt_list]
+    cached_fits = tv_get_lt_fits([lt for _, lt in lt_items], aging_time, fit_key, lt_models) if lt_models else {}
+
+    def analyze_serial():
+        return [
+            (doe_id, lt, _tv_analyze_lt(
+                lt.expt, tv_get_spec_matrix(lt), analyzer, aging_time, thresholds, lt_models, cached_fits.get(lt.pk)
+            ))
+            for doe_id, lt in lt_items
+        ]
+
+    if workers <= 1 or len(lt_items) < 2:
+        analyzed = analyze_serial()
+    else:
+        try:
+            pool = _get_lt_pool(workers)
+            futures = [
+                (doe_id, lt, pool.submit(
+                    _tv_analyze_lt_worker, _lt_worker_expt(lt.expt), _lt_spec_source(lt), analyzer.color_filter,
+                    aging_time, thresholds, lt_models, cached_fits.get(lt.pk)
+                ))
+                for doe_id, lt in lt_items
+            ]
+            analyzed = [(doe_id, lt, future.result()) for doe_id, lt, future in futures]
+        except BrokenProcessPool as e:
+            # worker 프로세스 비정상 종료 (OOM 등): pool을 버리고 이번 요청은 직렬로 계산
+            logger.error(f"LT 분석 프로세스 pool 중단, 직렬로 계산: {e}")
+            _discard_lt_pool(workers)
+            analyzed = analyze_serial()
+
+    if lt_models:
+        tv_save_lt_fits([(lt, result["fits"]) for _, lt, result in analyzed], aging_time, fit_key, cached_fits)
+
+    results = defaultdict(list)
+    for doe_id, _, result in analyzed:
+        results[doe_id].append(result)
+    return {
+        doe_id: _tv_merge_lt_results(results[doe_id], resample_time)
+        for doe_id in doe_lt_groups
+    }
+
+
+def tv_get_lt_fits(lts: list[models.Model], aging_time: float, fit_key: str,
+                   lt_models: list[str]) -> dict[int, dict[str, dict]]:
+    """저장된 LT 수명 모델 fitting 결과 {lt.pk: {model: {channel: fit}}} (한 번의 쿼리)"""
+    fits = defaultdict(dict)
+    for lt_id, model, params in LTFitResult.objects.filter(
+        lt__in=lts, aging_time=aging_time, params_key=fit_key, model__in=lt_models
+    ).values_list("lt_id", "model", "params"):
+        fits[lt_id][model] = params
+    return dict(fits)
+
+
+def tv_save_lt_fits(lt_fits: list[tuple[models.Model, dict]], aging_time: float, fit_key: str,
+                    cached_fits: dict[int, dict[str, dict]]) -> None:
+    """
+    _tv_analyze_lt의 "fits" 중 저장되지 않은 (LT, model)만 LTFitResult에 일괄 저장
+    수렴하지 않은 채널이 있는 (LT, model)은 저장하지 않음 (다음 요청에서 다시 fitting)
+    """
+    LTFitResult.objects.bulk_create(
+        [
+            LTFitResult(lt=lt, aging_time=aging_time, model=name, params_key=fit_key, params=channel_fits)
+            for lt, fits in lt_fits
+            for name, channel_fits in fits.items()
+            if name not in cached_fits.get(lt.pk, {})
+            and all(fit is None or fit["success"] for fit in channel_fits.values())
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _lt_worker_expt(expt: list[dict]) -> list[dict]:
+    """worker에 넘길 expt: 분석에 쓰는 열만 남기고 첫 행에 sample info 필드 유지 (전체 expt pickle 방지)"""
+    rows = [{key: row[key] for key in LT_WORKER_EXPT_COLUMNS if key in row} for row in expt]
+    if rows:
+        rows[0].update({key: expt[0][key] for key in LT_WORKER_EXPT_HEADER if key in expt[0]})
+    return rows
+
+
+def _lt_spec_source(lt: models.Model) -> np.ndarray | str:
+    """worker에 넘길 스펙트럼: MMAP 저장 LT는 파일 경로(worker가 직접 memmap), 그 외는 행렬"""
+    if lt.spec_storage == lt.SpecStorageChoices.MMAP and lt.spec_file:
+        return lt.spec_file.path
+    return np.asarray(tv_get_spec_matrix(lt))
+
+
+def _tv_analyze_lt_worker(expt: list[dict], spec_source: np.ndarray | str, color_filter: dict,
+                          aging_time: float, thresholds: list[float] = (LT_DELTA_V_THRESHOLD,),
+                          lt_models: list[str] = (), fits: dict = None) -> dict:
+    """LT 분석 프로세스에서 실행 (DB 접근 없음), analyzer는 color filter별로 프로세스 안에서 재사용"""
+    key = tv_aggregate_params_key(color_filter=color_filter)
+    if key not in _lt_worker_analyzers:
+        _lt_worker_analyzers[key] = TVSpectrumAnalyzer(color_filter)
+    spec_matrix = open_spec_memmap(spec_source) if isinstance(spec_source, str) else spec_source
+    if spec_matrix is None:
+        spec_matrix = np.empty((0, len(WL_GRID)), dtype=np.float32)
+    return _tv_analyze_lt(expt, spec_matrix, _lt_worker_analyzers[key], aging_time, thresholds, lt_models, fits)
 
 
-def _calculate_average_time_series(times_list, white_list, rgb_data, blue_peak_list, vdelta_list):
+def _tv_analyze_lt(expt: list[dict], spec_matrix: np.ndarray, analyzer: "TVSpectrumAnalyzer",
+                   aging_time: float, thresholds: list[float] = (LT_DELTA_V_THRESHOLD,),
+                   lt_models: list[str] = (), fits: dict = None) -> dict:
+    """
+    LT 1개 분석: 시계열 전처리 + 기준별 수명(T95, T90 ...) + Δv 예측 + 모델별 수명 예측
+    fits: 저장된 모델 fitting 결과 {model: {channel: fit}}, 없는 것만 fitting
+    반환: {"sample_info", "condition", "lifetimes": {기준: {key: 값 | "-"}},
+           "lifetime_ci": {기준: {key: 외삽 수명 신뢰구간 (low, high) | None}}, "t95", "delta_v",
+           "fits": {model: {key: fit}}, "model_lifetimes": {model: {기준: {key: 값 | "-"}}},
+           "times", "white", "rgb", "blue_peak", "vdelta"}
+    """
+    # 1) 데이터 준비
+    times, white, rgb, blue_peak, vdelta = _prepare_lt_data(expt, spec_matrix, analyzer)
+
+    # sample info 전처리
+    datafolder = expt[0].get('datafolder', '')
+    channel = expt[0].get('[Channel]', '')
+    
+    folder_name = ""
+    if datafolder:
+        for part in re.split(r'[\\/]', datafolder):
+            if part.strip().startswith("#"):
+                folder_name = part.strip()
+                break
+    try:
+        channel_str = str(int(float(channel)))
+    except (ValueError, TypeError):
+        channel_str = str(channel)
+    
+    # J(mA/cm2), tempset 전처리
+    try:
+        j_value = str(int(round(float(expt[0].get('J(mA/cm2)', 0)), 0)))
+        t_value = str(int(round(float(expt[0].get('tempset', 0)), 0)))
+    except (ValueError, TypeError):
+        j_value = str(expt[0].get('J(mA/cm2)', ''))
+        t_value = str(expt[0].get('tempset', ''))
+    
+    # 2) 수명 계산 (5개 채널 × 모든 기준 한 번에)
+    thresholds = sorted({LT_DELTA_V_THRESHOLD, *thresholds}, reverse=True)
+    channels = {"W": white, "R": rgb["R"], "G": rgb["G"], "B": rgb["B"], "Bpeak": blue_peak}
+    found = _find_lifetimes(times, channels, aging_time, thresholds)
+    lifetimes = {
+        threshold: {key: levels[threshold]["value"] for key, levels in found.items()}
+        for threshold in thresholds
+    }
+    lifetime_ci = {
+        threshold: {key: levels[threshold]["ci"] for key, levels in found.items()}
+        for threshold in thresholds
+    }
+    t95_values = lifetimes[LT_DELTA_V_THRESHOLD]
+
+    # 3) 모델별 수명 예측 (측정 최대 시간×10 범위만)
+    model_fits = fit_lifetime_models(list(lt_models), times, channels, aging_time, fits) if lt_models else {}
+    max_time = float(np.nanmax(times)) if len(times) else 0.0
+    model_values = {}
+    for name, channel_fits in model_fits.items():
+        model_values[name] = {threshold: {} for threshold in thresholds}
+        for key, fit in channel_fits.items():
+            for threshold, value in zip(thresholds, model_lifetimes(name, fit, thresholds)):
+                valid = np.isfinite(value) and 0 <= value <= max_time * 10
+                model_values[name][threshold][key] = round(float(value), 2) if valid else "-"
+
+    # 4) Δv 예측 (Green T95 시점)
+    delta_v = "-"
+    if t95_values.get("G") != "-":
+        delta_v = _predict_vdelta(times, vdelta, t95_values["G"])
+
+    return {
+        "sample_info": f"{folder_name}-ch{channel_str}",
+        "condition": f"{j_value}J-{t_value}°C",
+        "lifetimes": lifetimes,
+        "lifetime_ci": lifetime_ci,
+        "t95": t95_values,
+        "delta_v": delta_v,
+        "fits": model_fits,
+        "model_lifetimes": model_values,
+        "times": times,
+        "white": white,
+        "rgb": rgb,
+        "blue_peak": blue_peak,
+        "vdelta": vdelta,
+    }
+
+
+def _tv_merge_lt_results(results: list[dict], resample_time: bool = False) -> tuple[dict, dict]:
+    """
+    _tv_analyze_lt 결과들(DOE 1개) → DOE 평균 (rows, {"graph": 평균 시계열, "lifetime_ci": {"T95-W": [low, high] | None}})
+    lifetime_ci: 직선 외삽한 수명의 신뢰구간 (LT별 구간의 평균, 측정값 / 외삽 불가만 있으면 None)
+    """
+    if not results:
+        return {}, {}
+
+    # DOE별 평균값 계산
+    rows = {
+        "Sample Info": results[0]["sample_info"],
+        "Condition": results[0]["condition"],
+    }
+    
+    # 기준별 수명 값들의 평균
+    for threshold in results[0]["lifetimes"]:
+        for key in LT_LIFETIME_CHANNELS:
+            values = [
+                r["lifetimes"][threshold][key] for r in results
+                if isinstance(r["lifetimes"][threshold].get(key), (int, float))
+            ]
+            rows[f"T{threshold:g}-{key}"] = round(sum(values) / len(values), 2) if values else "-"
+
+    # 기준별 외삽 수명 신뢰구간 평균
+    lifetime_ci = {}
+    for threshold in results[0]["lifetime_ci"]:
+        for key in LT_LIFETIME_CHANNELS:
+            cis = [r["lifetime_ci"][threshold].get(key) for r in results]
+            cis = np.array([ci for ci in cis if ci is not None], dtype=float).reshape(-1, 2)
+            lifetime_ci[f"T{threshold:g}-{key}"] = np.round(cis.mean(axis=0), 2).tolist() if len(cis) else None
+
+    # 모델별 예측 수명 평균
+    for name, model_values in results[0]["model_lifetimes"].items():
+        for threshold in model_values:
+            for key in LT_LIFETIME_CHANNELS:
+                values = [
+                    r["model_lifetimes"][name][threshold][key] for r in results
+                    if isinstance(r["model_lifetimes"][name][threshold].get(key), (int, float))
+                ]
+                rows[f"T{threshold:g}-{key} ({name})"] = round(sum(values) / len(values), 2) if values else "-"
+    
+    # Δv 평균
+    delta_vs = [r["delta_v"] for r in results if isinstance(r["delta_v"], (int, float))]
+    if delta_vs:
+        rows["ΔV(T95-G)"] = round(float(sum(delta_vs) / len(delta_vs)), 4)
+    else:
+        rows["ΔV(T95-G)"] = "-"
+    
+    # 그래프용 평균 시계열 데이터 계산 (모든 메트릭 포함)
+    avg_graph_data = _calculate_average_time_series(
+        [r["times"] for r in results],
+        [r["white"] for r in results],
+        {ch: [r["rgb"][ch] for r in results] for ch in ["R", "G", "B"]},
+        [r["blue_peak"] for r in results],
+        [r["vdelta"] for r in results],
+        resample_time=resample_time
+    )
+
+    # 모델 곡선: LT별 fitting 곡선을 평균 시간축에서 계산 후 평균
+    grid = np.asarray(avg_graph_data["time"], dtype=float)
+    avg_graph_data["models"] = {
+        name: {
+            graph_key: _masked_column_mean(np.vstack([
+                model_curve(name, r["fits"][name].get(key), grid) for r in results
+            ])).tolist()
+            for key, graph_key in LT_CHANNEL_GRAPH_KEYS.items()
+        }
+        for name in results[0]["fits"]
+    } if len(grid) else {}
+    return rows, {"graph": avg_graph_data, "lifetime_ci": lifetime_ci}
+
+
+def _stack_series(series_list: list[np.ndarray], length: int) -> np.ndarray:
+    """길이가 다른 시계열들을 NaN으로 padding한 (replicate × length) 행렬로 쌓음 (길이 초과분은 잘라냄)"""
+    stacked = np.full((len(series_list), length), np.nan)
+    for i, series in enumerate(series_list):
+        values = np.asarray(series, dtype=float)[:length]
+        stacked[i, :len(values)] = values
+    return stacked
+
+
+def _masked_column_mean(stacked: np.ndarray) -> np.ndarray:
+    """NaN을 제외한 열별 평균 (유효 값이 없는 열은 0)"""
+    valid = np.isfinite(stacked)
+    sums = np.where(valid, stacked, 0.0).sum(axis=0)
+    counts = valid.sum(axis=0)
+    return np.divide(sums, counts, out=np.zeros(stacked.shape[1]), where=counts > 0)
+
+
+def _resample_series(times: np.ndarray, series: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """시계열을 grid 시간축으로 선형 보간 (측정 범위 밖은 NaN, 외삽하지 않음)"""
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(series, dtype=float)[:len(times)]
+    times = times[:len(values)]
+    valid = np.isfinite(times) & np.isfinite(values)
+    times, values = times[valid], values[valid]
+    if len(times) == 0:
+        return np.full(len(grid), np.nan)
+    order = np.argsort(times, kind="stable")
+    return np.interp(grid, times[order], values[order], left=np.nan, right=np.nan)
+
+
+def _calculate_average_time_series(times_list, white_list, rgb_data, blue_peak_list, vdelta_list, resample_time: bool = False):
     """
     여러 시계열 데이터의 평균을 계산하는 헬퍼 함수
     rgb_data: {'R': [array1, array2, ...], 'G': [array1, array2, ...], 'B': [array1, array2, ...]} 형태
+
+    - resample_time=False: 인덱스 기준 정렬, 가장 긴 시계열 길이까지 평균 (짧은 시계열은 NaN padding,
+      각 시점은 값이 있는 시계열끼리만 평균)
+    - resample_time=True: 가장 촘촘한 시계열의 시간축(모든 시계열이 겹치는 구간)으로 각 시계열을
+      선형 보간한 뒤 평균 (측정 간격이 다른 LT끼리도 같은 시간끼리 평균)
+    메트릭별로 (replicate × time) 행렬에 쌓아 NaN을 제외한 열 평균을 한 번에 계산
     """
+    metrics = {
+        "white": white_list,
+        "red": rgb_data.get("R", []),
+        "green": rgb_data.get("G", []),
+        "blue": rgb_data.get("B", []),
+        "blue_peak": blue_peak_list,
+        "vdelta": vdelta_list,
+    }
     if not times_list:
-        return {
-            "time": [],
-            "white": [],
-            "red": [],
-            "green": [],
-            "blue": [],
-            "blue_peak": [],
-            "vdelta": []
-        }
-    
-    # 공통 시간 축 찾기 (가장 짧은 시계열 기준)
-    min_length = min(len(times) for times in times_list)
-    common_times = times_list[0][:min_length].tolist()
-    
-    # 각 시점별 평균 계산
-    avg_white = []
-    avg_rgb = {"R": [], "G": [], "B": []}
-    avg_blue_peak = []
-    avg_vdelta = []
-    
-    for i in range(min_length):
-        # White 평균
-        white_values = [white_arr[i] for white_arr in white_list if len(white_arr) > i]
-        avg_white.append(sum(white_values) / len(white_values) if white_values else 0)
-        
-        # RGB 평균
-		for ch in ["R", "G", "B"]:
-		    rgb_values = []
-		    if ch in rgb_data:
-		        for rgb_array in rgb_data[ch]:
-		            if len(rgb_array) > i:
-		                value = rgb_array[i]
-		                rgb_values.append(value)
-		    avg_rgb[ch].append(sum(rgb_values) / len(rgb_values) if rgb_values else 0)
-        
-        # Blue peak 평균
-        blue_peak_values = [bp_arr[i] for bp_arr in blue_peak_list if len(bp_arr) > i]
-        avg_blue_peak.append(sum(blue_peak_values) / len(blue_peak_values) if blue_peak_values else 0)
-        
-        # Vdelta 평균
-        vdelta_values = [vd_arr[i] for vd_arr in vdelta_list if len(vd_arr) > i]
-        avg_vdelta.append(sum(vdelta_values) / len(vdelta_values) if vdelta_values else 0)
-    
+        return {"time": [], **{key: [] for key in metrics}}
+
+    if resample_time:
+        times_arrays = [np.asarray(times, dtype=float) for times in times_list]
+        if not all(len(t) for t in times_arrays):
+            return {"time": [], **{key: [] for key in metrics}}
+        start = max(np.nanmin(t) for t in times_arrays)
+        stop = min(np.nanmax(t) for t in times_arrays)
+        densest = max(times_arrays, key=len)
+        common_times = np.unique(densest[(densest >= start) & (densest <= stop)])
+
+        def stack(series_list):
+            return np.vstack([
+                _resample_series(times, series, common_times)
+                for times, series in zip(times_arrays, series_list)
+            ]) if series_list else np.empty((0, len(common_times)))
+    else:
+        # 공통 시간 축: 가장 긴 시계열 기준 (짧은 시계열에서 잘라내지 않음)
+        longest = max(times_list, key=len)
+        max_length = len(longest)
+        common_times = np.asarray(longest, dtype=float)
+
+        def stack(series_list):
+            return _stack_series(series_list, max_length)
+
     return {
-        "time": common_times,
-        "white": avg_white,
-        "red": avg_rgb["R"],
-        "green": avg_rgb["G"], 
-        "blue": avg_rgb["B"],
-        "blue_peak": avg_blue_peak,
-        "vdelta": avg_vdelta
+        "time": common_times.tolist(),
+        **{key: _masked_column_mean(stack(series_list)).tolist() for key, series_list in metrics.items()},
     }
 
 
 # === 헬퍼 함수들 ===
 
-def _prepare_lt_data(expt: list[dict], expt_spec: list[dict], analyzer: "TVSpectrumAnalyzer") -> tuple[np.ndarray, np.ndarray, dict[str, np.ndarray], np.ndarray, np.ndarray]:
-    """LT 데이터 전처리 - RGB 처리 수정"""
+def _prepare_lt_data(expt: list[dict], spec_matrix: np.ndarray, analyzer: "TVSpectrumAnalyzer") -> tuple[np.ndarray, np.ndarray, dict[str, np.ndarray], np.ndarray, np.ndarray]:
+    """LT 데이터 전처리 - RGB 처리 수정
+
+    spec_matrix: (N×401) 보간 스펙트럼 행렬 (tv_get_spec_matrix, 보간 실패 행은 NaN)
+                 MMAP 저장 LT는 memmap 그대로 전달되며 리스트로 펼치지 않고 블록 단위로 계산
+    """
     df = pd.DataFrame(expt)
     times = df["[Hour(h)]"].to_numpy()
     vdelta = df["vdelta"].to_numpy() if "vdelta" in df.columns else np.zeros(len(times))
@@ -870,26 +1330,13 @@ def _prepare_lt_data(expt: list[dict], expt_spec: list[dict], analyzer: "TVSpect
         logger.warning("White intensity 첫 번째 값이 0이거나 데이터가 없음")
         white = np.zeros(len(times))
 
-    # 보간 처리
-    expt_spec_interp = []
-    valid_indices = []
-    
-    for i, spec in enumerate(expt_spec):
-        try:
-            if not spec:
-                continue
-            first_spec = next(iter(spec.values()))
-            if not first_spec:
-                continue
-            spec_tuple = tuple(first_spec.items())
-            intensity_interp = analyzer.get_interpolated_spectrum_cubic(spec_tuple)
-            expt_spec_interp.append(intensity_interp)
-            valid_indices.append(i)
-        except Exception as e:
-            logger.error(f"인덱스 {i} 스펙트럼 보간 실패: {e}")
-            continue
+    # 보간 실패 행 제외 (NaN 행은 행 합도 NaN, 전부 유효하면 memmap을 복사 없이 그대로 사용)
+    valid = np.isfinite(spec_row_dot(spec_matrix, np.ones((len(WL_GRID), 1)))[:, 0])
+    expt_spec_interp = spec_matrix if valid.all() else spec_matrix[valid]
+    if len(expt_spec_interp) < len(spec_matrix):
+        logger.error(f"스펙트럼 보간 실패: {len(spec_matrix) - len(expt_spec_interp)}건")
 
-    if not expt_spec_interp:
+    if len(expt_spec_interp) == 0:
         logger.error("보간된 스펙트럼이 없음")
         empty_rgb = {"R": np.zeros(len(times)), "G": np.zeros(len(times)), "B": np.zeros(len(times))}
         return times, white, empty_rgb, np.zeros(len(times)), vdelta
@@ -948,52 +1395,45 @@ def _prepare_lt_data(expt: list[dict], expt_spec: list[dict], analyzer: "TVSpect
     return times, white, rgb, blue_peak, vdelta
 
 
-def _find_t95(times: np.ndarray, arr: np.ndarray, aging_time: float) -> tuple[float | str, bool]:
-    """intensity에서 95% 시점 T95 계산 - 안전성 강화"""
-    if len(arr) == 0 or len(times) == 0:
-        return "-", False
-
-    # NaN이나 inf 값 처리
-    valid_mask = np.isfinite(arr) & np.isfinite(times)
-    if not np.any(valid_mask):
-        return "-", False
-    
-    valid_times = times[valid_mask]
-    valid_arr = arr[valid_mask]
-
-    # 95 이하인 index 찾기
-    below_idx = np.where(valid_arr <= 95)[0]
-    if len(below_idx) > 0:
-        idx = below_idx[0]
-        # 이전 값과 비교해서 95와 더 가까운 쪽 선택
-        if idx > 0:
-            prev_val = valid_arr[idx - 1]
-            curr_val = valid_arr[idx]
-            if abs(prev_val - 95) < abs(curr_val - 95):
-                idx = idx - 1
-        return round(float(valid_times[idx]), 2), False
-
-    # 없으면 aging_time 이후 데이터로 선형 예측
-    mask = valid_times >= aging_time
-    if np.sum(mask) < 2:
-        return "-", True
-        
-    X = valid_arr[mask].reshape(-1, 1)
-    y = valid_times[mask].reshape(-1, 1)
-    
-    try:
-        model = LinearRegression().fit(X, y)
-        pred = model.predict(np.array([[95]]))
-        predicted_time = float(pred[0][0])
-        
-        # 예측값이 합리적인 범위인지 확인
-        if predicted_time < 0 or predicted_time > valid_times.max() * 10:
-            return "-", True
-            
-        return round(predicted_time, 2), True
-    except Exception as e:
-        logger.warning(f"T95 예측 실패: {e}")
-        return "-", True
+def _find_lifetimes(times: np.ndarray, channels: dict[str, np.ndarray], aging_time: float,
+                    levels=(95.0,)) -> dict[str, dict[float, dict]]:
+    """
+    채널별 intensity(%)에서 level별 수명(T95 등)을 한 번에 계산 (pao.utils.lifetime)
+    - 측정 구간 안에서 level을 지나면 측정 시점
+    - 아니면 aging_time 이후 데이터의 time-intensity 직선으로 외삽 (점 2개 이상, 0 ~ 측정 최대 시간×10 범위만)
+    반환: {채널: {level: {"value": 시간 | "-", "predicted": bool, "ci": (low, high) | None}}}
+    """
+    times = np.asarray(times, dtype=float)
+    keys = list(channels)
+    levels = [float(level) for level in levels]
+    intensity = _stack_series([channels[key] for key in keys], len(times))
+    valid = np.isfinite(intensity) & np.isfinite(times)
+
+    measured = first_crossing(times, intensity, levels)
+    fit = fit_time_vs_intensity(intensity, times, mask=times >= aging_time)
+    predicted = predict_time(fit, levels)
+    max_times = np.where(valid, times, -np.inf).max(axis=1, initial=-np.inf)
+
+    result = {}
+    for c, key in enumerate(keys):
+        result[key] = {}
+        for l, level in enumerate(levels):
+            if not valid[c].any():
+                result[key][level] = {"value": "-", "predicted": False, "ci": None}
+            elif np.isfinite(measured[c, l]):
+                result[key][level] = {"value": round(float(measured[c, l]), 2), "predicted": False, "ci": None}
+            else:
+                value = predicted["time"][c, l]
+                if fit["n"][c] < 2 or not np.isfinite(value) or value < 0 or value > max_times[c] * 10:
+                    result[key][level] = {"value": "-", "predicted": True, "ci": None}
+                    continue
+                ci = (predicted["ci_low"][c, l], predicted["ci_high"][c, l])
+                result[key][level] = {
+                    "value": round(float(value), 2),
+                    "predicted": True,
+                    "ci": tuple(round(float(v), 2) for v in ci) if np.isfinite(ci).all() else None,
+                }
+    return result
 
 
 def _predict_vdelta(times: np.ndarray, vdelta: np.ndarray, target_time: float) -> float | str:
@@ -1143,42 +1583,17 @@ def _predict_vdelta(times: np.ndarray, vdelta: np.ndarray, target_time: float) -
 
     
 def calculate_spectrum_averages(spectrum_storage: dict, selected_doe_labels: list[str]) -> dict:
-    """DOE별 J10 스펙트럼의 파장별 평균 계산"""
+    """DOE별 J10 평균 스펙트럼 (tv_generate_ivl_table의 DOE 집계에서 계산된 값) → 차트용 {wavelength, intensity}"""
     spectrum_averages = {}
     
     for label in selected_doe_labels:
-        if label not in spectrum_storage or not spectrum_storage[label]["J10"]:
-            continue
-            
-        # 해당 DOE의 모든 J10 스펙트럼 데이터
-        spectra_list = spectrum_storage[label]["J10"]
-        
-        if not spectra_list:
+        avg_intensities = (spectrum_storage.get(label) or {}).get("J10")
+        if not avg_intensities:
             continue
         
-        # 모든 스펙트럼을 380~780nm로 보간
-        interpolated_spectra = []
-        for spec_data in spectra_list:
-            if spec_data:
-                # 스펙트럼 데이터를 (wavelength, intensity) 튜플로 변환
-                spec_tuple = tuple(spec_data.items())
-                try:
-                    # 380~780nm로 보간
-                    intensity_interp = TVSpectrumAnalyzer.get_interpolated_spectrum_cubic(spec_tuple)
-                    interpolated_spectra.append(intensity_interp)
-                except Exception as e:
-                    logger.warning(f"스펙트럼 보간 실패 ({label}): {e}")
-                    continue
-        
-        if not interpolated_spectra:
-            continue
-        
-        # 파장별 평균 계산
-        avg_intensities = np.mean(interpolated_spectra, axis=0)
-        
         spectrum_averages[label] = {
             "wavelength": WL_INTERP.tolist(),  # 380~780nm
-            "intensity": avg_intensities.tolist()
+            "intensity": avg_intensities
         }
     
     return spectrum_averages
@@ -1195,38 +1610,55 @@ class TVSpectrumAnalyzer:
             [self.color_filter.get(f"{wl:.1f}", {}).get(ch, 0) for ch in ["r", "g", "b"]]
             for wl in range(380, 781)
         ])
+        # (401, 4×3) 가중치 행렬: R/G/B 필터 × XYZ + White(필터 없음) × XYZ
+        # 스펙트럼 행렬(N×401)과 한 번의 행렬곱으로 모든 채널의 XYZ 계산
+        cf_rgbw = np.hstack([self.cf_precomputed, np.ones((len(self.cf_precomputed), 1))])
+        self.xyz_weights = (cf_rgbw[:, :, None] * self.tri_precomputed[:, None, :]).reshape(len(cf_rgbw), -1)
+
+
+    @staticmethod
+    def get_interpolated_spectrum_cubic(spec_tuple: tuple[tuple[str, float], ...]) -> np.ndarray:
+        """단일 스펙트럼 cubic 보간 (읽기 전용 배열, 내용 hash 캐시)"""
+        return SPECTRUM_INTERPOLATOR.interpolate_one(spec_tuple)
 
-    
     @staticmethod
-    @lru_cache(maxsize=256)
-    def get_interpolated_spectrum_cubic(spec_tuple: tuple[tuple[str, float], ...]) -> np.ndarray
-        wl, intensity = zip(*spec_tuple)  # 키, 값 분리
-        wl = np.array(wl, dtype=float)
-        intensity = np.array(intensity)
-        interp_func = interp1d(wl, intensity, kind="cubic", fill_value="extrapolate")
-        intensity_interp = interp_func(WL_INTERP)
-        np.maximum(intensity_interp, 0, out=intensity_interp)  # in-place clip
-        return intensity_interp
+    def get_interpolated_spectra_batch(spectra: list[dict | tuple]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        여러 스펙트럼을 grid별로 묶어 일괄 cubic 보간
 
+        Returns:
+            (intensity_matrix, valid): (N×401) 행렬과 보간 성공 여부 bool 배열
+        """
+        return SPECTRUM_INTERPOLATOR.interpolate_many(spectra)
+
+
+    def calculate_rgb_xyz_columnar(self, intensity_list: list[np.ndarray] | np.ndarray) -> dict[str, np.ndarray]:
+        """
+        여러 스펙트럼의 R/G/B/W XYZ를 한 번에 계산 (컬럼 형태 반환)
+
+        Args:
+            intensity_list: 보간된 스펙트럼 리스트 또는 (N×401) 행렬
+
+        Returns:
+            {"R_X": array(N), "R_Y": array(N), ..., "W_Z": array(N)}
+        """
+        intensity_matrix = np.atleast_2d(np.asarray(intensity_list, dtype=float))
+        if intensity_matrix.size == 0:
+            return {f"{ch}_{a}": np.array([]) for ch in ["R", "G", "B", "W"] for a in ["X", "Y", "Z"]}
+
+        # (N×401) @ (401×12) → (N×12), trapz 대신 sum (1nm 간격 → dx=1)
+        xyz = intensity_matrix @ self.xyz_weights
+        keys = [f"{ch}_{a}" for ch in ["R", "G", "B", "W"] for a in ["X", "Y", "Z"]]
+        return {key: xyz[:, i] for i, key in enumerate(keys)}
 
     def calculate_rgb_xyz_batch(self, intensity_list: list[np.ndarray]) -> list[dict]:
-        results_list = []
-        tri = self.tri_precomputed
-        cf_rgb = self.cf_precomputed
-    
-        for intensity_interp in intensity_list:
-            result = {}
-            for i, ch in enumerate(["R", "G", "B"]):
-                values = cf_rgb[:, i][:, None] * tri * intensity_interp[:, None]
-                X, Y, Z = np.sum(values, axis=0)  # trapz 대신 sum (1nm 간격 → dx=1)
-                result[f"{ch}_X"], result[f"{ch}_Y"], result[f"{ch}_Z"] = X, Y, Z
-            # White
-            values = tri * intensity_interp[:, None]
-            X, Y, Z = np.sum(values, axis=0)
-            result.update({f"W_{a}": v for a, v in zip(["X", "Y", "Z"], (X, Y, Z))})
-            results_list.append(result)
-    
-        return results_list
+        """스펙트럼별 dict 리스트 반환 (calculate_rgb_xyz_columnar 기반)"""
+        columns = self.calculate_rgb_xyz_columnar(intensity_list)
+        if len(columns["W_X"]) == 0:
+            return []
+        keys = list(columns.keys())
+        rows = np.column_stack([columns[key] for key in keys])
+        return [dict(zip(keys, row.tolist())) for row in rows]
 
     def calculate_efficiency_coordinates(self, rgb_xyz: dict, current_density: float = 10.0) -> dict[str, float]:
         """효율 및 색좌표 계산"""
@@ -1244,7 +1676,9 @@ class TVSpectrumAnalyzer:
         return result
 
       
-    def generate_color_table(self, does: list[models.Model], line_factor: models.Model, all_doe_labels: list[str] = None) -> tuple[dict, dict]:
+    def generate_color_table(self, does: list[models.Model], line_factor: models.Model, all_doe_labels: list[str] = None,
+                             ivl_groups: dict[int, dict[str, list[models.Model]]] = None) -> tuple[dict, dict]:
+        """ivl_groups: tv_partition_ivls 결과 (없으면 does에서 생성)"""
         # 새로운 헬퍼 함수를 사용해서 기본 테이블 구조 생성
         if all_doe_labels:
             doe_labels = all_doe_labels
@@ -1255,34 +1689,32 @@ class TVSpectrumAnalyzer:
         color_keys = ["R", "G", "B", "W"]
         output_metrics = [f"{ch}_{suffix}" for ch in color_keys for suffix in ["x", "y", "eff"]]
         factor_matrix = line_factor.as_matrix
+        if ivl_groups is None:
+            ivl_groups = tv_partition_ivls(does)
     
         for doe in does:
             label = f"DOE-{doe.id}"
-            j10_ivls = doe.ivl_set.filter(is_J10=True)
-            if not j10_ivls.exists():
-				continue
+            j10_ivls = ivl_groups.get(doe.id, {}).get("J10", [])
+            if not j10_ivls:
+                continue
     
             result_dict = defaultdict(list)
-            expt_spec_list = []  # 모든 보간 데이터 저장
-            ivl_list = []        # ivl 매핑 (순서 유지용)
     
-            # 1) 먼저 모든 IVL의 스펙트럼을 보간해 모음
+            # 1) 저장된 보간 스펙트럼(expt_spec_interp)의 첫 행을 모음
+            intensity_rows = []
             for ivl in j10_ivls:
-                expt = ivl.expt
-                if not expt or len(expt) != 1:
+                if ivl.expt_len != 1:
                     continue
-                spec = ivl.expt_spec[0].get("0", {})
-                if not spec:
+                spec_matrix = tv_get_spec_matrix(ivl)
+                if len(spec_matrix) == 0 or not np.isfinite(spec_matrix[0]).all():
                     continue
-                expt_spec_list.append(tuple(spec.items()))
-                ivl_list.append(ivl)
+                intensity_rows.append(spec_matrix[0])
     
-            if not expt_spec_list:
+            if not intensity_rows:
                 continue
     
-            # 2) 보간 결과를 일괄 계산
-            intensity_list = [self.get_interpolated_spectrum_cubic(spec_tuple) for spec_tuple in expt_spec_list]
-            rgb_xyz_list = self.calculate_rgb_xyz_batch(intensity_list)
+            # 2) RGB/XYZ 일괄 계산
+            rgb_xyz_list = self.calculate_rgb_xyz_batch(np.vstack(intensity_rows))
     
             # 3) 좌표계산 + 라인팩터 적용
             for rgb_xyz in rgb_xyz_list:
@@ -1301,7 +1733,7 @@ class TVSpectrumAnalyzer:
                 table_data[metric][label] = get_formatted_avg(result_dict.get(metric, []), suffix)
     
         # Gamut 비율 + 그래프용 데이터
-        gamut_data, user_uv_all, color_space_uv = self._calculate_gamut_ratios(table_data, does)
+        gamut_data, user_uv_all, color_space_uv = self._calculate_gamut_ratios(table_data, does, ivl_groups)
         table_data.update(gamut_data)
     
         graph_data = {
@@ -1312,7 +1744,8 @@ class TVSpectrumAnalyzer:
         return table_data, graph_data
     
     
-    def _calculate_gamut_ratios(self, color_table: dict, does: list[models.Model]) -> tuple[dict, dict, dict]:
+    def _calculate_gamut_ratios(self, color_table: dict, does: list[models.Model],
+                                ivl_groups: dict[int, dict[str, list[models.Model]]]) -> tuple[dict, dict, dict]:
         # 새로운 헬퍼 함수를 사용해서 gamut 비율 테이블 구조 생성
         doe_labels = [f"DOE-{doe.id}" for doe in does]
         # ivl_color의 Main에서 gamut 관련 헤더만 필터링
@@ -1331,8 +1764,8 @@ class TVSpectrumAnalyzer:
     
         for doe in does:
             label = f"DOE-{doe.id}"
-            if not doe.ivl_set.filter(is_J10=True).exists():
-				continue
+            if not ivl_groups.get(doe.id, {}).get("J10"):
+                continue
             user_xy = [(color_table[f"{ch}_x"][label], color_table[f"{ch}_y"][label]) for ch in ["R", "G", "B"]]
             user_uv = [TVSpectrumAnalyzer.xy_to_uv(x, y) for x, y in user_xy]
             user_uv_all[label] = user_uv  # DOE별 좌표 저장
@@ -1356,123 +1789,77 @@ class TVSpectrumAnalyzer:
         return (4 * x / denom, 9 * y / denom) if denom != 0 else (0.0, 0.0)
 
 
-    @staticmethod
-    def _get_fwhm(sub_wl, sub_int, peak_val):
-        """FWHM 계산 (보조 메서드)"""
-        half_max = peak_val / 2
-        diffs = np.abs(sub_int - half_max)
-        try:
-            left_mask = sub_wl < sub_wl[np.argmax(sub_int)]
-            left_idx = np.argmin(diffs * left_mask + (~left_mask) * 1e6)
-            right_mask = sub_wl > sub_wl[np.argmax(sub_int)]
-            right_idx = np.argmin(diffs * right_mask + (~right_mask) * 1e6)
-            return round(sub_wl[right_idx] - sub_wl[left_idx], 1)
-        except Exception:
-            return "N/A"          
-            
     @staticmethod
     def analyze_spec(spec_data: dict) -> dict[str, float]:
-        """스펙트럼 peak, FWHM 계산"""
+        """스펙트럼 peak, FWHM, LBL 계산 (1nm grid 선형 보간 후 spectral_band_features)"""
         wl = sorted(float(k) for k in spec_data)
         intensity = [float(spec_data.get(str(w), 0.0)) for w in wl]
         interp = interp1d(wl, intensity, kind="linear", fill_value="extrapolate")
         intensity_interp = interp(WL_INTERP)
 
-        def get_peak_info(wl_range, name_prefix, WL_INTERP):
-            mask = (WL_INTERP >= wl_range[0]) & (WL_INTERP <= wl_range[1])
-            sub_wl, sub_int = WL_INTERP[mask], intensity_interp[mask]
-            if len(sub_wl) == 0:
-                return {f"{name_prefix} Peak": "N/A", f"{name_prefix} Peak WL": "N/A", f"{name_prefix} FWHM": "N/A"}
-            peak_val, peak_wl = np.max(sub_int), sub_wl[np.argmax(sub_int)]
-            fwhm = TVSpectrumAnalyzer._get_fwhm(sub_wl, sub_int, peak_val)
-            return {f"{name_prefix} Peak": round(peak_val, 3),
-                    f"{name_prefix} Peak WL": round(peak_wl, 1),
-                    f"{name_prefix} FWHM": round(fwhm, 1) if isinstance(fwhm, numbers.Number) else "N/A"}
-
+        features = spectral_band_features(intensity_interp[None, :])
         result = {}
-        result.update(get_peak_info((380, 500), "B"))
-        result.update(get_peak_info((504, 624), "YG"))
-        
-        # LBL 계산 추가
-	    mask_415_455 = (WL_INTERP >= 415) & (WL_INTERP <= 455)
-	    mask_400_500 = (WL_INTERP >= 400) & (WL_INTERP <= 500)
-	    
-	    sum_415_455 = np.sum(intensity_interp[mask_415_455])
-	    sum_400_500 = np.sum(intensity_interp[mask_400_500])
-	    
-	    if sum_400_500 > 0:
-	        lbl = round((sum_415_455 / sum_400_500) * 100, 1)
-	    else:
-	        lbl = "N/A"
-	    
-	    result["LBL"] = lbl
-	    
+        for key, values in features.items():
+            value = values[0]
+            digits = 3 if key.endswith("Peak") else 1
+            result[key] = round(float(value), digits) if np.isfinite(value) else "N/A"
         return result
             
-    def calculate_rgb_intensity(self, expt_spec_interp: list[np.ndarray]) -> dict[str, dict[str, np.ndarray]]:
+    def calculate_rgb_intensity(self, expt_spec_interp: list[np.ndarray] | np.ndarray) -> dict[str, dict[str, np.ndarray]]:
         """
-        Color 분석용 - 기존 함수 그대로 복원
+        Color 분석용 - 시점별 R/G/B XYZ (첫 시점 기준 %)
+        expt_spec_interp: 보간 스펙트럼 리스트 또는 (N×401) 행렬 (memmap 포함, 블록 단위로 읽음)
         """
-        tri = self.tri_precomputed
-        cf_rgb = self.cf_precomputed
-        rgb = {ch: {"X": [], "Y": [], "Z": []} for ch in ["R", "G", "B"]}
-    
-        for vals in expt_spec_interp:
-            for i, ch in enumerate(["R", "G", "B"]):
-                values = cf_rgb[:, i][:, None] * tri * vals[:, None]
-                X, Y, Z = np.sum(values, axis=0)
-                rgb[ch]["X"].append(X)
-                rgb[ch]["Y"].append(Y * 683)
-                rgb[ch]["Z"].append(Z)
-    
+        if len(expt_spec_interp) == 0:
+            return {ch: {a: np.array([]) for a in ["X", "Y", "Z"]} for ch in ["R", "G", "B"]}
+
+        # (N×401) @ (401×9) → R/G/B × XYZ
+        xyz = spec_row_dot(_as_spec_rows(expt_spec_interp), self.xyz_weights[:, :9])
+        xyz[:, 1::3] *= 683
+
         # Normalize
-        for ch in rgb:
-            for axis in ["X", "Y", "Z"]:
-                arr = np.array(rgb[ch][axis])
-                rgb[ch][axis] = arr / arr[0] * 100 if len(arr) and arr[0] != 0 else np.zeros_like(arr)
+        rgb = {}
+        for i, ch in enumerate(["R", "G", "B"]):
+            rgb[ch] = {}
+            for j, axis in enumerate(["X", "Y", "Z"]):
+                arr = xyz[:, i * 3 + j]
+                rgb[ch][axis] = arr / arr[0] * 100 if arr[0] != 0 else np.zeros_like(arr)
         return rgb
 
     # 2. LT 전용 새 함수 추가
-    def calculate_lt_time_series(self, expt_spec_interp: list[np.ndarray]) -> dict[str, np.ndarray]:
+    def calculate_lt_time_series(self, expt_spec_interp: list[np.ndarray] | np.ndarray) -> dict[str, np.ndarray]:
         """
         LT 분석 전용 - 시간별 RGB intensity 배열 반환
+        expt_spec_interp: 보간 스펙트럼 리스트 또는 (N×401) 행렬 (memmap 포함, 블록 단위로 읽음)
         """
-        tri = self.tri_precomputed
-        cf_rgb = self.cf_precomputed
-        
-        rgb_intensities = {"R": [], "G": [], "B": []}
+        if len(expt_spec_interp) == 0:
+            return {ch: np.array([]) for ch in ["R", "G", "B"]}
 
-        for vals in expt_spec_interp:
-            for i, ch in enumerate(["R", "G", "B"]):
-                # Color filter 적용 후 Y값(luminance) 계산
-                filtered_spectrum = cf_rgb[:, i] * vals
-                Y_value = np.sum(filtered_spectrum * tri[:, 1])  # Y component만
-                rgb_intensities[ch].append(Y_value * 683)  # cd/m2 단위
+        # Color filter 적용 후 Y값(luminance)만 계산, cd/m2 단위
+        lum = spec_row_dot(_as_spec_rows(expt_spec_interp), self.xyz_weights[:, 1:9:3]) * 683
 
         # 정규화 (첫 번째 값 기준으로 100%)
-        for ch in ["R", "G", "B"]:
-            arr = np.array(rgb_intensities[ch])
-            if len(arr) > 0 and arr[0] != 0:
-                rgb_intensities[ch] = arr / arr[0] * 100
-            else:
-                rgb_intensities[ch] = np.zeros_like(arr)
-        
+        rgb_intensities = {}
+        for i, ch in enumerate(["R", "G", "B"]):
+            arr = lum[:, i]
+            rgb_intensities[ch] = arr / arr[0] * 100 if arr[0] != 0 else np.zeros_like(arr)
         return rgb_intensities
     
     
-    def calculate_blue_peak(self, expt_spec_interp: list[np.ndarray]) -> np.ndarray:
-        if not expt_spec_interp:
-            return np.array([])
-    
-        # 첫 번째 스펙트럼에서 380~540nm 범위 peak index
-        sub_range = slice(0, 161)  # 380~540nm
-        first_vals = expt_spec_interp[0][sub_range]
-        peak_idx = np.argmax(first_vals)
-        target_idx = sub_range.start + peak_idx
-    
-        # 이후 스펙트럼에서 동일 인덱스 intensity 추출
-        peaks = [float(vals[target_idx]) for vals in expt_spec_interp]
-        return np.array(peaks)
+    def calculate_blue_peak(self, expt_spec_interp: list[np.ndarray] | np.ndarray) -> np.ndarray:
+        """시점별 blue peak intensity (peak 파장 이동을 따라감, track_blue_peak 참고)"""
+        return self.track_blue_peak(expt_spec_interp)["peak"]
+
+    @staticmethod
+    def track_blue_peak(expt_spec_interp: list[np.ndarray] | np.ndarray) -> dict[str, np.ndarray]:
+        """
+        LT 시점별 380~540nm blue peak 추적 (행렬 전체 일괄 계산, memmap은 블록 단위)
+        반환: {"peak": intensity, "peak_wl": 파장(nm, 포물선 보정), "fwhm": FWHM(nm)}
+        """
+        if len(expt_spec_interp) == 0:
+            return {"peak": np.array([]), "peak_wl": np.array([]), "fwhm": np.array([])}
+        peaks = band_peaks(_as_spec_rows(expt_spec_interp), LT_BLUE_PEAK_BAND)
+        return {key: peaks[key] for key in ["peak", "peak_wl", "fwhm"]}
         
     def calculate_rgbw_coordinates(self, spectrum: dict, line_factor: models.Model, 
                                    current_density: float = 10.0) -> dict:
@@ -1536,14 +1923,12 @@ class TVSpectrumAnalyzer:
         if not spectra_list:
             return []
         
-        # 1) 모든 스펙트럼 보간
-        spec_tuples = [tuple(s.items()) for s in spectra_list]
-        intensity_list = [
-            self.get_interpolated_spectrum_cubic(st) for st in spec_tuples
-        ]
+        # 1) 모든 스펙트럼 일괄 보간 (실패한 행은 0으로 채워 N/A 처리)
+        intensity_matrix, valid = self.get_interpolated_spectra_batch(spectra_list)
+        intensity_matrix[~valid] = 0.0
         
         # 2) RGB/XYZ 배치 계산
-        rgb_xyz_list = self.calculate_rgb_xyz_batch(intensity_list)
+        rgb_xyz_list = self.calculate_rgb_xyz_batch(intensity_matrix)
         
         # 3) Line Factor 적용
         factor_matrix = line_factor.as_matrix
@@ -1571,13 +1956,15 @@ class TVSpectrumAnalyzer:
 
     def generate_j100_wxy_chart_data(self, does: list[models.Model], 
                                      line_factor: models.Model,
-                                     all_doe_labels: list[str] = None) -> dict:
+                                     all_doe_labels: list[str] = None,
+                                     ivl_groups: dict[int, dict[str, list[models.Model]]] = None) -> dict:
         """J100 sweep 데이터의 W,R,G,B x,y를 J별로 계산 (인덱스 기반 평균)
         
         Args:
             does: DOE 모델 리스트
             line_factor: TVLineFactor 모델 인스턴스
             all_doe_labels: 전체 DOE 라벨 리스트 (선택)
+            ivl_groups: tv_partition_ivls 결과 (선택, 없으면 does에서 생성)
             
         Returns:
             {
@@ -1601,6 +1988,9 @@ class TVSpectrumAnalyzer:
         else:
             doe_labels_set = {f"DOE-{doe.id}" for doe in does}
         
+        if ivl_groups is None:
+            ivl_groups = tv_partition_ivls(does)
+
         result_data = {}
         
         for doe in does:
@@ -1608,15 +1998,14 @@ class TVSpectrumAnalyzer:
             if label not in doe_labels_set:
                 continue
             
-            # J100 데이터 필터링 (is_J10=False인 sweep 데이터)
-            j100_ivls = doe.ivl_set.filter(is_J10=False)
-            if not j100_ivls.exists():
+            # J100 데이터 (is_J10=False인 sweep 데이터)
+            j100_ivls = ivl_groups.get(doe.id, {}).get("J100", [])
+            if not j100_ivls:
                 continue
             
             # 가장 짧은 expt 길이 찾기 (모든 IVL을 동일 길이로 맞추기 위해)
             min_length = min(
-                len(ivl.expt) for ivl in j100_ivls 
-                if ivl.expt and len(ivl.expt) > 0
+                (ivl.expt_len for ivl in j100_ivls if ivl.expt_len > 0), default=0
             )
             
             if min_length == 0:
@@ -1632,15 +2021,14 @@ class TVSpectrumAnalyzer:
                 spectra_at_index = []
                 
                 for ivl in j100_ivls:
-                    if not ivl.expt or not ivl.expt_spec:
+                    if not ivl.expt_len or not ivl.expt_spec:
                         continue
                     
                     # expt에서 J 값 추출
-                    if index < len(ivl.expt):
-                        entry = ivl.expt[index]
-                        j_val = entry.get("J(mA/cm2)")
+                    if index < ivl.expt_len:
+                        j_val = ivl.expt_column("J(mA/cm2)")[index]
                         
-                        if j_val is None:
+                        if not np.isfinite(j_val):
                             continue
                         
                         j_at_index.append(float(j_val))
@@ -12,8 +12,12 @@ from pao.utils.pivot_table import (
     calculate_spectrum_averages,
     calculate_angle_spectrum_averages,
     TVSpectrumAnalyzer,
-    calculate_area_from_first_points,
-    recalculate_current_density
+    tv_process_j100_sweeps,
+    tv_get_spec_matrix,
+    _masked_column_mean,
+    _stack_series,
+    tv_partition_ivls,
+    WL_INTERP
 )
 from pao.models import TVColorFilter, TVLineFactor
 
@@ -196,58 +200,43 @@ class TVPlotlyProcessor:
         }
         
         
-def generate_jv_chart_data(does: list[models.Model], selected_doe_labels: list[str]) -> dict:
+def generate_jv_chart_data(does: list[models.Model], selected_doe_labels: list[str],
+                           ivl_groups: dict[int, dict[str, list[models.Model]]] = None) -> dict:
     """1. J-V 차트 데이터 생성 (J100 sweep 데이터, DOE별 평균)"""
     traces = []
     
     valid_ids = {int(label.split("-")[-1]) for label in selected_doe_labels}
     filtered_does = [doe for doe in does if doe.id in valid_ids]
+    if ivl_groups is None:
+        ivl_groups = tv_partition_ivls(filtered_does)
     
     for doe in filtered_does:
         label = f"DOE-{doe.id}"
-        j100_vals = doe.ivl_set.filter(is_J10=False)
-        if not j100_vals.exists():
+        j100_vals = ivl_groups.get(doe.id, {}).get("J100", [])
+        if not j100_vals:
             continue
             
-        all_expt_data = []
-        for ivl in j100_vals:
-            if ivl.expt:
-                # [변경] 앞쪽 3개 포인트로 면적 계산
-                area = calculate_area_from_first_points(ivl.expt, ivl.id)
-                if area is None:
-                    continue
-                
-                # [변경] 전류 기반으로 모든 포인트의 전류밀도 재계산
-                recalculated_expt = recalculate_current_density(ivl.expt, area)
-                all_expt_data.append(recalculated_expt)
+        # [변경] 앞쪽 3개 포인트 면적 기준으로 전류밀도 재계산 (IVL 테이블과 같은 캐시 사용)
+        sweeps = [sweep for sweep in tv_process_j100_sweeps(j100_vals) if sweep is not None]
+        j_series = [sweep["J(mA/cm2)"] for sweep in sweeps]
+        v_series = [sweep["V(volt)"] for sweep in sweeps]
                 
-        if not all_expt_data:
+        if not j_series:
             continue
         
-        # [변경] min_length → max_length로 변경
-        max_length = max(len(expt) for expt in all_expt_data)
+        # [변경] min_length → max_length로 변경 (짧은 sweep은 NaN padding)
+        max_length = max(len(j) for j in j_series)
+        j_matrix = _stack_series(j_series, max_length)
+        v_matrix = _stack_series(v_series, max_length)
         
-        j_values, v_values = [], []
+        # 인덱스별로 J, V가 모두 있는 sweep만 평균
+        paired = np.isfinite(j_matrix) & np.isfinite(v_matrix)
+        j_matrix[~paired] = np.nan
+        v_matrix[~paired] = np.nan
+        has_data = paired.any(axis=0)
         
-        for i in range(max_length):
-            j_at_index = []
-            v_at_index = []
-            
-            for expt in all_expt_data:
-                if i < len(expt):  # [변경] 인덱스 범위 체크 추가
-                    entry = expt[i]
-                    j = entry.get("J(mA/cm2)")
-                    v = entry.get("V(volt)")
-                    
-                    if j is not None and v is not None:
-                        j_at_index.append(float(j))
-                        v_at_index.append(float(v))
-                        
-            if j_at_index and v_at_index:
-                avg_j = sum(j_at_index) / len(j_at_index)
-                avg_v = sum(v_at_index) / len(v_at_index)
-                j_values.append(round(avg_j, 2))  # [변경] 소수점 둘째자리 반올림
-                v_values.append(avg_v)
+        j_values = np.round(_masked_column_mean(j_matrix)[has_data], 2).tolist()  # [변경] 소수점 둘째자리 반올림
+        v_values = _masked_column_mean(v_matrix)[has_data].tolist()
         
         if j_values and v_values:
             sorted_data = sorted(zip(v_values, j_values), key=lambda x: x[0])
@@ -264,57 +253,43 @@ def generate_jv_chart_data(does: list[models.Model], selected_doe_labels: list[s
 
 
 
-def generate_cj_chart_data(does: list[models.Model], selected_doe_labels: list[str]) -> dict:
+def generate_cj_chart_data(does: list[models.Model], selected_doe_labels: list[str],
+                           ivl_groups: dict[int, dict[str, list[models.Model]]] = None) -> dict:
     """2. cd/A-J 차트 데이터 생성 (인덱스 기반 평균)"""
     traces = []
     
     valid_ids = {int(label.split("-")[-1]) for label in selected_doe_labels}
     filtered_does = [doe for doe in does if doe.id in valid_ids]
+    if ivl_groups is None:
+        ivl_groups = tv_partition_ivls(filtered_does)
     
     for doe in filtered_does:
         label = f"DOE-{doe.id}"
-        j100_vals = doe.ivl_set.filter(is_J10=False)
-        if not j100_vals.exists():
+        j100_vals = ivl_groups.get(doe.id, {}).get("J100", [])
+        if not j100_vals:
             continue
         
         # DOE별 모든 expt 데이터 수집
-        all_expt_data = []
-        for ivl in j100_vals:
-            if ivl.expt:
-                all_expt_data.append(ivl.expt)
+        expt_ivls = [ivl for ivl in j100_vals if ivl.expt_len]
         
-        if not all_expt_data:
+        if not expt_ivls:
             continue
         
         # 가장 짧은 expt 길이 기준으로 통일
-        min_length = min(len(expt) for expt in all_expt_data)
+        min_length = min(ivl.expt_len for ivl in expt_ivls)
+        j_matrix = _stack_series([ivl.expt_column("J(mA/cm2)") for ivl in expt_ivls], min_length)
+        ce_matrix = _stack_series([ivl.expt_column("CE(cd/A)") for ivl in expt_ivls], min_length)
         
-        j_values, ce_values = [], []
+        # 인덱스별로 평균 계산 (J, CE가 모두 있는 sweep만)
+        paired = np.isfinite(j_matrix) & np.isfinite(ce_matrix)
+        j_matrix[~paired] = np.nan
+        ce_matrix[~paired] = np.nan
+        avg_j = _masked_column_mean(j_matrix)
+        avg_ce = _masked_column_mean(ce_matrix)
         
-        # 인덱스별로 평균 계산
-        for i in range(min_length):
-            j_at_index = []
-            ce_at_index = []
-            
-            for expt in all_expt_data:
-                entry = expt[i]
-                j = entry.get("J(mA/cm2)")
-                ce = entry.get("CE(cd/A)")
-                
-                if j is not None and ce is not None:
-                    j_at_index.append(float(j))
-                    ce_at_index.append(float(ce))
-            
-            # 해당 인덱스에서의 평균값 계산
-            if j_at_index and ce_at_index:
-                avg_j = sum(j_at_index) / len(j_at_index)
-                avg_ce = sum(ce_at_index) / len(ce_at_index)
-                
-                if avg_j == 0 and avg_ce == 0:
-                    continue
-                
-                j_values.append(avg_j)
-                ce_values.append(avg_ce)
+        keep = paired.any(axis=0) & ~((avg_j == 0) & (avg_ce == 0))
+        j_values = avg_j[keep].tolist()
+        ce_values = avg_ce[keep].tolist()
         
         if j_values and ce_values:
             traces.append({
@@ -353,7 +328,8 @@ def generate_spectrum_chart_data(spectrum_storage: dict, selected_doe_labels: li
 def generate_wxy_chart_data(does: list[models.Model], 
                             selected_doe_labels: list[str],
                             color_filter: dict,
-                            line_factor: models.Model) -> dict:
+                            line_factor: models.Model,
+                            ivl_groups: dict[int, dict[str, list[models.Model]]] = None) -> dict:
     """4. Wx,y-J 차트 데이터 생성 (J100 sweep, Color Filter/Line Factor 적용)
     
     Args:
@@ -361,6 +337,7 @@ def generate_wxy_chart_data(does: list[models.Model],
         selected_doe_labels: 선택된 DOE 라벨 리스트
         color_filter: TVColorFilter.rgb_data (딕셔너리)
         line_factor: TVLineFactor 모델 인스턴스
+        ivl_groups: tv_partition_ivls 결과 (선택)
         
     Returns:
         {"traces": [...]}  # W/R/G/B의 x/y 좌표 (총 8개 trace)
@@ -378,7 +355,8 @@ def generate_wxy_chart_data(does: list[models.Model],
     wxy_data = analyzer.generate_j100_wxy_chart_data(
         filtered_does, 
         line_factor, 
-        selected_doe_labels
+        selected_doe_labels,
+        ivl_groups
     )
     
     # 컬러별 trace 생성 (W, R, G, B 각각 x/y)
@@ -446,70 +424,34 @@ def generate_angular_spectrum_chart_data(angles: list[models.Model], filtered_do
         if label not in filtered_doe_labels:
             continue
         
-        # DOE 내 각도별 스펙트럼 강도값 수집 (파장별)
-        angle_intensity_collection = defaultdict(lambda: defaultdict(list))  # {각도: {파장: [강도값들]}}
-        common_wavelengths = None
+        # DOE 내 각도별 보간 스펙트럼(401) 수집
+        angle_intensity_collection = defaultdict(list)  # {각도: [보간 스펙트럼 행들]}
         
         for angle in angle_list:
             expt = angle.expt
-            expt_spec = angle.expt_spec
-            if not expt or not expt_spec:
+            if not expt:
                 continue
             
-            # 각 angle 데이터에서 각도별 스펙트럼 추출
-            for entry, spec in zip(expt, expt_spec):
+            # 각 angle 데이터에서 각도별 스펙트럼 추출 (expt_spec_interp 행)
+            for entry, row in zip(expt, tv_get_spec_matrix(angle)):
                 try:
                     filename = entry.get("filename", "")
                     degree = int(filename.split("(")[-1].replace(")", ""))
-                    
-                    # 스펙트럼 데이터 추출
-                    spectrum_dict = None
-                    if isinstance(spec, dict):
-                        # {"0": {"380.0": 0.001, ...}} 형태
-                        first_key = next(iter(spec.keys()))
-                        spectrum_dict = spec[first_key]
-                    
-                    if spectrum_dict and isinstance(spectrum_dict, dict):
-                        # 첫 번째 스펙트럼에서 파장 리스트 가져오기 (한 번만)
-                        if common_wavelengths is None:
-                            common_wavelengths = sorted([float(wl) for wl in spectrum_dict.keys() 
-                                                       if str(wl).replace(".", "").isdigit()], key=float)
-                        
-                        # 각 파장별 강도값 수집
-                        for wl in common_wavelengths:
-                            wl_str = str(wl)
-                            if wl_str in spectrum_dict:
-                                try:
-                                    intensity = float(spectrum_dict[wl_str])
-                                    angle_intensity_collection[degree][wl].append(intensity)
-                                except (ValueError, TypeError):
-                                    continue
-                        
                 except (ValueError, KeyError):
                     continue
+                if np.isfinite(row).all():
+                    angle_intensity_collection[degree].append(row)
         
         # 각도별 평균 스펙트럼 계산 및 trace 생성
         for degree in sorted(angle_intensity_collection.keys()):
-            intensity_by_wl = angle_intensity_collection[degree]
-            
-            # 파장별 평균 강도 계산
-            avg_intensities = []
-            for wl in common_wavelengths:
-                intensity_list = intensity_by_wl.get(wl, [])
-                if intensity_list:
-                    avg_intensity = sum(intensity_list) / len(intensity_list)
-                    avg_intensities.append(avg_intensity)
-                else:
-                    avg_intensities.append(0)  # 데이터가 없으면 0
-            
-            if avg_intensities:
-                traces.append({
-                    "x": common_wavelengths,
-                    "y": avg_intensities,
-                    "name": f"{label}_{degree}°",
-                    "type": "scatter",
-                    "mode": "lines"
-                })
+            avg_intensities = np.mean(angle_intensity_collection[degree], axis=0)
+            traces.append({
+                "x": WL_INTERP.tolist(),
+                "y": avg_intensities.tolist(),
+                "name": f"{label}_{degree}°",
+                "type": "scatter",
+                "mode": "lines"
+            })
     
     return {"traces": traces}
 
@@ -562,6 +504,20 @@ def generate_lt_chart_data(lt_graph_data: dict, selected_doe_labels: list[str])
                     # ✅ "line": {"color": ...} 제거 → Plotly 자동 색상 적용
                     "visible": color_key == "white",  # White만 기본 표시
                 })
+
+        # 수명 모델 곡선 (tv_generate_lt_table(lt_models=...)), 범례에서 선택 시 표시
+        for model_name, curves in doe_data.get("models", {}).items():
+            for color_key, color_name in color_map.items():
+                if color_key in curves:
+                    traces.append({
+                        "x": time_values,
+                        "y": curves[color_key],
+                        "name": f"{label}_{color_name} ({model_name})",
+                        "type": "scatter",
+                        "mode": "lines",
+                        "line": {"dash": "dash"},
+                        "visible": "legendonly",
+                    })
     
     return {"traces": traces}
 
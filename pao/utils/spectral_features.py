@@ -0,0 +1,73 @@
+import numbers
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from pao.models import IVLSpectralFeature
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def first_spectrum(expt_spec: list[dict] | None) -> dict:
+    """expt_spec[0]["0"] (IVL 테이블 / 스펙트럼 차트가 쓰는 첫 번째 스펙트럼), 없으면 {}"""
+    if not expt_spec:
+        return {}
+    return expt_spec[0].get("0", {}) or {}
+
+
+def compute_spectral_features(expt_spec: list[dict] | None) -> dict | None:
+    """첫 번째 스펙트럼의 peak / FWHM / LBL → {field: 값 | None}, 스펙트럼이 없으면 None"""
+    from pao.utils.pivot_table import TVSpectrumAnalyzer
+
+    spec = first_spectrum(expt_spec)
+    if not spec:
+        return None
+    analysis = TVSpectrumAnalyzer.analyze_spec(spec)
+    return {
+        field: float(analysis[key]) if isinstance(analysis.get(key), numbers.Number) else None
+        for key, field in IVLSpectralFeature.FIELD_MAP.items()
+    }
+
+
+def ivl_spec_analysis(ivl) -> dict | None:
+    """
+    IVL의 analyze_spec 결과 ({"B Peak": 값, ...})
+    저장된 IVLSpectralFeature를 우선 사용 (prefetch_related("ivl_set__spectral_feature") 권장),
+    없으면 스펙트럼에서 직접 계산. 스펙트럼이 없으면 None
+    """
+    try:
+        return ivl.spectral_feature.as_spec_analysis()
+    except ObjectDoesNotExist:
+        pass
+
+    from pao.utils.pivot_table import TVSpectrumAnalyzer
+
+    spec = first_spectrum(ivl.expt_spec)
+    return TVSpectrumAnalyzer.analyze_spec(spec) if spec else None
+
+
+def save_spectral_features(ivls: list, features: list[dict | None] = None) -> int:
+    """
+    IVL들의 IVLSpectralFeature를 일괄 저장 (기존 값 교체), 스펙트럼이 없는 IVL은 삭제만
+    features: compute_spectral_features 결과 (ivls 순서, 없으면 여기서 계산)
+    반환: 저장 건수
+    """
+    if features is None:
+        features = []
+        for ivl in ivls:
+            try:
+                features.append(compute_spectral_features(ivl.expt_spec))
+            except Exception as e:
+                logger.warning(f"IVL({ivl.pk}) 스펙트럼 특성 계산 실패: {e}")
+                features.append(None)
+
+    rows = [
+        IVLSpectralFeature(ivl_id=ivl.pk, **feature)
+        for ivl, feature in zip(ivls, features)
+        if ivl.pk is not None and feature is not None
+    ]
+    with transaction.atomic():
+        IVLSpectralFeature.objects.filter(ivl_id__in=[ivl.pk for ivl in ivls if ivl.pk is not None]).delete()
+        IVLSpectralFeature.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
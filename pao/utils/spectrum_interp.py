@@ -0,0 +1,220 @@
+import hashlib
+import io
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+
+import numpy as np
+from scipy.interpolate import make_interp_spline
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def spectrum_to_arrays(spectrum: dict | tuple) -> tuple[np.ndarray, np.ndarray]:
+    """
+    {"380.0": 0.1, ...} 또는 (("380.0", 0.1), ...) 형태의 스펙트럼을
+    파장 오름차순으로 정렬된 (wavelength, intensity) float 배열로 변환
+    """
+    items = spectrum.items() if isinstance(spectrum, dict) else spectrum
+    wl, intensity = zip(*items)  # 키, 값 분리
+    wl = np.asarray(wl, dtype=float)
+    intensity = np.asarray(intensity, dtype=float)
+    order = np.argsort(wl, kind="stable")
+    return wl[order], intensity[order]
+
+
+def content_key(*arrays: np.ndarray) -> bytes:
+    """배열 내용 기반 캐시 키 (blake2b 16byte digest)"""
+    h = hashlib.blake2b(digest_size=16)
+    for arr in arrays:
+        h.update(np.ascontiguousarray(arr).tobytes())
+        h.update(b"|")
+    return h.digest()
+
+
+@lru_cache(maxsize=64)
+def _cubic_basis(grid_bytes: bytes, target_bytes: bytes) -> np.ndarray:
+    """
+    source grid → target grid cubic spline 보간 행렬 (len(target) × len(grid))
+    interp1d(kind="cubic", fill_value="extrapolate")와 동일한 not-a-knot spline의
+    선형 연산자를 단위행렬 보간으로 한 번만 구해둔다.
+    """
+    grid = np.frombuffer(grid_bytes, dtype=float)
+    target = np.frombuffer(target_bytes, dtype=float)
+    basis = make_interp_spline(grid, np.eye(len(grid)), k=3)(target)
+    basis.flags.writeable = False
+    return basis
+
+
+class CubicBatchInterpolator:
+    """
+    여러 스펙트럼을 target 파장 grid로 일괄 cubic 보간
+
+    - 동일한 source grid(대부분 380~780nm, 4nm)를 가진 스펙트럼끼리 묶어
+      (N×M) intensity 행렬 @ (M×401) basis 한 번으로 보간
+    - basis는 grid 내용 기준으로 캐시
+    - 중복 파장 / 포인트 부족 등 cubic spline을 만들 수 없는 grid는 선형 보간으로 fallback
+    """
+
+    def __init__(self, target: np.ndarray, cache_size: int = 256):
+        self.target = np.ascontiguousarray(target, dtype=float)
+        self._target_bytes = self.target.tobytes()
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+
+    @staticmethod
+    def _is_regular(wl: np.ndarray) -> bool:
+        return len(wl) >= 4 and np.all(np.isfinite(wl)) and np.all(np.diff(wl) > 0)
+
+    def _fallback(self, wl: np.ndarray, intensity: np.ndarray) -> np.ndarray:
+        """cubic 불가 grid: 중복 파장 평균 후 선형 보간"""
+        finite = np.isfinite(wl) & np.isfinite(intensity)
+        wl, intensity = wl[finite], intensity[finite]
+        if len(wl) == 0:
+            raise ValueError("유효한 스펙트럼 포인트가 없습니다.")
+        uniq_wl, inverse = np.unique(wl, return_inverse=True)
+        uniq_int = np.bincount(inverse, weights=intensity) / np.bincount(inverse)
+        return np.interp(self.target, uniq_wl, uniq_int)
+
+    def interpolate_arrays(self, wl: np.ndarray, intensity_matrix: np.ndarray) -> np.ndarray:
+        """
+        단일 grid의 (N×M) intensity 행렬을 (N×len(target))로 보간 (음수는 0으로 clip)
+        """
+        intensity_matrix = np.atleast_2d(np.asarray(intensity_matrix, dtype=float))
+        if self._is_regular(wl):
+            basis = _cubic_basis(np.ascontiguousarray(wl, dtype=float).tobytes(), self._target_bytes)
+            result = intensity_matrix @ basis.T
+        else:
+            result = np.vstack([self._fallback(wl, row) for row in intensity_matrix])
+        np.maximum(result, 0, out=result)  # in-place clip
+        return result
+
+    def interpolate_one(self, spectrum: dict | tuple) -> np.ndarray:
+        """단일 스펙트럼 보간 (내용 hash 기반 LRU 캐시)"""
+        wl, intensity = spectrum_to_arrays(spectrum)
+        key = content_key(wl, intensity)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        result = self.interpolate_arrays(wl, intensity)[0]
+        result.flags.writeable = False
+        self._cache[key] = result
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def interpolate_many(self, spectra: list[dict | tuple]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        여러 스펙트럼을 grid별로 묶어 일괄 보간
+
+        Returns:
+            (matrix, valid): (N×len(target)) 행렬과 보간 성공 여부 bool 배열
+            보간에 실패한 행은 NaN으로 채움
+        """
+        n = len(spectra)
+        matrix = np.full((n, len(self.target)), np.nan)
+        valid = np.zeros(n, dtype=bool)
+
+        groups = defaultdict(list)  # grid bytes → [(index, intensity), ...]
+        for i, spectrum in enumerate(spectra):
+            if not spectrum:
+                continue
+            try:
+                wl, intensity = spectrum_to_arrays(spectrum)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"인덱스 {i} 스펙트럼 파싱 실패: {e}")
+                continue
+            groups[wl.tobytes()].append((i, intensity))
+
+        for grid_bytes, members in groups.items():
+            wl = np.frombuffer(grid_bytes, dtype=float)
+            indices = [i for i, _ in members]
+            try:
+                rows = self.interpolate_arrays(wl, np.vstack([row for _, row in members]))
+                matrix[indices] = rows
+                valid[indices] = np.isfinite(rows).all(axis=1)
+            except Exception as e:
+                logger.warning(f"스펙트럼 일괄 보간 실패 (grid {len(wl)}pts, {len(indices)}개): {e}")
+
+        return matrix, valid
+
+
+# ----- 보간 스펙트럼 저장용 (IVL / LT / Angle.expt_spec_interp) -----
+
+WL_GRID = np.arange(380.0, 781.0, 1.0)  # 380~780nm, 1nm 간격 (401 points)
+SPECTRUM_INTERPOLATOR = CubicBatchInterpolator(WL_GRID)  # grid별 basis / 결과 캐시 공유
+SPEC_MATRIX_DTYPE = np.float32
+
+
+def build_spec_matrix(expt_spec: list[dict]) -> np.ndarray:
+    """
+    expt_spec = [{"0": {"380.0": ..., ...}}, {"1": {...}}, ...] → (N×401) float32 행렬
+    i번째 행은 expt_spec[i]의 첫 번째 스펙트럼, 보간 실패 행은 NaN
+    """
+    first_specs = [next(iter(spec.values()), None) if isinstance(spec, dict) else None for spec in expt_spec or []]
+    matrix, _ = SPECTRUM_INTERPOLATOR.interpolate_many(first_specs)
+    return matrix.astype(SPEC_MATRIX_DTYPE)
+
+
+def encode_spec_matrix(matrix: np.ndarray) -> bytes:
+    """(N×401) 행렬 → BinaryField 저장용 bytes (float32, C-order)"""
+    return np.ascontiguousarray(matrix, dtype=SPEC_MATRIX_DTYPE).tobytes()
+
+
+def decode_spec_matrix(buffer: bytes | memoryview | None) -> np.ndarray | None:
+    """
+    BinaryField bytes → (N×401) float32 행렬 (복사 없이 buffer를 그대로 참조하는 읽기 전용 view)
+    저장값이 없거나 크기가 맞지 않으면 None
+    """
+    if buffer is None:
+        return None
+    matrix = np.frombuffer(buffer, dtype=SPEC_MATRIX_DTYPE)
+    if matrix.size == 0 or matrix.size % len(WL_GRID):
+        return None
+    return matrix.reshape(-1, len(WL_GRID))
+
+
+# ----- LT 장기 수명 데이터용 memory-mapped 저장 (LT.spec_file) -----
+
+SPEC_BLOCK_ROWS = 2048  # memmap 행렬 블록 연산 단위 (2048×401 float32 ≈ 3.2MB)
+
+
+def encode_spec_npy(matrix: np.ndarray) -> bytes:
+    """(N×401) 행렬 → .npy 파일 bytes (float32, C-order, np.load(mmap_mode="r")로 열 수 있음)"""
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(matrix, dtype=SPEC_MATRIX_DTYPE), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def open_spec_memmap(path: str) -> np.ndarray | None:
+    """
+    .npy 파일을 (N×401) 읽기 전용 memmap으로 열기 (행렬 전체를 메모리에 올리지 않음)
+    파일이 없거나 형식이 맞지 않으면 None
+    """
+    try:
+        matrix = np.load(path, mmap_mode="r", allow_pickle=False)
+    except (OSError, ValueError) as e:
+        logger.warning(f"스펙트럼 memmap 열기 실패 ({path}): {e}")
+        return None
+    if matrix.ndim != 2 or matrix.shape[1] != len(WL_GRID) or matrix.shape[0] == 0:
+        return None
+    return matrix
+
+
+def spec_row_dot(matrix: np.ndarray, weights: np.ndarray, block_rows: int = SPEC_BLOCK_ROWS) -> np.ndarray:
+    """
+    (N×401) 스펙트럼 행렬 @ (401×K) 가중치 → (N×K) float 행렬
+
+    memmap 행렬도 블록 단위로 읽어 계산하므로 float64 전체 사본을 만들지 않음
+    NaN 행(보간 실패)은 결과도 NaN
+    """
+    weights = np.asarray(weights, dtype=float)
+    n = len(matrix)
+    result = np.empty((n, weights.shape[1]))
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        result[start:stop] = np.asarray(matrix[start:stop], dtype=float) @ weights
+    return result
@@ -0,0 +1,119 @@
+import numpy as np
+
+from pao.utils.spectrum_interp import SPEC_BLOCK_ROWS, WL_GRID, spec_row_dot
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# IVL 스펙트럼 분석 band (nm) → "B Peak", "B Peak WL", "B FWHM", ...
+SPECTRAL_BANDS = {
+    "B": (380.0, 500.0),
+    "YG": (504.0, 624.0),
+}
+LT_BLUE_PEAK_BAND = (380.0, 540.0)  # LT blue peak 추적 범위
+LBL_BANDS = ((415.0, 455.0), (400.0, 500.0))  # LBL = 415~455nm 적분 / 400~500nm 적분 × 100
+
+
+def band_peaks(matrix: np.ndarray, band: tuple[float, float], wl: np.ndarray = WL_GRID,
+               block_rows: int = SPEC_BLOCK_ROWS) -> dict[str, np.ndarray]:
+    """
+    (N×len(wl)) 스펙트럼 행렬의 band 구간 peak / FWHM을 행 단위로 일괄 계산
+
+    - peak, peak_wl: 최대값 주변 3점 포물선 보정 (grid 간격보다 세밀한 peak 파장)
+    - left_wl, right_wl: peak 양쪽에서 처음으로 half max 아래로 내려가는 지점을 선형 보간
+    - fwhm = right_wl - left_wl (band 안에서 half max에 도달하지 않으면 NaN)
+    NaN이 포함된 행(보간 실패)은 모든 값이 NaN, memmap 행렬은 블록 단위로 읽음
+    """
+    mask = (wl >= band[0]) & (wl <= band[1])
+    keys = ["peak", "peak_wl", "left_wl", "right_wl", "fwhm"]
+    n = len(matrix)
+    result = {key: np.full(n, np.nan) for key in keys}
+    if not mask.any():
+        return result
+
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        block = _band_peaks_block(np.asarray(matrix[start:stop], dtype=float)[:, mask], wl[mask])
+        for key in keys:
+            result[key][start:stop] = block[key]
+    return result
+
+
+def _band_peaks_block(sub: np.ndarray, wl: np.ndarray) -> dict[str, np.ndarray]:
+    n, m = sub.shape
+    valid = np.isfinite(sub).all(axis=1)
+    sub = np.where(valid[:, None], sub, 0.0)
+    rows = np.arange(n)
+
+    # 1) peak index + 포물선 보정 (양 끝점은 보정하지 않음)
+    idx = np.argmax(sub, axis=1)
+    y0 = sub[rows, np.clip(idx - 1, 0, m - 1)]
+    y1 = sub[rows, idx]
+    y2 = sub[rows, np.clip(idx + 1, 0, m - 1)]
+    curvature = y0 - 2 * y1 + y2
+    inner = (idx > 0) & (idx < m - 1) & (curvature < 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = np.where(inner, 0.5 * (y0 - y2) / curvature, 0.0)
+    delta = np.clip(delta, -0.5, 0.5)
+    step = wl[1] - wl[0] if m > 1 else 0.0
+    peak_wl = wl[idx] + delta * step
+    peak = y1 - 0.25 * (y0 - y2) * delta
+
+    # 2) half max 교차 지점: peak 왼쪽 / 오른쪽에서 가장 가까운 half max 미만 포인트
+    half = peak / 2
+    cols = np.arange(m)
+    below = sub < half[:, None]
+    left = np.where(below & (cols < idx[:, None]), cols, -1).max(axis=1)
+    right = np.where(below & (cols > idx[:, None]), cols, m).min(axis=1)
+    left_wl = _half_max_crossing(sub, wl, half, left, left + 1)
+    right_wl = _half_max_crossing(sub, wl, half, right - 1, right)
+    left_wl[left < 0] = np.nan
+    right_wl[right >= m] = np.nan
+
+    result = {
+        "peak": peak,
+        "peak_wl": peak_wl,
+        "left_wl": left_wl,
+        "right_wl": right_wl,
+        "fwhm": right_wl - left_wl,
+    }
+    for values in result.values():
+        values[~valid] = np.nan
+    return result
+
+
+def _half_max_crossing(sub: np.ndarray, wl: np.ndarray, half: np.ndarray,
+                       lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """sub[lo] ~ sub[hi] 구간에서 half를 지나는 파장 (행별 선형 보간)"""
+    m = sub.shape[1]
+    rows = np.arange(len(sub))
+    lo, hi = np.clip(lo, 0, m - 1), np.clip(hi, 0, m - 1)
+    y_lo, y_hi = sub[rows, lo], sub[rows, hi]
+    dy = y_hi - y_lo
+    t = np.divide(half - y_lo, dy, out=np.zeros(len(sub)), where=dy != 0)
+    return wl[lo] + t * (wl[hi] - wl[lo])
+
+
+def lbl_ratio(matrix: np.ndarray, wl: np.ndarray = WL_GRID) -> np.ndarray:
+    """행별 LBL(%) = 415~455nm 합 / 400~500nm 합 × 100 (분모가 0 이하이면 NaN)"""
+    weights = np.column_stack([((wl >= lo) & (wl <= hi)).astype(float) for lo, hi in LBL_BANDS])
+    sums = spec_row_dot(matrix, weights)
+    return np.divide(sums[:, 0] * 100, sums[:, 1], out=np.full(len(sums), np.nan), where=sums[:, 1] > 0)
+
+
+def spectral_band_features(matrix: np.ndarray, bands: dict[str, tuple[float, float]] = SPECTRAL_BANDS,
+                           wl: np.ndarray = WL_GRID) -> dict[str, np.ndarray]:
+    """
+    band별 peak / peak 파장 / FWHM + LBL을 행 단위 배열로 반환
+    {"B Peak": array(N), "B Peak WL": ..., "B FWHM": ..., "YG Peak": ..., ..., "LBL": array(N)}
+    """
+    result = {}
+    for name, band in bands.items():
+        peaks = band_peaks(matrix, band, wl)
+        result[f"{name} Peak"] = peaks["peak"]
+        result[f"{name} Peak WL"] = peaks["peak_wl"]
+        result[f"{name} FWHM"] = peaks["fwhm"]
+    result["LBL"] = lbl_ratio(matrix, wl)
+    return result
@@ -0,0 +1,244 @@
+import os
+import shutil
+import uuid
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from ipware import get_client_ip
+from pao.models import UploadJob
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+UPLOAD_STAGING_DIR = os.path.join(settings.MEDIA_ROOT, "pao", "upload_staging")
+# 파싱 프로세스 / 작업 스레드 수 (settings.PAO_UPLOAD_WORKERS로 늘림, 기본 1)
+UPLOAD_WORKERS = getattr(settings, "PAO_UPLOAD_WORKERS", None) or 1
+
+_parse_pool = None    # 파일 파싱 (pandas, CPU 작업) - UPLOAD_WORKERS개 프로세스
+_job_pool = None      # 작업 진행 / DB 저장 - 파싱 결과를 기다리는 스레드
+
+
+def _init_parse_worker() -> None:
+    """spawn된 파싱 프로세스에서 Django 앱 로딩 (parse 함수가 pao 모듈을 import)"""
+    django.setup()
+
+
+def _get_pools() -> tuple[ProcessPoolExecutor, ThreadPoolExecutor]:
+    global _parse_pool, _job_pool
+    if _parse_pool is None:
+        # 스레드가 있는 웹 프로세스를 fork하지 않도록 spawn 사용
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=UPLOAD_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_parse_worker,
+        )
+        _job_pool = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="pao-upload")
+    return _parse_pool, _job_pool
+
+
+def _func_path(func) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def stage_upload_file(file) -> str:
+    """업로드 파일을 staging 디렉토리(작업별 하위 폴더)에 저장하고 경로 반환"""
+    job_dir = os.path.join(UPLOAD_STAGING_DIR, uuid.uuid4().hex)
+    os.makedirs(job_dir, exist_ok=True)
+    path = os.path.join(job_dir, os.path.basename(file.name))
+    with open(path, "wb") as fh:
+        for chunk in file.chunks():
+            fh.write(chunk)
+    return path
+
+
+def enqueue_upload_jobs(request, files: list, model_name: str, parse_func, assign_func,
+                        exp_date: str, product_type: str, bulk_assign_func=None) -> list[UploadJob]:
+    """
+    파일을 staging 후 파일별 UploadJob을 만들고 worker pool에 등록
+    parse_func(file, product_type) → DataFrame, assign_func(df, exp_date, product_type) → (instance, response)
+    bulk_assign_func(dfs, exp_date, product_type, created_user_id, ip) → [response, ...]가 있으면
+    전체 파일을 한 작업으로 묶어 파싱 후 일괄 등록 (run_upload_batch, 같은 batch_id)
+    worker 등록은 UploadJob 저장 transaction commit 이후 (worker가 아직 없는 작업을 조회하지 않도록)
+    """
+    ip = get_client_ip(request)[0]
+    batch_id = uuid.uuid4() if bulk_assign_func is not None else None
+    jobs = []
+    for file in files:
+        jobs.append(UploadJob(
+            model_name=model_name,
+            filename=os.path.basename(file.name),
+            staged_path=stage_upload_file(file),
+            parse_func=_func_path(parse_func),
+            assign_func=_func_path(bulk_assign_func or assign_func),
+            exp_date=exp_date or "",
+            product_type=product_type or "",
+            batch_id=batch_id,
+            created_user=request.user,
+            ip=ip,
+        ))
+    UploadJob.objects.bulk_create(jobs)
+    task_ids = [job.task_id for job in jobs]
+    transaction.on_commit(lambda: submit_upload_jobs(task_ids, batch=batch_id is not None))
+    return jobs
+
+
+def submit_upload_jobs(task_ids: list[uuid.UUID], batch: bool = False) -> None:
+    """작업 스레드 pool에 등록 (batch면 run_upload_batch 1건, 아니면 파일별 run_upload_job)"""
+    _, job_pool = _get_pools()
+    if batch:
+        job_pool.submit(run_upload_batch, task_ids)
+    else:
+        for task_id in task_ids:
+            job_pool.submit(run_upload_job, task_id)
+
+
+def _parse_staged_file(parse_func: str, path: str, filename: str, product_type: str):
+    """파싱 프로세스에서 실행: staging 파일 → DataFrame (DB 접근 없음)"""
+    with open(path, "rb") as fh:
+        return import_string(parse_func)(File(fh, name=filename), product_type)
+
+
+def run_upload_job(task_id: uuid.UUID) -> None:
+    """UploadJob 1건 처리: 파싱(프로세스 pool) → assign / 저장(현재 스레드) → 상태 기록"""
+    close_old_connections()
+    # PENDING인 작업만 STARTED로 가져옴 (requeue_stale_upload_jobs 재실행과 중복 방지)
+    if not UploadJob.objects.filter(task_id=task_id, status=UploadJob.StatusChoices.PENDING).update(
+        status=UploadJob.StatusChoices.STARTED, updated_at=timezone.now()
+    ):
+        close_old_connections()
+        return
+    job = UploadJob.objects.get(task_id=task_id)
+
+    try:
+        parse_pool, _ = _get_pools()
+        df = parse_pool.submit(
+            _parse_staged_file, job.parse_func, job.staged_path, job.filename, job.product_type
+        ).result()
+
+        instance, response = import_string(job.assign_func)(df, job.exp_date, job.product_type)
+        if instance is not None:
+            instance.created_user_id = job.created_user_id
+            instance.ip = job.ip
+            instance.save()
+
+        if response.get("status") == "success":
+            job.status = UploadJob.StatusChoices.SUCCESS
+        else:
+            job.status = UploadJob.StatusChoices.FAILURE
+        job.message = response.get("message", "")
+    except Exception as e:
+        logger.error(f"업로드 작업 실패 ({job.model_name} {job.filename}): {e}", exc_info=True)
+        job.status = UploadJob.StatusChoices.FAILURE
+        job.message = str(e)
+    finally:
+        shutil.rmtree(os.path.dirname(job.staged_path), ignore_errors=True)
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "message", "finished_at", "updated_at"])
+        close_old_connections()
+
+
+def run_upload_batch(task_ids: list[uuid.UUID]) -> None:
+    """
+    같은 요청의 UploadJob 여러 건을 한 번에 처리
+    파싱은 프로세스 pool에서 병렬, 등록은 bulk assign 1회 (파일 수와 무관하게 쿼리 수 일정)
+    pool 등록을 포함한 전체를 try로 감싸 어떤 오류에도 작업이 STARTED로 남지 않음
+    """
+    close_old_connections()
+    jobs = []
+    try:
+        jobs = list(UploadJob.objects.filter(task_id__in=task_ids, status=UploadJob.StatusChoices.PENDING))
+        if not jobs:
+            return
+        UploadJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=UploadJob.StatusChoices.STARTED, updated_at=timezone.now()
+        )
+
+        parse_pool, _ = _get_pools()
+        futures = [
+            parse_pool.submit(_parse_staged_file, job.parse_func, job.staged_path, job.filename, job.product_type)
+            for job in jobs
+        ]
+
+        parsed_jobs, dfs = [], []
+        for job, future in zip(jobs, futures):
+            try:
+                dfs.append(future.result())
+                parsed_jobs.append(job)
+            except Exception as e:
+                logger.error(f"업로드 파일 파싱 실패 ({job.model_name} {job.filename}): {e}", exc_info=True)
+                job.status = UploadJob.StatusChoices.FAILURE
+                job.message = str(e)
+
+        if parsed_jobs:
+            first = parsed_jobs[0]
+            responses = import_string(first.assign_func)(
+                dfs, first.exp_date, first.product_type, first.created_user_id, first.ip
+            )
+            for job, response in zip(parsed_jobs, responses):
+                success = response.get("status") == "success"
+                job.status = UploadJob.StatusChoices.SUCCESS if success else UploadJob.StatusChoices.FAILURE
+                job.message = response.get("message", "")
+    except Exception as e:
+        logger.error(f"일괄 업로드 실패 ({len(jobs)}건): {e}", exc_info=True)
+        for job in jobs:
+            if job.status != UploadJob.StatusChoices.FAILURE:
+                job.status = UploadJob.StatusChoices.FAILURE
+                job.message = str(e)
+    finally:
+        finished_at = timezone.now()
+        for job in jobs:
+            shutil.rmtree(os.path.dirname(job.staged_path), ignore_errors=True)
+            job.finished_at = finished_at
+            if job.status == UploadJob.StatusChoices.PENDING:
+                job.status = UploadJob.StatusChoices.FAILURE
+        if jobs:
+            UploadJob.objects.bulk_update(jobs, ["status", "message", "finished_at"])
+        close_old_connections()
+
+
+def requeue_stale_upload_jobs(stale_before) -> int:
+    """
+    worker가 끝내지 못한 작업(서버 재시작 등)을 현재 프로세스에서 다시 실행
+    stale_before 이전부터 PENDING / STARTED인 작업 대상, staging 파일이 없으면 FAILURE 처리
+    batch_id가 같은 작업은 run_upload_batch로 함께 처리
+    """
+    jobs = list(UploadJob.objects.filter(
+        status__in=[UploadJob.StatusChoices.PENDING, UploadJob.StatusChoices.STARTED], updated_at__lt=stale_before
+    ).order_by("pk"))
+    missing = {job.pk for job in jobs if not os.path.exists(job.staged_path)}
+    if missing:
+        UploadJob.objects.filter(pk__in=missing).update(
+            status=UploadJob.StatusChoices.FAILURE, message="staging 파일 없음",
+            finished_at=timezone.now(), updated_at=timezone.now(),
+        )
+    jobs = [job for job in jobs if job.pk not in missing]
+    UploadJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+        status=UploadJob.StatusChoices.PENDING, updated_at=timezone.now()
+    )
+
+    batches = defaultdict(list)
+    for job in jobs:
+        if job.batch_id is None:
+            run_upload_job(job.task_id)
+        else:
+            batches[job.batch_id].append(job.task_id)
+    for task_ids in batches.values():
+        run_upload_batch(task_ids)
+    return len(jobs)
+
+
+def upload_job_status(job: UploadJob) -> dict:
+    """업로드 페이지 polling 응답 ({"status": ..., "info": {...}})"""
+    info = {"filename": job.filename, "message": job.message}
+    if job.status == UploadJob.StatusChoices.FAILURE:
+        info["error"] = job.message or "실패"
+    return {"task_id": str(job.task_id), "status": job.status, "info": info}
@@ -142,4 +142,127 @@ def assign_ivl(ivl_df, folder_date: str, product_type) -> typle[object, dict]:
 		
 	except ObjectDoesNotExist:
 		return None, {"status": "secondary", "message": "관련 runsheet 없음"}
-		
\ No newline at end of file
+				
+		
+def assign_ivl_bulk(ivl_dfs: list, folder_date: str, product_type, created_user_id: int, ip: str) -> list[dict]:
+	"""
+	여러 IVL 파일을 한 번에 등록 (파일 수와 무관하게 쿼리 수 일정)
+	- (color, lot, gls) → DOE 매핑 1회 조회, 기존 (doe, ivl_id) 1회 조회
+	- 신규 IVL은 bulk_create(ignore_conflicts=True)로 저장, ivl_uniq((doe, filename)) 충돌로 저장되지 않은 파일은 중복으로 응답
+	- bulk_create는 signal을 거치지 않으므로 보간 스펙트럼 / 스펙트럼 특성 계산, TV 집계 무효화를 직접 수행
+	- 파일별 전처리 오류는 해당 파일의 response에만 기록 (다른 파일 등록은 계속)
+	반환: 파일 순서대로 assign_ivl과 같은 형식의 response 리스트
+	"""
+	if not ivl_dfs:
+		return []
+	
+	ivl_files = json.loads(pd.concat(ivl_dfs, ignore_index=True).to_json(orient="records"))
+	responses = [None] * len(ivl_files)
+	
+	doe_keys = {}  # 파일 index → (color, lot, gls)
+	for i, ivl_file in enumerate(ivl_files):
+		try:
+			len_jvalue, check_jvalue = check_j(ivl_file["expt"])
+			if len_jvalue == 5 and check_jvalue:
+				responses[i] = {"status": "secondary", "message": "시야각 파일입니다."}
+				continue
+			color, lot, gls = ivl_file["ivl_id"].split("_")[:-1]
+			doe_keys[i] = (color, int(lot), int(gls))
+		except ValueError:
+			responses[i] = {"status": "secondary", "message": f"{ivl_file.get('ivl_id')} 파일명 형식 오류"}
+		except Exception as e:
+			logger.error(f"IVL 파일 전처리 실패 ({ivl_file.get('file_name')}): {e}", exc_info=True)
+			responses[i] = {"status": "error", "message": f"{ivl_file.get('file_name')} 처리 실패: {e}"}
+	
+	# (color, lot, gls) → DOE 1회 조회
+	doe_map = {}
+	if doe_keys:
+		doe_rows = DOE.objects.filter(
+			exp_date=folder_date,
+			product_type=product_type,
+			color__in={key[0] for key in doe_keys.values()},
+			runsheet_lot__in={key[1] for key in doe_keys.values()},
+			gls_id__in={key[2] for key in doe_keys.values()},
+		).values_list("pk", "color", "runsheet_lot", "gls_id")
+		for pk, color, lot, gls in doe_rows:
+			doe_map.setdefault((color, lot, gls), pk)
+	
+	# 기존 (doe, ivl_id) / (doe, filename) 1회 조회
+	existing, existing_files = set(), set()
+	if doe_map:
+		for doe_id, ivl_id, filename in IVL.objects.filter(
+			doe_id__in=set(doe_map.values()),
+		).filter(
+			Q(ivl_id__in={ivl_files[i]["ivl_id"] for i in doe_keys})
+			| Q(filename__in={ivl_files[i]["file_name"] for i in doe_keys})
+		).values_list("doe_id", "ivl_id", "filename"):
+			existing.add((doe_id, ivl_id))
+			existing_files.add((doe_id, filename))
+	
+	new_ivls = []  # (파일 index, IVL)
+	for i, doe_key in doe_keys.items():
+		ivl_file = ivl_files[i]
+		ivl_id = ivl_file["ivl_id"]
+		
+		doe_id = doe_map.get(doe_key)
+		if doe_id is None:
+			responses[i] = {"status": "secondary", "message": "관련 runsheet 없음"}
+			continue
+		if (doe_id, ivl_id) in existing or (doe_id, ivl_file["file_name"]) in existing_files:
+			logger.error(f"{ivl_id}가 중복입니다.")
+			responses[i] = {"status": "secondary", "message": f"{ivl_id} 중복"}
+			continue
+		# 같은 업로드 안의 중복도 제외
+		existing.add((doe_id, ivl_id))
+		existing_files.add((doe_id, ivl_file["file_name"]))
+		
+		try:
+			ivl = IVL(
+				ivl_id=ivl_id,
+				filename=ivl_file["file_name"],
+				expt=encode_expt_columns(ivl_file["expt"]),  # bulk_create는 pre_save signal을 거치지 않음
+				expt_spec=ivl_file["expt_spec"],
+				doe_id=doe_id,
+				created_user_id=created_user_id,
+				ip=ip,
+			)
+			ivl.is_J10 = ivl.check_is_J10
+		except Exception as e:
+			logger.error(f"IVL({ivl_id}) 전처리 실패: {e}", exc_info=True)
+			responses[i] = {"status": "error", "message": f"{ivl_id} 처리 실패: {e}"}
+			continue
+		try:
+			ivl.refresh_spec_matrix()
+		except Exception as e:
+			logger.warning(f"IVL({ivl_id}) 보간 스펙트럼 계산 실패: {e}")
+			ivl.expt_spec_interp = None
+		new_ivls.append((i, ivl))
+	
+	if new_ivls:
+		with transaction.atomic():
+			IVL.objects.bulk_create([ivl for _, ivl in new_ivls], batch_size=500, ignore_conflicts=True)
+			TVDOEAggregate.objects.filter(
+				doe_id__in={ivl.doe_id for _, ivl in new_ivls},
+				dataset=TVDOEAggregate.DatasetChoices.IVL,
+			).delete()
+		
+		# ignore_conflicts 사용 시 pk가 채워지지 않으므로 ivl_uniq 키 (doe, filename)로 다시 조회
+		# 같은 키에 다른 ivl_id / 업로더의 행이 있으면 동시 업로드와 충돌해 저장되지 않은 것 → 중복으로 응답
+		saved = {
+			(doe_id, filename): (pk, ivl_id, user_id)
+			for pk, doe_id, filename, ivl_id, user_id in IVL.objects.filter(
+				doe_id__in={ivl.doe_id for _, ivl in new_ivls},
+				filename__in={ivl.filename for _, ivl in new_ivls},
+			).values_list("pk", "doe_id", "filename", "ivl_id", "created_user_id")
+		}
+		for i, ivl in new_ivls:
+			pk, ivl_id, user_id = saved.get((ivl.doe_id, ivl.filename), (None, None, None))
+			if pk is not None and (ivl_id, user_id) == (ivl.ivl_id, created_user_id):
+				ivl.pk = pk
+				responses[i] = {"status": "success", "message": "업로드 완료"}
+			else:
+				logger.error(f"{ivl.ivl_id}가 중복입니다. (동시 업로드)")
+				responses[i] = {"status": "secondary", "message": f"{ivl.ivl_id} 중복"}
+		save_spectral_features([ivl for _, ivl in new_ivls if ivl.pk is not None])
+	
+	return responses
@@ -1,4 +1,4 @@
-from pao.utils.fitting_lt import LT_Processor
+from pao.utils.fitting_lt import LT_Processor, lt_fit_params
 from pao.utils.plotly_po import LTPlotlyProcessor
 
 class selected_does_lt(LoginRequiredMixin, View):
@@ -21,6 +21,8 @@ class selected_does_lt(LoginRequiredMixin, View):
                 
             case "success":
                 lt_expts = [l for d in doe_result for l in d.lt_set.all()]
+                # 수명 모델 fitting은 (LT, aging time)별로 저장된 값 재사용
+                self.fit_params = lt_fit_params(lt_expts, self.aging_time) if table_flag else {}
                 
                 for lt_idx, lt_expt in enumerate(lt_expts):
                     try:
@@ -55,7 +57,7 @@ class selected_does_lt(LoginRequiredMixin, View):
         
     def get_lt_table(self, lt):
         selected_data = []
-        processor = LT_Processor(lt_expt, self.aging_time)
+        processor = LT_Processor(lt_expt, self.aging_time, self.fit_params.get(lt.pk))
         processor.check_progress()
         fit_result = processor.get_LT()
         selected_data.append(